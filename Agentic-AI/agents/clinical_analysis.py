@@ -3,7 +3,7 @@ Multi-Report Clinical Analysis Agent
 Analyzes multiple diagnostic reports for a patient and provides comprehensive clinical insights
 """
 
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 from pydantic import BaseModel
 from datetime import datetime
 import json
@@ -47,6 +47,20 @@ class ClinicalAnalysisAgent:
         except Exception as e:
             return f"Error generating clinical analysis: {str(e)}"
     
+    async def stream_patient_analysis(self, patient_request: PatientAnalysisRequest) -> AsyncIterator[str]:
+        """
+        Stream the clinical analysis text as the model generates it
+        """
+        analysis_prompt = self._build_analysis_prompt(patient_request)
+        system_prompt = self._get_system_prompt()
+        
+        async for delta in self.groq_service.stream_api_call(
+            system_prompt=system_prompt,
+            user_prompt=analysis_prompt,
+            model="llama-3.1-8b-instant"  # Using available model
+        ):
+            yield delta
+    
     def _get_system_prompt(self) -> str:
         return """You are an experienced radiologist and orthopedic specialist AI assistant with decades of clinical experience. Your role is to analyze multiple diagnostic studies for a single patient and provide comprehensive clinical insights that help doctors make informed treatment decisions.
 
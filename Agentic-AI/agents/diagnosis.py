@@ -2,10 +2,12 @@
 
 import asyncio
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from loguru import logger
 
 from services.groq_service import groq_service
+from services.detection_set import DetectionSet
+from services.phi_redaction import patient_input_redactor
 
 
 class DiagnosisAgent:
@@ -17,29 +19,31 @@ class DiagnosisAgent:
         self.version = "1.0.0"
         logger.info(f"DiagnosisAgent {self.version} initialized")
     
-    async def analyze(self, detections: List[Dict[str, Any]], symptoms: Optional[str] = None) -> Dict[str, Any]:
+    async def analyze(self, detections: Union[DetectionSet, List[Dict[str, Any]]], symptoms: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze detections and symptoms to generate diagnosis.
         
         Args:
-            detections: List of detection results from YOLO models
+            detections: Detection results from YOLO models (DetectionSet or dicts)
             symptoms: Optional patient symptoms
             
         Returns:
             Dict containing diagnosis information
         """
         try:
+            detections = DetectionSet.coerce(detections)
+            
             # Extract primary finding from detections
             primary_finding = "No fractures detected"
             confidence = 0.0
             
             if detections:
                 # Find highest confidence detection
-                best_detection = max(detections, key=lambda x: x.get("score", 0))
-                confidence = best_detection.get("score", 0)
+                best_detection = detections.record(detections.best_index())
+                confidence = best_detection["score"]
                 
                 if confidence > 0.3:  # Lower threshold to capture more detections
-                    class_name = best_detection.get("label", "unknown")
+                    class_name = best_detection["label"]
                     if "fracture" in class_name.lower():
                         if confidence > 0.7:
                             primary_finding = f"Fracture detected"
@@ -144,7 +148,7 @@ class DiagnosisAgent:
     async def generate_patient_summary(
         self,
         triage_result: Dict[str, Any],
-        detections: List[Dict[str, Any]],
+        detections: Union[DetectionSet, List[Dict[str, Any]]],
         symptoms: Optional[str] = None,
         body_part: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -153,7 +157,7 @@ class DiagnosisAgent:
         
         Args:
             triage_result: Triage assessment result with level, rationale, confidence
-            detections: List of detection results from YOLO models
+            detections: Detection results from YOLO models (DetectionSet or dicts)
             symptoms: Optional patient-reported symptoms
             body_part: Detected body part (hand/leg)
             
@@ -171,8 +175,9 @@ class DiagnosisAgent:
             if not isinstance(triage_result, dict):
                 raise ValueError("Invalid triage_result format")
             
-            if not isinstance(detections, list):
+            if not isinstance(detections, (list, DetectionSet)):
                 raise ValueError("Invalid detections format")
+            detections = DetectionSet.coerce(detections)
             
             # Redact any potential PHI from symptoms
             redacted_symptoms = self._redact_phi(symptoms) if symptoms else None
@@ -180,7 +185,7 @@ class DiagnosisAgent:
             # Generate summary using Groq service
             summary_result = await groq_service.generate_diagnosis_summary(
                 triage_result=triage_result,
-                detections=detections,
+                detections=detections.to_dicts(),
                 symptoms=redacted_symptoms
             )
             
@@ -239,38 +244,15 @@ class DiagnosisAgent:
         if not text:
             return text
         
-        import re
-        
-        # Redact patterns that might be PHI
-        redacted = text
-        
-        # Phone numbers (various formats)
-        redacted = re.sub(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', '[PHONE_REDACTED]', redacted)
-        redacted = re.sub(r'\b\d{3}-\d{4}\b', '[PHONE_REDACTED]', redacted)  # Short format like 555-1234
-        
-        # Email addresses
-        redacted = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '[EMAIL_REDACTED]', redacted)
-        
-        # Social Security Numbers
-        redacted = re.sub(r'\b\d{3}-?\d{2}-?\d{4}\b', '[SSN_REDACTED]', redacted)
-        
-        # Dates that might be birthdates (MM/DD/YYYY, MM-DD-YYYY)
-        redacted = re.sub(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{4}\b', '[DATE_REDACTED]', redacted)
-        
-        # Names (common patterns - this is basic, real PHI detection would be more sophisticated)
-        # Only redact if it looks like "My name is..." or "I am..."
-        redacted = re.sub(r'\b(?:my name is|i am|i\'m)\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', '[NAME_REDACTED]', redacted, flags=re.IGNORECASE)
-        
-        # Addresses (basic pattern)
-        redacted = re.sub(r'\b\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd)\b', '[ADDRESS_REDACTED]', redacted, flags=re.IGNORECASE)
-        
-        return redacted
+        # Phone numbers, emails, SSNs, dates, self-introduced names and
+        # addresses, matched in one pass (patterns in services/phi_redaction)
+        return patient_input_redactor.redact(text)
     
     def _enhance_summary(
         self,
         base_summary: Dict[str, Any],
         triage_result: Dict[str, Any],
-        detections: List[Dict[str, Any]],
+        detections: DetectionSet,
         body_part: Optional[str]
     ) -> Dict[str, Any]:
         """
@@ -326,15 +308,15 @@ class DiagnosisAgent:
         
         return info_map.get(body_part.lower(), info_map["unknown"])
     
-    def _create_findings_summary(self, detections: List[Dict[str, Any]]) -> str:
+    def _create_findings_summary(self, detections: DetectionSet) -> str:
         """Create patient-friendly summary of findings."""
         if not detections:
             return "No significant abnormalities were detected in your X-ray."
         
         if len(detections) == 1:
-            detection = detections[0]
-            label = detection.get("label", "finding")
-            confidence = detection.get("score", 0.0)
+            detection = detections.record(0)
+            label = detection["label"]
+            confidence = detection["score"]
             
             if confidence > 0.8:
                 return f"Our analysis identified a {label} with high confidence."
@@ -2,15 +2,20 @@
 
 import asyncio
 import time
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw, ImageFont
 import io
 import base64
 import numpy as np
 from loguru import logger
 
 from schemas.base import BodyPart
+from services.inference_executor import inference_executor, InferenceQueueFullError
+from services.micro_batcher import micro_batcher
+from services.decoded_image import DecodedImage
+from services.result_cache import result_cache
+from services.detection_postprocess import DetectionPostprocessor
 
 # Import required dependencies for YOLO model
 try:
@@ -40,6 +45,11 @@ class Detection:
             "score": round(self.score, 3)
         }
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Detection":
+        """Create from the ``to_dict`` format."""
+        return cls(label=data["label"], bbox=tuple(data["bbox"]), score=data["score"])
+    
     def get_xyxy(self) -> Tuple[int, int, int, int]:
         """Get bounding box in (x1, y1, x2, y2) format."""
         x, y, w, h = self.bbox
@@ -84,6 +94,9 @@ class HandAgent:
             self.score_threshold = 0.35
             self.nms_iou = 0.50
         
+        # Class IDs map to class_names first, then to the model's own names
+        self.postprocessor = DetectionPostprocessor(self.class_names)
+        
         logger.info(f"HandAgent initialized with model path: {self.model_path}")
     
     async def load_model(self) -> None:
@@ -122,96 +135,27 @@ class HandAgent:
             dummy_image = np.random.randint(0, 255, (640, 640, 3), dtype=np.uint8)
             
             # Run a warmup inference
-            _ = self.model.predict(dummy_image, verbose=False, save=False)
+            _ = await inference_executor.predict(
+                "hand", self.model, dummy_image, model_path=self.model_path,
+                verbose=False, save=False
+            )
             logger.debug("Hand YOLO model warmed up successfully")
         except Exception as e:
             logger.warning(f"Hand model warmup failed: {e}")
     
-    def _preprocess_image(self, image_data: bytes) -> Tuple[np.ndarray, Tuple[int, int]]:
-        """Preprocess image data for YOLO input."""
-        try:
-            # Load image from bytes
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Convert to RGB if needed
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Store original size for coordinate conversion
-            original_size = image.size  # (width, height)
-            
-            # Convert PIL image to numpy array for YOLO
-            image_array = np.array(image)
-            
-            return image_array, original_size
-            
-        except Exception as e:
-            logger.error(f"Image preprocessing failed: {e}")
-            raise ValueError(f"Failed to preprocess image: {e}")
+    def _preprocess_image(self, image: DecodedImage) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Get the YOLO input array and original size from the decoded image."""
+        # Pixels were decoded once upstream; reuse the shared RGB array
+        return image.array, image.size
     
     def _postprocess_detections(self, model_results, original_size: Tuple[int, int]) -> List[Detection]:
         """Postprocess YOLO model results to get filtered detections."""
         try:
-            detections = []
-            
-            if not model_results or len(model_results) == 0:
-                logger.debug("No model results to process")
-                return detections
-            
-            # Get the first result (YOLO returns a list of results)
-            result = model_results[0]
-            
-            # Check if there are any detections
-            if result.boxes is None or len(result.boxes) == 0:
-                logger.debug("No detections found in model output")
-                return detections
-            
-            # Extract detection data
-            boxes = result.boxes
-            
-            # Process each detection
-            for i in range(len(boxes)):
-                # Get confidence score
-                confidence = float(boxes.conf[i])
-                
-                # Filter by confidence threshold
-                if confidence < self.score_threshold:
-                    continue
-                
-                # Get class ID and label
-                class_id = int(boxes.cls[i])
-                
-                # Map class ID to fracture type label
-                if class_id < len(self.class_names):
-                    label = self.class_names[class_id]
-                else:
-                    # If class ID is not in our predefined list, use model's class names
-                    label = result.names.get(class_id, f"detection_{class_id}")
-                
-                # Normalize to generic 'fracture' for external outputs
-                if "fracture" in label:
-                    normalized_label = "fracture"
-                else:
-                    normalized_label = label
-                
-                # Get bounding box coordinates (xyxy format)
-                x1, y1, x2, y2 = boxes.xyxy[i].cpu().numpy()
-                
-                # Convert to (x, y, width, height) format
-                bbox = (int(x1), int(y1), int(x2 - x1), int(y2 - y1))
-                
-                # Create detection object
-                detection = Detection(
-                    label=normalized_label,
-                    bbox=bbox,
-                    score=confidence
-                )
-                detections.append(detection)
-                
-                logger.debug(f"Detected {normalized_label} (raw:{label}) with confidence {confidence:.3f} at {bbox}")
-            
-            # Sort by confidence (highest first)
-            detections.sort(key=lambda d: d.score, reverse=True)
+            # One host copy and a NumPy score mask instead of per-box tensor indexing
+            detections = [
+                Detection(label=label, bbox=bbox, score=score)
+                for label, bbox, score in self.postprocessor.records(model_results, self.score_threshold)
+            ]
             
             logger.info(f"Postprocessed {len(detections)} hand detections from model output")
             return detections
@@ -220,13 +164,11 @@ class HandAgent:
             logger.error(f"Detection postprocessing failed: {e}")
             return []
     
-    def _create_annotated_image(self, image_data: bytes, detections: List[Detection]) -> bytes:
+    def _create_annotated_image(self, decoded_image: DecodedImage, detections: List[Detection]) -> bytes:
         """Create annotated image with detection overlays."""
         try:
-            # Load original image
-            image = Image.open(io.BytesIO(image_data))
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            # Draw on a copy of the already decoded pixels
+            image = decoded_image.to_pil()
             
             # Create drawing context
             draw = ImageDraw.Draw(image)
@@ -247,19 +189,15 @@ class HandAgent:
             }
             
             # Draw detections
-            logger.info(f"Creating annotated image with {len(detections)} detections")
-            for i, detection in enumerate(detections):
+            for detection in detections:
                 x, y, w, h = detection.bbox
                 x1, y1, x2, y2 = x, y, x + w, y + h
                 
-                logger.info(f"Detection {i}: label={detection.label}, bbox=({x}, {y}, {w}, {h}), coords=({x1}, {y1}, {x2}, {y2}), score={detection.score}")
-                
                 # Get color for this detection type
                 color = colors.get(detection.label, "#FF0000")
                 
                 # Draw bounding box
                 draw.rectangle([x1, y1, x2, y2], outline=color, width=3)
-                logger.info(f"Drew rectangle at ({x1}, {y1}, {x2}, {y2}) with color {color}")
                 
                 # Draw label with confidence
                 label_text = f"{detection.label}: {detection.score:.2f}"
@@ -285,22 +223,45 @@ class HandAgent:
             # Convert back to bytes
             img_buffer = io.BytesIO()
             image.save(img_buffer, format='JPEG', quality=95)
-            annotated_bytes = img_buffer.getvalue()
-            
-            logger.info(f"Successfully created annotated image: {len(annotated_bytes)} bytes")
-            return annotated_bytes
+            return img_buffer.getvalue()
             
         except Exception as e:
             logger.error(f"Failed to create annotated image: {e}")
             # Return original image on error
-            return image_data
+            return decoded_image.raw_bytes
     
-    async def detect_fractures(self, image_data: bytes) -> Dict[str, Any]:
+    async def _run_detection(self, image: DecodedImage) -> List[Detection]:
+        """Run the YOLO model on a decoded image and postprocess its output."""
+        # Ensure model is loaded
+        if not self.is_loaded:
+            await self.load_model()
+        
+        # Preprocess image
+        image_array, original_size = self._preprocess_image(image)
+        
+        # Run inference with YOLO model off the event loop, batched with concurrent requests
+        model_results = await micro_batcher.predict(
+            "hand",
+            self.model,
+            image_array,
+            model_path=self.model_path,
+            conf=self.score_threshold,  # Confidence threshold
+            iou=self.nms_iou,          # IoU threshold for NMS
+            verbose=False,              # Suppress verbose output
+            save=False                  # Don't save results to disk
+        )
+        
+        # Postprocess detections
+        detections = self._postprocess_detections(model_results, original_size)
+        
+        return detections
+    
+    async def detect_fractures(self, image_data: Union[bytes, DecodedImage]) -> Dict[str, Any]:
         """
         Detect fractures in hand X-ray image.
         
         Args:
-            image_data: Raw image bytes
+            image_data: Decoded image (or raw image bytes)
             
         Returns:
             Dict with detections and metadata
@@ -308,45 +269,21 @@ class HandAgent:
         start_time = time.time()
         
         try:
-            # Ensure model is loaded
-            if not self.is_loaded:
-                await self.load_model()
-            
-            # Preprocess image
-            image_array, original_size = self._preprocess_image(image_data)
-            
-            # Run inference with YOLO model
-            model_results = self.model.predict(
-                image_array,
-                conf=self.score_threshold,  # Confidence threshold
-                iou=self.nms_iou,          # IoU threshold for NMS
-                verbose=False,              # Suppress verbose output
-                save=False                  # Don't save results to disk
-            )
-            
-            # Log model results for debugging
-            logger.info(f"YOLO model inference completed. Results: {len(model_results)} batch(es)")
-            if len(model_results) > 0:
-                result = model_results[0]
-                if hasattr(result, 'boxes') and result.boxes is not None:
-                    num_detections = len(result.boxes)
-                    logger.info(f"YOLO detected {num_detections} objects")
-                    if num_detections > 0:
-                        logger.info(f"Detection details: boxes shape={result.boxes.xyxy.shape}, confidence scores={result.boxes.conf.tolist()}")
-                else:
-                    logger.info("YOLO model returned no boxes")
-            
-            # Postprocess detections
-            detections = self._postprocess_detections(model_results, original_size)
-            logger.info(f"After postprocessing: {len(detections)} valid detections")
-            for i, det in enumerate(detections):
-                logger.info(f"Detection {i}: {det.label} confidence={det.score:.3f} bbox={det.bbox}")
+            # Decode once (no-op if the caller already decoded)
+            image = DecodedImage.coerce(image_data)
+            
+            # Identical pixels, weights and thresholds give identical detections
+            cache_key = result_cache.image_key(image, "hand", "detection", model_path=self.model_path)
+            cached = result_cache.get(cache_key, "hand")
+            if cached is not None:
+                detections = [Detection.from_dict(d) for d in cached["detections"]]
+                logger.info(f"Reusing {len(detections)} cached hand detections")
+            else:
+                detections = await self._run_detection(image)
+                result_cache.put(cache_key, "hand", {"detections": [det.to_dict() for det in detections]})
             
             # Create annotated image
-            logger.info(f"About to create annotated image with {len(detections)} detections")
-            for i, det in enumerate(detections):
-                logger.info(f"Input detection {i}: {det.label} confidence={det.score:.3f} bbox={det.bbox}")
-            annotated_image_data = self._create_annotated_image(image_data, detections)
+            annotated_image_data = self._create_annotated_image(image, detections)
             
             # Convert detections to dict format for consistency
             detection_list = [det.to_dict() for det in detections]
@@ -358,27 +295,31 @@ class HandAgent:
                 "detection_count": len(detection_list),
                 "inference_time_ms": round((time.time() - start_time) * 1000, 2),
                 "model_confidence_threshold": self.score_threshold,
-                "image_size": original_size
+                "image_size": image.size,
+                "cache_hit": cached is not None
             }
             
+        except InferenceQueueFullError:
+            # Backpressure must reach the caller, not look like "no fractures"
+            raise
         except Exception as e:
             logger.error(f"Hand fracture detection failed: {e}")
             return {
                 "body_part": "hand",
                 "detections": [],
-                "annotated_image_data": image_data,  # Return original image on error
+                "annotated_image_data": getattr(image_data, "raw_bytes", image_data),  # Return original image on error
                 "detection_count": 0,
                 "error": str(e),
                 "inference_time_ms": round((time.time() - start_time) * 1000, 2)
             }
     
-    async def analyze(self, image_data: bytes) -> Dict[str, Any]:
+    async def analyze(self, image_data: Union[bytes, DecodedImage]) -> Dict[str, Any]:
         """
         Analyze hand X-ray image for fractures.
         Returns full analysis result including annotated image.
         
         Args:
-            image_data: Raw image bytes
+            image_data: Decoded image (or raw image bytes)
             
         Returns:
             Full analysis result dict
@@ -386,12 +327,14 @@ class HandAgent:
         try:
             result = await self.detect_fractures(image_data)
             return result
+        except InferenceQueueFullError:
+            raise
         except Exception as e:
             logger.error(f"Hand analysis failed: {e}")
             return {
                 "body_part": "hand",
                 "detections": [],
-                "annotated_image_data": image_data,
+                "annotated_image_data": getattr(image_data, "raw_bytes", image_data),
                 "detection_count": 0,
                 "error": str(e)
             }
@@ -478,15 +421,11 @@ class HandAgent:
         }
 
 
-# Global hand agent instance - lazy initialization
-_hand_agent = None
-
+# Global hand agent instance - owned by the model pool
 def get_hand_agent():
-    """Get the global hand agent instance."""
-    global _hand_agent
-    if _hand_agent is None:
-        _hand_agent = HandAgent()
-    return _hand_agent
+    """Get the shared hand agent instance from the process-wide model pool."""
+    from services.model_pool import model_pool
+    return model_pool.get_agent("hand")
 
 # For backward compatibility
 hand_agent = get_hand_agent()
\ No newline at end of file
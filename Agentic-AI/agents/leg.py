@@ -2,7 +2,7 @@
 
 import asyncio
 import time
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
 import io
@@ -11,6 +11,11 @@ import numpy as np
 from loguru import logger
 
 from schemas.base import BodyPart
+from services.inference_executor import inference_executor, InferenceQueueFullError
+from services.micro_batcher import micro_batcher
+from services.decoded_image import DecodedImage
+from services.result_cache import result_cache
+from services.detection_postprocess import DetectionPostprocessor
 
 # Import required dependencies for YOLO model
 try:
@@ -66,6 +71,9 @@ class LegAgent:
             self.score_threshold = 0.35
             self.nms_iou = 0.50
         
+        # Class IDs map to class_names first, then to the model's own names
+        self.postprocessor = DetectionPostprocessor(self.class_names)
+        
         logger.info(f"LegAgent initialized with model path: {self.model_path}")
     
     async def load_model(self) -> None:
@@ -102,96 +110,27 @@ class LegAgent:
             dummy_image = np.random.randint(0, 255, (640, 640, 3), dtype=np.uint8)
             
             # Run a warmup inference
-            _ = self.model.predict(dummy_image, verbose=False, save=False)
+            _ = await inference_executor.predict(
+                "leg", self.model, dummy_image, model_path=self.model_path,
+                verbose=False, save=False
+            )
             logger.debug("Leg YOLO model warmed up successfully")
         except Exception as e:
             logger.warning(f"Leg model warmup failed: {e}")
     
-    def _preprocess_image(self, image_data: bytes) -> Tuple[np.ndarray, Tuple[int, int]]:
-        """Preprocess image data for YOLO input."""
-        try:
-            # Load image from bytes
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Convert to RGB if needed
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Store original size for coordinate conversion
-            original_size = image.size  # (width, height)
-            
-            # Convert PIL image to numpy array for YOLO
-            image_array = np.array(image)
-            
-            return image_array, original_size
-            
-        except Exception as e:
-            logger.error(f"Image preprocessing failed: {e}")
-            raise ValueError(f"Failed to preprocess image: {e}")
+    def _preprocess_image(self, image: DecodedImage) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Get the YOLO input array and original size from the decoded image."""
+        # Pixels were decoded once upstream; reuse the shared RGB array
+        return image.array, image.size
     
     def _postprocess_detections(self, model_results, original_size: Tuple[int, int]) -> List[Detection]:
         """Postprocess YOLO model results to get filtered detections."""
         try:
-            detections = []
-            
-            if not model_results or len(model_results) == 0:
-                logger.debug("No model results to process")
-                return detections
-            
-            # Get the first result (YOLO returns a list of results)
-            result = model_results[0]
-            
-            # Check if there are any detections
-            if result.boxes is None or len(result.boxes) == 0:
-                logger.debug("No detections found in model output")
-                return detections
-            
-            # Extract detection data
-            boxes = result.boxes
-            
-            # Process each detection
-            for i in range(len(boxes)):
-                # Get confidence score
-                confidence = float(boxes.conf[i])
-                
-                # Filter by confidence threshold
-                if confidence < self.score_threshold:
-                    continue
-                
-                # Get class ID and label
-                class_id = int(boxes.cls[i])
-                
-                # Map class ID to fracture type label
-                if class_id < len(self.class_names):
-                    label = self.class_names[class_id]
-                else:
-                    # If class ID is not in our predefined list, use model's class names
-                    label = result.names.get(class_id, f"detection_{class_id}")
-                
-                # Normalize to generic 'fracture' for external outputs
-                if "fracture" in label:
-                    normalized_label = "fracture"
-                else:
-                    normalized_label = label
-                
-                # Get bounding box coordinates (xyxy format)
-                x1, y1, x2, y2 = boxes.xyxy[i].cpu().numpy()
-                
-                # Convert to (x, y, width, height) format
-                bbox = (int(x1), int(y1), int(x2 - x1), int(y2 - y1))
-                
-                # Create detection object
-                detection = Detection(
-                    label=normalized_label,
-                    bbox=bbox,
-                    score=confidence
-                )
-                detections.append(detection)
-                
-                logger.debug(f"Detected {normalized_label} (raw:{label}) with confidence {confidence:.3f} at {bbox}")
-            
-            # Sort by confidence (highest first)
-            detections.sort(key=lambda d: d.score, reverse=True)
+            # One host copy and a NumPy score mask instead of per-box tensor indexing
+            detections = [
+                Detection(label=label, bbox=bbox, score=score)
+                for label, bbox, score in self.postprocessor.records(model_results, self.score_threshold)
+            ]
             
             logger.info(f"Postprocessed {len(detections)} leg detections from model output")
             return detections
@@ -200,13 +139,11 @@ class LegAgent:
             logger.error(f"Detection postprocessing failed: {e}")
             return []
     
-    def _create_annotated_image(self, image_data: bytes, detections: List[Detection]) -> bytes:
+    def _create_annotated_image(self, decoded_image: DecodedImage, detections: List[Detection]) -> bytes:
         """Create annotated image with detection overlays."""
         try:
-            # Load original image
-            image = Image.open(io.BytesIO(image_data))
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            # Draw on a copy of the already decoded pixels
+            image = decoded_image.to_pil()
             
             # Create drawing context
             draw = ImageDraw.Draw(image)
@@ -267,14 +204,40 @@ class LegAgent:
         except Exception as e:
             logger.error(f"Failed to create annotated image: {e}")
             # Return original image on error
-            return image_data
+            return decoded_image.raw_bytes
     
-    async def detect_fractures(self, image_data: bytes) -> Dict[str, Any]:
+    async def _run_detection(self, image: DecodedImage) -> List[Detection]:
+        """Run the YOLO model on a decoded image and postprocess its output."""
+        # Ensure model is loaded
+        if not self.is_loaded:
+            await self.load_model()
+        
+        # Preprocess image
+        image_array, original_size = self._preprocess_image(image)
+        
+        # Run inference with YOLO model off the event loop, batched with concurrent requests
+        model_results = await micro_batcher.predict(
+            "leg",
+            self.model,
+            image_array,
+            model_path=self.model_path,
+            conf=self.score_threshold,  # Confidence threshold
+            iou=self.nms_iou,          # IoU threshold for NMS
+            verbose=False,              # Suppress verbose output
+            save=False                  # Don't save results to disk
+        )
+        
+        # Postprocess detections
+        detections = self._postprocess_detections(model_results, original_size)
+        
+        return detections
+    
+    async def detect_fractures(self, image_data: Union[bytes, DecodedImage]) -> Dict[str, Any]:
         """
         Detect fractures in leg X-ray image.
         
         Args:
-            image_data: Raw image bytes
+            image_data: Decoded image (or raw image bytes)
             
         Returns:
             Dict with detections and metadata
@@ -282,27 +245,21 @@ class LegAgent:
         start_time = time.time()
         
         try:
-            # Ensure model is loaded
-            if not self.is_loaded:
-                await self.load_model()
-            
-            # Preprocess image
-            image_array, original_size = self._preprocess_image(image_data)
-            
-            # Run inference with YOLO model
-            model_results = self.model.predict(
-                image_array,
-                conf=self.score_threshold,  # Confidence threshold
-                iou=self.nms_iou,          # IoU threshold for NMS
-                verbose=False,              # Suppress verbose output
-                save=False                  # Don't save results to disk
-            )
-            
-            # Postprocess detections
-            detections = self._postprocess_detections(model_results, original_size)
+            # Decode once (no-op if the caller already decoded)
+            image = DecodedImage.coerce(image_data)
+            
+            # Identical pixels, weights and thresholds give identical detections
+            cache_key = result_cache.image_key(image, "leg", "detection", model_path=self.model_path)
+            cached = result_cache.get(cache_key, "leg")
+            if cached is not None:
+                detections = [Detection.from_dict(d) for d in cached["detections"]]
+                logger.info(f"Reusing {len(detections)} cached leg detections")
+            else:
+                detections = await self._run_detection(image)
+                result_cache.put(cache_key, "leg", {"detections": [det.to_dict() for det in detections]})
             
             # Create annotated image
-            annotated_image_data = self._create_annotated_image(image_data, detections)
+            annotated_image_data = self._create_annotated_image(image, detections)
             
             # Store annotated image
             annotated_image_id = None
@@ -325,6 +282,7 @@ class LegAgent:
                 "annotated_image_id": annotated_image_id,
                 "detection_count": len(detections),
                 "inference_time_ms": round(inference_time, 2),
+                "cache_hit": cached is not None,
                 "model_info": {
                     "model_path": str(self.model_path),
                     "score_threshold": self.score_threshold,
@@ -338,22 +296,25 @@ class LegAgent:
             
             return result
             
+        except InferenceQueueFullError:
+            # Backpressure must reach the caller, not look like "no fractures"
+            raise
         except Exception as e:
             logger.error(f"Leg fracture detection failed: {e}")
             return {
                 "detections": [],
-                "annotated_image_data": image_data,  # Return original on error
+                "annotated_image_data": getattr(image_data, "raw_bytes", image_data),  # Return original on error
                 "error": str(e),
                 "inference_time_ms": (time.time() - start_time) * 1000
             }
     
-    async def analyze(self, image_data: bytes) -> Dict[str, Any]:
+    async def analyze(self, image_data: Union[bytes, DecodedImage]) -> Dict[str, Any]:
         """
         Analyze leg X-ray image for fractures.
         Returns full analysis result including annotated image.
         
         Args:
-            image_data: Raw image bytes
+            image_data: Decoded image (or raw image bytes)
             
         Returns:
             Full analysis result dict
@@ -361,12 +322,14 @@ class LegAgent:
         try:
             result = await self.detect_fractures(image_data)
             return result
+        except InferenceQueueFullError:
+            raise
         except Exception as e:
             logger.error(f"Leg analysis failed: {e}")
             return {
                 "body_part": "leg",
                 "detections": [],
-                "annotated_image_data": image_data,
+                "annotated_image_data": getattr(image_data, "raw_bytes", image_data),
                 "detection_count": 0,
                 "error": str(e)
             }
@@ -478,15 +441,11 @@ class LegAgent:
         }
 
 
-# Global leg agent instance - lazy initialization
-_leg_agent = None
-
+# Global leg agent instance - owned by the model pool
 def get_leg_agent():
-    """Get the global leg agent instance."""
-    global _leg_agent
-    if _leg_agent is None:
-        _leg_agent = LegAgent()
-    return _leg_agent
+    """Get the shared leg agent instance from the process-wide model pool."""
+    from services.model_pool import model_pool
+    return model_pool.get_agent("leg")
 
 # For backward compatibility
 leg_agent = get_leg_agent()
\ No newline at end of file
@@ -18,6 +18,9 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
 
+from services.decoded_image import DecodedImage
+from services.detection_set import DetectionSet
+
 # Set up logging
 logger = logging.getLogger(__name__)
 from reportlab.lib import colors
@@ -88,7 +91,9 @@ class PDFReportAgent:
     def generate_report(self, 
                        analysis_data: Dict[str, Any], 
                        patient_info: Optional[Dict[str, Any]] = None,
-                       output_path: Optional[str] = None) -> bytes:
+                       output_path: Optional[str] = None,
+                       original_image: Optional[DecodedImage] = None,
+                       annotated_image: Optional[DecodedImage] = None) -> bytes:
         """
         Generate a complete medical assessment PDF report.
         
@@ -96,6 +101,8 @@ class PDFReportAgent:
             analysis_data: Analysis results from the API
             patient_info: Optional patient information
             output_path: Optional path to save PDF file
+            original_image: In-memory original image (avoids re-downloading it)
+            annotated_image: In-memory annotated image (avoids re-downloading it)
             
         Returns:
             PDF content as bytes
@@ -127,7 +134,7 @@ class PDFReportAgent:
             story.extend(self._build_examination_details(analysis_data))
             
             # 4. Uploaded Images
-            story.extend(self._build_images_section(analysis_data))
+            story.extend(self._build_images_section(analysis_data, original_image, annotated_image))
             
             # 5. AI Detection Summary
             story.extend(self._build_ai_detection_summary(analysis_data))
@@ -346,7 +353,32 @@ class PDFReportAgent:
             logger.error(f"Error fetching image from URL {url}: {e}")
             return None
 
-    def _build_images_section(self, analysis_data: Dict) -> List:
+    def _image_from_decoded(self, image: DecodedImage, max_width: float = 3*inch, max_height: float = 2*inch) -> Optional[Image]:
+        """Create ReportLab Image object from an in-memory decoded image."""
+        try:
+            # Calculate scaling to fit within max dimensions
+            width_ratio = max_width / image.width
+            height_ratio = max_height / image.height
+            scale = min(width_ratio, height_ratio, 1.0)  # Don't scale up
+            
+            if image.format == 'JPEG':
+                # ReportLab embeds JPEG streams as-is, no re-encode needed
+                img_buffer = io.BytesIO(image.raw_bytes)
+            else:
+                # Encode the already decoded RGB pixels for PDF compatibility
+                img_buffer = io.BytesIO()
+                image.to_pil().save(img_buffer, format='JPEG', quality=85)
+                img_buffer.seek(0)
+            
+            return Image(img_buffer, width=image.width * scale, height=image.height * scale)
+            
+        except Exception as e:
+            logger.error(f"Error embedding in-memory image: {e}")
+            return None
+
+    def _build_images_section(self, analysis_data: Dict,
+                              original_image: Optional[DecodedImage] = None,
+                              annotated_image: Optional[DecodedImage] = None) -> List:
         """Build uploaded images section."""
         elements = []
         
@@ -354,7 +386,7 @@ class PDFReportAgent:
         header = Paragraph("Uploaded Images", self.styles['SubSection'])
         elements.append(header)
         
-        # Try to get images from cloudinary URLs
+        # Use in-memory images when provided, otherwise cloudinary URLs
         cloudinary_urls = analysis_data.get('cloudinary_urls', {})
         
         # Create a table to organize images side by side
@@ -363,27 +395,35 @@ class PDFReportAgent:
         
         # Add original image if available
         original_url = cloudinary_urls.get('original_image_url')
-        if original_url:
+        original_img = None
+        if original_image is not None:
+            # Prefer the in-memory image over downloading it back from Cloudinary
+            original_img = self._image_from_decoded(original_image, max_width=2.5*inch, max_height=2*inch)
+        elif original_url:
             original_img = self._fetch_image_from_url(original_url, max_width=2.5*inch, max_height=2*inch)
-            if original_img:
-                image_elements.append(original_img)
-                image_labels.append("Original X-Ray")
-            else:
-                # Fallback text if image couldn't be fetched
-                image_elements.append(Paragraph("Original Image<br/>Available at Cloudinary", self.styles['Normal']))
-                image_labels.append("Original X-Ray")
+        if original_img:
+            image_elements.append(original_img)
+            image_labels.append("Original X-Ray")
+        elif original_url:
+            # Fallback text if image couldn't be fetched
+            image_elements.append(Paragraph("Original Image<br/>Available at Cloudinary", self.styles['Normal']))
+            image_labels.append("Original X-Ray")
         
         # Add annotated image if available
         annotated_url = cloudinary_urls.get('annotated_image_url')
-        if annotated_url:
+        annotated_img = None
+        if annotated_image is not None:
+            # Prefer the in-memory image over downloading it back from Cloudinary
+            annotated_img = self._image_from_decoded(annotated_image, max_width=2.5*inch, max_height=2*inch)
+        elif annotated_url:
             annotated_img = self._fetch_image_from_url(annotated_url, max_width=2.5*inch, max_height=2*inch)
-            if annotated_img:
-                image_elements.append(annotated_img)
-                image_labels.append("Annotated with AI Detection")
-            else:
-                # Fallback text if image couldn't be fetched
-                image_elements.append(Paragraph("Annotated Image<br/>Available at Cloudinary", self.styles['Normal']))
-                image_labels.append("Annotated with AI Detection")
+        if annotated_img:
+            image_elements.append(annotated_img)
+            image_labels.append("Annotated with AI Detection")
+        elif annotated_url:
+            # Fallback text if image couldn't be fetched
+            image_elements.append(Paragraph("Annotated Image<br/>Available at Cloudinary", self.styles['Normal']))
+            image_labels.append("Annotated with AI Detection")
         
         # Create images display
         if image_elements:
@@ -441,15 +481,14 @@ class PDFReportAgent:
         
         # Get detection data
         triage = analysis_data.get('triage', {})
-        detections = triage.get('detections', [])
+        detections = DetectionSet.coerce(triage.get('detections', []))
         
         # Create detection table
         detection_data = [["Finding / Condition Detected", "Confidence", "Annotation Reference"]]
         
         if detections:
-            for i, detection in enumerate(detections):
-                finding = detection.get('class', 'Fracture')
-                confidence = f"{detection.get('confidence', 0.72)*100:.0f}%"
+            for i, (finding, score) in enumerate(zip(detections.labels, detections.scores)):
+                confidence = f"{score*100:.0f}%"
                 reference = f"#X{i+1:03d}"
                 detection_data.append([finding, confidence, reference])
         else:
@@ -4,7 +4,7 @@ import asyncio
 import time
 import io
 import os
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
 from loguru import logger
 
 try:
@@ -23,6 +23,7 @@ except ImportError:
     logger.warning("ReportLab not available, using mock implementation")
 
 from services.storage import storage_service
+from services.detection_set import DetectionSet
 
 
 class ReportAgent:
@@ -38,7 +39,7 @@ class ReportAgent:
     async def generate_clinician_report(
         self,
         triage_result: Dict[str, Any],
-        detections: List[Dict[str, Any]],
+        detections: Union[DetectionSet, List[Dict[str, Any]]],
         images: Dict[str, str],
         patient_summary: Optional[Dict[str, Any]] = None,
         metadata: Optional[Dict[str, Any]] = None
@@ -48,7 +49,7 @@ class ReportAgent:
         
         Args:
             triage_result: Triage assessment result
-            detections: List of detection results from YOLO models
+            detections: Detection results from YOLO models (DetectionSet or dicts)
             images: Dict with original and annotated image file IDs
             patient_summary: Optional patient summary from diagnosis agent
             metadata: Optional metadata (timestamps, versions, etc.)
@@ -67,8 +68,9 @@ class ReportAgent:
             if not isinstance(triage_result, dict):
                 raise ValueError("Invalid triage_result format")
             
-            if not isinstance(detections, list):
+            if not isinstance(detections, (list, DetectionSet)):
                 raise ValueError("Invalid detections format")
+            detections = DetectionSet.coerce(detections)
             
             if not isinstance(images, dict):
                 raise ValueError("Invalid images format")
@@ -134,7 +136,7 @@ class ReportAgent:
                 "error": str(e),
                 "report_metadata": {
                     "triage_level": triage_result.get("level", "UNKNOWN") if isinstance(triage_result, dict) else "UNKNOWN",
-                    "detection_count": len(detections) if isinstance(detections, list) else 0,
+                    "detection_count": len(detections) if isinstance(detections, (list, DetectionSet)) else 0,
                     "has_images": bool(images) if isinstance(images, dict) else False,
                     "page_count": 0
                 }
@@ -143,7 +145,7 @@ class ReportAgent:
     def _prepare_report_data(
         self,
         triage_result: Dict[str, Any],
-        detections: List[Dict[str, Any]],
+        detections: DetectionSet,
         images: Dict[str, str],
         patient_summary: Optional[Dict[str, Any]],
         metadata: Optional[Dict[str, Any]],
@@ -171,7 +173,7 @@ class ReportAgent:
             "request_id": request_id,
             "timestamp": report_timestamp,
             "triage_result": triage_result,
-            "detections": detections,
+            "detections": detections.to_dicts(),
             "images": images,
             "patient_summary": patient_summary,
             "metadata": metadata or {},
@@ -184,7 +186,7 @@ class ReportAgent:
             "page_count": 1  # Will be updated during PDF generation
         }
     
-    def _prepare_findings_section(self, detections: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _prepare_findings_section(self, detections: DetectionSet) -> Dict[str, Any]:
         """Prepare findings section content."""
         
         if not detections:
@@ -195,35 +197,29 @@ class ReportAgent:
             }
         
         # Group detections by type
-        detection_groups = {}
-        for detection in detections:
-            label = detection.get("label", "unknown")
-            if label not in detection_groups:
-                detection_groups[label] = []
-            detection_groups[label].append(detection)
+        detection_groups = detections.label_groups()
         
         # Generate findings details
         details = []
         for label, group in detection_groups.items():
-            if len(group) == 1:
-                detection = group[0]
-                score = detection.get("score", 0.0)
+            if group["count"] == 1:
+                score = group["first_score"]
                 details.append({
                     "finding": f"{label.replace('_', ' ').title()}",
                     "confidence": f"{score:.2f}",
                     "description": f"Single {label.replace('_', ' ')} detected with {score:.1%} confidence"
                 })
             else:
-                avg_score = sum(d.get("score", 0.0) for d in group) / len(group)
+                avg_score = group["mean_score"]
                 details.append({
                     "finding": f"Multiple {label.replace('_', ' ').title()}s",
                     "confidence": f"{avg_score:.2f}",
-                    "description": f"{len(group)} instances of {label.replace('_', ' ')} detected (avg confidence: {avg_score:.1%})"
+                    "description": f"{group['count']} instances of {label.replace('_', ' ')} detected (avg confidence: {avg_score:.1%})"
                 })
         
         # Generate summary
         if len(detections) == 1:
-            primary_finding = detections[0].get("label", "finding").replace("_", " ")
+            primary_finding = detections.labels[0].replace("_", " ")
             summary = f"Single {primary_finding} identified in the X-ray image."
         else:
             summary = f"Multiple findings identified: {len(detections)} total detections across {len(detection_groups)} categories."
@@ -237,7 +233,7 @@ class ReportAgent:
     def _prepare_impressions_section(
         self, 
         triage_result: Dict[str, Any], 
-        detections: List[Dict[str, Any]]
+        detections: DetectionSet
     ) -> Dict[str, Any]:
         """Prepare impressions section content."""
         
@@ -263,7 +259,7 @@ class ReportAgent:
         if not detections:
             impression = "No significant radiographic abnormalities detected. Clinical correlation recommended if symptoms persist."
         else:
-            primary_findings = [d.get("label", "finding").replace("_", " ") for d in detections[:3]]
+            primary_findings = [label.replace("_", " ") for label in detections.labels[:3]]
             if len(detections) > 3:
                 impression = f"Radiographic findings consistent with {', '.join(primary_findings)} and {len(detections) - 3} additional findings. {urgency.lower()}."
             else:
@@ -281,7 +277,7 @@ class ReportAgent:
     def _prepare_recommendations_section(
         self, 
         triage_result: Dict[str, Any], 
-        detections: List[Dict[str, Any]]
+        detections: DetectionSet
     ) -> Dict[str, Any]:
         """Prepare recommendations section content."""
         
@@ -345,11 +341,11 @@ class ReportAgent:
         # Add detection-specific recommendations
         detection_specific = []
         if detections:
-            fracture_count = sum(1 for d in detections if "fracture" in d.get("label", "").lower())
+            fracture_count = detections.count_labels(lambda label: "fracture" in label.lower())
             if fracture_count > 0:
                 detection_specific.append(f"Fracture management protocol appropriate for {fracture_count} detected fracture(s)")
             
-            displacement_count = sum(1 for d in detections if "displacement" in d.get("label", "").lower())
+            displacement_count = detections.count_labels(lambda label: "displacement" in label.lower())
             if displacement_count > 0:
                 detection_specific.append("Assess for reduction requirements given detected displacement")
         
@@ -363,7 +359,7 @@ class ReportAgent:
     
     def _prepare_technical_details(
         self, 
-        detections: List[Dict[str, Any]], 
+        detections: DetectionSet, 
         metadata: Optional[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Prepare technical details section."""
@@ -376,10 +372,8 @@ class ReportAgent:
         }
         
         if detections:
-            scores = [d.get("score", 0.0) for d in detections]
-            min_score = min(scores)
-            max_score = max(scores)
-            avg_score = sum(scores) / len(scores)
+            min_score, max_score, score_sum = detections.score_stats()
+            avg_score = score_sum / len(detections)
             
             detection_stats.update({
                 "confidence_range": f"{min_score:.2f} - {max_score:.2f}",
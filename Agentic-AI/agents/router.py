@@ -10,6 +10,8 @@ import base64
 from loguru import logger
 
 from schemas.base import BodyPart
+from services.decoded_image import DecodedImage
+from services.inference_executor import inference_executor, InferenceQueueFullError
 
 # Try to import torch, fall back to mock if not available
 try:
@@ -147,15 +149,11 @@ class RouterAgent:
         except Exception as e:
             logger.warning(f"Model warmup failed: {e}")
     
-    def _preprocess_image(self, image_data: bytes) -> TensorType:
+    def _preprocess_image(self, image: DecodedImage) -> TensorType:
         """Preprocess image data for model input."""
         try:
-            # Load image from bytes
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Convert to RGB if needed
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            # Reuse the already decoded RGB pixels
+            image = image.to_pil()
             
             # Apply transforms
             tensor = self.transform(image)
@@ -199,12 +197,19 @@ class RouterAgent:
             logger.error(f"Output postprocessing failed: {e}")
             raise ValueError(f"Failed to postprocess model output: {e}")
     
-    async def classify_body_part(self, image_data: bytes) -> Dict[str, Any]:
+    def _classify(self, image: DecodedImage) -> Dict[str, Any]:
+        """Preprocess, run the model and postprocess (blocking)."""
+        input_tensor = self._preprocess_image(image)
+        with torch.no_grad():
+            model_output = self.model(input_tensor)
+        return self._postprocess_output(model_output)
+    
+    async def classify_body_part(self, image_data: Union[bytes, DecodedImage]) -> Dict[str, Any]:
         """
         Classify body part from image data.
         
         Args:
-            image_data: Raw image bytes
+            image_data: Decoded image (or raw image bytes)
             
         Returns:
             Dict with body_part, confidence, and additional metadata
@@ -216,15 +221,11 @@ class RouterAgent:
             if not self.is_loaded:
                 await self.load_model()
             
-            # Preprocess image
-            input_tensor = self._preprocess_image(image_data)
-            
-            # Run inference
-            with torch.no_grad():
-                model_output = self.model(input_tensor)
-            
-            # Postprocess output
-            result = self._postprocess_output(model_output)
+            # Preprocessing and the forward pass block, so they run on the inference
+            # pool, so detectors started speculatively run while the router does
+            result = await inference_executor.run(
+                "router", self._classify, DecodedImage.coerce(image_data), in_process=True
+            )
             
             # Add timing information
             inference_time = (time.time() - start_time) * 1000  # Convert to ms
@@ -246,6 +247,9 @@ class RouterAgent:
             
             return result
             
+        except InferenceQueueFullError:
+            # Backpressure must reach the caller, not look like a low-confidence guess
+            raise
         except Exception as e:
             logger.error(f"Router classification failed: {e}")
             # Return unknown with low confidence on error
@@ -340,15 +344,11 @@ class RouterAgent:
         }
 
 
-# Global router agent instance - lazy initialization
-_router_agent = None
-
+# Global router agent instance - owned by the model pool
 def get_router_agent():
-    """Get the global router agent instance."""
-    global _router_agent
-    if _router_agent is None:
-        _router_agent = RouterAgent()
-    return _router_agent
+    """Get the shared router agent instance from the process-wide model pool."""
+    from services.model_pool import model_pool
+    return model_pool.get_agent("router")
 
 # For backward compatibility
 router_agent = get_router_agent()
\ No newline at end of file
@@ -2,36 +2,45 @@
 
 import asyncio
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from uuid import UUID
+import numpy as np
 from loguru import logger
 
 from schemas.base import TriageLevel
 from services.groq_service import groq_service
 from services.policies import policy_service
+from services.detection_set import DetectionSet
+from services.triage_rules import triage_rule_cache, CompiledTriageRules, UNKNOWN, AMBER
 
 
 class TriageAgent:
     """Agent for triaging orthopedic findings using rules and LLM assistance."""
     
+    # Triage score cut-offs for RED and AMBER levels
+    RED_SCORE_THRESHOLD = 0.75
+    AMBER_SCORE_THRESHOLD = 0.4
+    
     def __init__(self):
         """Initialize triage agent."""
         self.rules_enabled = True
         self.llm_fallback_enabled = True
         logger.info("TriageAgent initialized")
     
-    async def assess(self, detections: List[Dict[str, Any]], diagnosis: Dict[str, Any]) -> Dict[str, Any]:
+    async def assess(self, detections: Union[DetectionSet, List[Dict[str, Any]]], diagnosis: Dict[str, Any]) -> Dict[str, Any]:
         """
         Assess triage level based on detections and diagnosis using dynamic calculation.
         
         Args:
-            detections: Detection results from AI models
+            detections: Detection results from AI models (DetectionSet or dicts)
             diagnosis: Diagnosis information
             
         Returns:
             Dict containing triage assessment
         """
         try:
+            detections = DetectionSet.coerce(detections)
+            
             # Extract key information
             confidence = diagnosis.get("confidence", 0.0)
             primary_finding = diagnosis.get("primary_finding", "").lower()
@@ -77,7 +86,7 @@ class TriageAgent:
         self, 
         confidence: float, 
         primary_finding: str, 
-        detections: List[Dict[str, Any]], 
+        detections: DetectionSet, 
         detection_count: int
     ) -> float:
         """
@@ -105,7 +114,7 @@ class TriageAgent:
         count_factor = min(detection_count * 0.02, 0.1)  # More detections = slightly higher score
         
         # Factor 4: Multiple high-confidence detections bonus
-        high_conf_detections = sum(1 for d in detections if d.get("score", 0) > 0.7)
+        high_conf_detections = detections.count_scores_above(0.7)
         multi_detection_bonus = min(high_conf_detections * 0.05, 0.1)
         
         # Combine all factors
@@ -124,38 +133,14 @@ class TriageAgent:
         Returns:
             Severity score (0.0 to 0.3)
         """
-        # Critical severity indicators (0.25-0.3)
-        if any(keyword in primary_finding for keyword in [
-            "compound", "open", "severe", "displaced", "comminuted", "avulsion"
-        ]):
-            return 0.3
-        
-        # High severity indicators (0.15-0.25)
-        if any(keyword in primary_finding for keyword in [
-            "fracture detected", "break", "crack", "confirmed fracture"
-        ]):
-            return 0.2
-        
-        # Medium severity indicators (0.05-0.15)
-        if any(keyword in primary_finding for keyword in [
-            "likely fracture", "probable fracture", "suspected fracture"
-        ]):
-            return 0.1
-        
-        # Low severity indicators (0.0-0.05)
-        if any(keyword in primary_finding for keyword in [
-            "possible fracture", "minor", "hairline", "stress"
-        ]):
-            return 0.05
-        
-        # No findings (0.0)
-        if any(keyword in primary_finding for keyword in [
-            "no fractures", "no fracture", "normal", "clear", "negative"
-        ]):
-            return 0.0
-        
-        # Unknown findings (conservative estimate)
-        return 0.1
+        # Keyword tiers live in services/triage_rules (compiled, memoized per finding)
+        return self._rules().severity(primary_finding)
+    
+    def _rules(self, triage_config: Optional[Dict[str, Any]] = None) -> CompiledTriageRules:
+        """Compiled triage rules for a configuration (default policy if None)."""
+        if triage_config is None:
+            triage_config = policy_service.get_triage_config()
+        return triage_rule_cache.get(triage_config)
     
     def _score_to_level(self, score: float) -> Dict[str, str]:
         """
@@ -167,13 +152,13 @@ class TriageAgent:
         Returns:
             Dict with level, recommendation, and priority
         """
-        if score >= 0.75:  # High urgency
+        if score >= self.RED_SCORE_THRESHOLD:  # High urgency
             return {
                 "level": "RED",
                 "recommendation": "Seek immediate emergency medical attention",
                 "priority": "immediate"
             }
-        elif score >= 0.4:  # Medium urgency
+        elif score >= self.AMBER_SCORE_THRESHOLD:  # Medium urgency
             return {
                 "level": "AMBER", 
                 "recommendation": "Seek medical attention within 24-48 hours",
@@ -316,7 +301,7 @@ class TriageAgent:
     
     async def classify_urgency(
         self,
-        detections: List[Dict[str, Any]],
+        detections: Union[DetectionSet, List[Dict[str, Any]]],
         symptoms: Optional[str] = None,
         body_part: Optional[str] = None,
         request_id: Optional[UUID] = None
@@ -325,7 +310,7 @@ class TriageAgent:
         Classify urgency level based on detections and symptoms.
         
         Args:
-            detections: List of detection results from YOLO models
+            detections: Detection results from YOLO models (DetectionSet or dicts)
             symptoms: Optional patient-reported symptoms
             body_part: Detected body part (hand/leg)
             
@@ -335,6 +320,8 @@ class TriageAgent:
         start_time = time.time()
         
         try:
+            detections = DetectionSet.coerce(detections)
+            
             # Get triage configuration
             triage_config = policy_service.get_triage_config(request_id)
             
@@ -352,7 +339,7 @@ class TriageAgent:
             if self.llm_fallback_enabled:
                 logger.debug("Using LLM for triage assessment")
                 llm_result = await groq_service.generate_triage_assessment(
-                    detections=detections,
+                    detections=detections.to_dicts(),
                     symptoms=symptoms,
                     body_part=body_part
                 )
@@ -384,13 +371,14 @@ class TriageAgent:
     
     def _apply_dynamic_rules(
         self,
-        detections: List[Dict[str, Any]],
+        detections: DetectionSet,
         symptoms: Optional[str] = None,
         body_part: Optional[str] = None,
         triage_config: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Apply dynamic rule-based triage classification without hardcoded patterns."""
         
+        rules = self._rules(triage_config)
         logger.info(f"Applying dynamic rules to {len(detections)} detections")
         
         if not detections:
@@ -401,7 +389,7 @@ class TriageAgent:
             severity_score = 0.0  # No detections = low severity
             symptom_score = 0.0
             
-            if symptoms and self._has_severe_symptoms(symptoms):
+            if rules.has_severe_symptoms(symptoms):
                 symptom_score = 0.3  # Severe symptoms boost score
                 logger.info("Severe symptoms detected")
             
@@ -420,34 +408,22 @@ class TriageAgent:
         logger.info(f"Analyzing {len(detections)} detections dynamically")
         
         # Calculate overall triage score based on all detections
-        total_triage_score = 0.0
-        max_confidence = 0.0
-        rationale = []
+        scores = detections.scores
+        max_confidence = max(scores)
         
-        for detection in detections:
-            raw_label = detection.get("label", "")
-            label = raw_label.lower()
-            
-            # Get confidence score
-            score = detection.get("score")
-            if score is None:
-                score = detection.get("confidence", 0.0)
-            
-            max_confidence = max(max_confidence, score)
-            
-            # Calculate this detection's contribution to triage score
-            detection_severity = self._calculate_severity_score(label)
-            detection_contribution = (score * 0.7) + (detection_severity * 0.3)
-            
-            # Take the maximum contribution (most severe detection drives triage)
-            total_triage_score = max(total_triage_score, detection_contribution)
-            
-            rationale.append(f"{raw_label} detected (confidence: {score:.2f})")
-            
-            logger.info(f"Detection: {raw_label}, score: {score:.3f}, severity: {detection_severity:.3f}, contribution: {detection_contribution:.3f}")
+        # Severity depends only on the label, so it is computed once per label type;
+        # the maximum contribution (most severe detection) drives triage
+        total_triage_score = detections.max_weighted_score(lambda label: rules.severity(label.lower()), 0.7, 0.3)
+        
+        rationale = [
+            f"{raw_label} detected (confidence: {score:.2f})"
+            for raw_label, score in zip(detections.labels, scores)
+        ]
+        
+        logger.debug(f"Detection contributions: max {total_triage_score:.3f} over {len(detections.vocabulary)} label type(s)")
         
         # Add symptom factor if present
-        if symptoms and self._has_severe_symptoms(symptoms):
+        if rules.has_severe_symptoms(symptoms):
             total_triage_score = min(1.0, total_triage_score + 0.1)
             rationale.append("Concerning symptoms reported")
         
@@ -466,7 +442,7 @@ class TriageAgent:
 
     def _apply_rules(
         self,
-        detections: List[Dict[str, Any]],
+        detections: DetectionSet,
         symptoms: Optional[str] = None,
         body_part: Optional[str] = None,
         triage_config: Optional[Dict[str, Any]] = None
@@ -476,10 +452,7 @@ class TriageAgent:
         # Use default config if none provided
         if triage_config is None:
             triage_config = policy_service.get_triage_config()
-        
-        red_patterns = triage_config["red_patterns"]
-        amber_patterns = triage_config["amber_patterns"]
-        green_patterns = triage_config["green_patterns"]
+        rules = self._rules(triage_config)
         
         if not detections:
             # No detections - use dynamic scoring for consistency
@@ -489,7 +462,7 @@ class TriageAgent:
             severity_score = 0.0  # No detections = low severity
             symptom_score = 0.0
             
-            if symptoms and self._has_severe_symptoms(symptoms):
+            if rules.has_severe_symptoms(symptoms):
                 symptom_score = 0.3  # Severe symptoms boost score
                 logger.info("Severe symptoms detected")
             
@@ -506,47 +479,23 @@ class TriageAgent:
         
         # Analyze detections with confidence-based severity determination
         max_severity_level = "GREEN"
-        max_confidence = 0.0
-        rationale = []
-        
-        # Track weighted severity scores based on confidence
-        severity_scores = {"RED": 0.0, "AMBER": 0.0, "GREEN": 0.0}
-        detection_count = {"RED": 0, "AMBER": 0, "GREEN": 0}
-        
-        for detection in detections:
-            raw_label = detection.get("label", "")
-            label = raw_label.lower()
-            # Normalize label for matching: convert spaces/hyphens to underscores
-            normalized_label = label.replace(" ", "").replace("-", "")
-            # Normalize confidence: prefer 'score', fallback to 'confidence'
-            score = detection.get("score")
-            if score is None:
-                score = detection.get("confidence", 0.0)
-            
-            # Determine base severity category from patterns using normalized label
-            base_severity = None
-            if any(pattern in normalized_label for pattern in red_patterns):
-                base_severity = "RED"
-                rationale.append(f"Severe injury detected: {raw_label} (confidence: {score:.2f})")
-            elif any(pattern in normalized_label for pattern in green_patterns):
-                base_severity = "GREEN"
-                rationale.append(f"Minor injury detected: {raw_label} (confidence: {score:.2f})")
-            elif any(pattern in normalized_label for pattern in amber_patterns):
-                base_severity = "AMBER"
-                rationale.append(f"Moderate injury detected: {raw_label} (confidence: {score:.2f})")
-            else:
-                # Unknown detection type - treat as amber
-                base_severity = "AMBER"
-                rationale.append(f"Injury detected: {raw_label} (confidence: {score:.2f})")
+        scores = detections.scores
+        max_confidence = max(scores)
+        
+        # Patterns are matched once per label type, not once per detection
+        categories = detections.label_values(rules.category)
+        rationale_prefixes = ["Severe injury detected", "Moderate injury detected", "Minor injury detected", "Injury detected"]
+        rationale = [
+            f"{rationale_prefixes[category]}: {raw_label} (confidence: {score:.2f})"
+            for category, raw_label, score in zip(categories, detections.labels, scores)
+        ]
         
-            # Weight the severity by detection confidence
-            confidence_weight = score
-            severity_scores[base_severity] += confidence_weight
-            detection_count[base_severity] += 1
-            
-            # Track maximum confidence for overall assessment
-            if score > max_confidence:
-                max_confidence = score
+        # Weight the severity by detection confidence (RED, AMBER, GREEN)
+        # Unknown detection type - treat as amber
+        weighted = [0.0, 0.0, 0.0]
+        for category, score in zip(categories, scores):
+            weighted[AMBER if category == UNKNOWN else category] += score
+        severity_scores = {"RED": weighted[0], "AMBER": weighted[1], "GREEN": weighted[2]}
         
         # Determine final severity based on confidence-weighted scores and patterns
         red_threshold = triage_config["red_threshold"]
@@ -594,20 +543,20 @@ class TriageAgent:
         
         # High-confidence detections boost overall confidence
         high_conf_threshold = triage_config["high_confidence_threshold"]
-        high_conf_detections = [d for d in detections if (d.get("confidence") or d.get("score", 0)) > high_conf_threshold]
+        high_conf_detections = detections.count_scores_above(high_conf_threshold)
         confidence_boost_per_detection = triage_config.get("confidence_boost_per_detection", 0.05)
-        confidence_boost = len(high_conf_detections) * confidence_boost_per_detection
+        confidence_boost = high_conf_detections * confidence_boost_per_detection
         
         # Update max_confidence with boost but don't exceed 1.0
         boosted_confidence = min(max_confidence + confidence_boost, 1.0)
         
         # Check symptoms for additional context
         if symptoms:
-            if self._has_severe_symptoms(symptoms):
+            if rules.has_severe_symptoms(symptoms):
                 if max_severity_level == "GREEN":
                     max_severity_level = "AMBER"
                 rationale.append("Severe symptoms reported")
-            elif self._has_moderate_symptoms(symptoms):
+            elif rules.has_moderate_symptoms(symptoms):
                 rationale.append("Moderate symptoms reported")
         
         # Ensure we have rationale
@@ -645,34 +594,15 @@ class TriageAgent:
     
     def _has_severe_symptoms(self, symptoms: str) -> bool:
         """Check if symptoms indicate severe condition."""
-        if not symptoms:
-            return False
-        
-        symptoms_lower = symptoms.lower()
-        severe_keywords = [
-            "severe pain", "intense pain", "unbearable", "excruciating",
-            "deformity", "bone visible", "bleeding", "numbness",
-            "tingling", "can't move", "unable to bear weight"
-        ]
-        
-        return any(keyword in symptoms_lower for keyword in severe_keywords)
+        return self._rules().has_severe_symptoms(symptoms)
     
     def _has_moderate_symptoms(self, symptoms: str) -> bool:
         """Check if symptoms indicate moderate condition."""
-        if not symptoms:
-            return False
-        
-        symptoms_lower = symptoms.lower()
-        moderate_keywords = [
-            "pain", "swelling", "bruising", "stiffness",
-            "difficulty moving", "tender", "sore"
-        ]
-        
-        return any(keyword in symptoms_lower for keyword in moderate_keywords)
+        return self._rules().has_moderate_symptoms(symptoms)
     
     def _calculate_rule_confidence(
         self,
-        detections: List[Dict[str, Any]],
+        detections: DetectionSet,
         level: str,
         max_detection_score: float,
         triage_config: Optional[Dict[str, Any]] = None
@@ -686,24 +616,16 @@ class TriageAgent:
         if triage_config is None:
             triage_config = policy_service.get_triage_config()
         
-        red_patterns = triage_config["red_patterns"]
-        amber_patterns = triage_config["amber_patterns"]
-        green_patterns = triage_config["green_patterns"]
+        rules = self._rules(triage_config)
         
         # Base confidence from detection scores
-        avg_score = sum(d.get("score", 0) for d in detections) / len(detections)
+        avg_score = detections.score_stats()[2] / len(detections)
         base_confidence = (avg_score + max_detection_score) / 2
         
-        # Adjust based on consistency
-        detection_labels = [d.get("label", "") for d in detections]
-        
-        # Check if all detections point to same severity level
-        red_detections = sum(1 for label in detection_labels 
-                           if any(pattern in label.lower() for pattern in red_patterns))
-        amber_detections = sum(1 for label in detection_labels 
-                             if any(pattern in label.lower() for pattern in amber_patterns))
-        green_detections = sum(1 for label in detection_labels 
-                             if any(pattern in label.lower() for pattern in green_patterns))
+        # Check if all detections point to same severity level (matched once per label type)
+        red_detections, amber_detections, green_detections = [
+            sum(tier) for tier in zip(*detections.label_values(rules.pattern_matches))
+        ]
         
         total = len(detections)
         
@@ -792,7 +714,7 @@ class TriageAgent:
     
     async def process_triage_request(
         self,
-        detections: List[Dict[str, Any]],
+        detections: Union[DetectionSet, List[Dict[str, Any]]],
         symptoms: Optional[str] = None,
         body_part: Optional[str] = None,
         upstream_partial: bool = False,
@@ -802,7 +724,7 @@ class TriageAgent:
         Process triage request with full error handling and partial result support.
         
         Args:
-            detections: Detection results from hand/leg agents
+            detections: Detection results from hand/leg agents (DetectionSet or dicts)
             symptoms: Optional patient symptoms
             body_part: Detected body part
             upstream_partial: Whether upstream processing had partial results
@@ -841,6 +763,86 @@ class TriageAgent:
                 )
             }
 
+    def triage_batch(
+        self,
+        cases: List[Dict[str, Any]],
+        request_id: Optional[UUID] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Score many cases with the dynamic triage rules in one vectorized pass.
+        
+        Rules only (no LLM), for bulk re-triage and load tests. Level, score
+        and confidence match ``_apply_dynamic_rules`` for each case; the
+        per-detection rationale is not built.
+        
+        Args:
+            cases: Dicts with ``detections`` (DetectionSet or dicts) and optional
+                ``symptoms`` and ``body_part``
+            request_id: Request whose policy applies (default policy if None)
+            
+        Returns:
+            One dict per case, in order, with level, triage_score, confidence,
+            detection_count, body_part and method
+        """
+        if not cases:
+            return []
+        start_time = time.time()
+        rules = self._rules(policy_service.get_triage_config(request_id))
+        
+        detection_sets = [DetectionSet.coerce(case.get("detections")) for case in cases]
+        counts = np.array([len(detections) for detections in detection_sets], dtype=np.int64)
+        severe = np.array([rules.has_severe_symptoms(case.get("symptoms")) for case in cases], dtype=bool)
+        has_detections = counts > 0
+        
+        max_score = np.zeros(len(cases))
+        max_contribution = np.zeros(len(cases))
+        if has_detections.any():
+            nonempty = [detections for detections in detection_sets if detections]
+            # Map every case's labels onto one shared vocabulary so severity is
+            # looked up once per distinct label across the whole batch
+            vocabulary: Dict[str, int] = {}
+            label_ids = np.concatenate([
+                np.array([vocabulary.setdefault(label, len(vocabulary)) for label in detections.vocabulary])[detections.label_ids]
+                for detections in nonempty
+            ])
+            scores = np.array([score for detections in nonempty for score in detections.scores], dtype=np.float64)
+            contribution = (scores * 0.7) + (rules.severity_table(vocabulary)[label_ids] * 0.3)
+            
+            # Per-case maxima over contiguous segments
+            starts = np.concatenate([[0], np.cumsum(counts[has_detections])[:-1]])
+            max_score[has_detections] = np.maximum.reduceat(scores, starts)
+            max_contribution[has_detections] = np.maximum.reduceat(contribution, starts)
+        
+        triage_scores = np.where(
+            has_detections,
+            np.where(severe, np.minimum(1.0, max_contribution + 0.1), max_contribution),
+            np.where(severe, 0.3, 0.0)
+        )
+        confidences = np.where(has_detections, max_score, 0.8)
+        level_index = np.where(
+            triage_scores >= self.RED_SCORE_THRESHOLD, 0,
+            np.where(triage_scores >= self.AMBER_SCORE_THRESHOLD, 1, 2)
+        )
+        levels = ("RED", "AMBER", "GREEN")
+        
+        logger.info(
+            f"Batch triage of {len(cases)} cases ({int(counts.sum())} detections) "
+            f"in {(time.time() - start_time) * 1000:.1f}ms"
+        )
+        return [
+            {
+                "level": levels[index],
+                "triage_score": triage_score,
+                "confidence": confidence,
+                "detection_count": count,
+                "body_part": case.get("body_part"),
+                "method": "dynamic_scoring_batch"
+            }
+            for case, index, triage_score, confidence, count in zip(
+                cases, level_index.tolist(), triage_scores.tolist(), confidences.tolist(), counts.tolist()
+            )
+        ]
+
     def _default_recommendations(self, level: str) -> List[str]:
         """Provide level-specific default recommendations."""
         if level == "RED":
@@ -1,10 +1,10 @@
 """Analysis API endpoints for the orthopedic assistant."""
 
 import asyncio
-from typing import Dict, Any, Optional
-from uuid import UUID
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, status, Request
-from fastapi.responses import StreamingResponse
+from typing import Dict, Any, Literal, Optional
+from uuid import UUID, uuid4
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, status, Request, Response
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from loguru import logger
 
@@ -12,6 +12,17 @@ from schemas.base import BaseResponse, PatientInfo, ErrorResponse
 from schemas.orchestrator import ProcessingRequest, ProcessingResponse, StepGraph
 from services.orchestrator import orchestrator
 from services.storage import storage_service
+from services.inference_executor import InferenceQueueFullError
+from services.model_pool import model_pool
+from services.decoded_image import DecodedImage
+from services.result_cache import result_cache
+from services.report_jobs import report_job_service
+from services.upload_stage import upload_stage
+from services.detection_set import DetectionSet
+from services.analysis_jobs import analysis_job_queue, job_event_data
+from services.step_events import step_event_hub, step_event_data
+from services.sse import format_sse, format_sse_comment, sse_response
+from api.file_responses import stored_file_response
 from services.security import request_validator, report_authorizer, DataSanitizer
 from services.error_handler import (
     ErrorCode, ValidationError, AuthorizationError, ProcessingError
@@ -56,6 +67,21 @@ class AnalyzeRequest(BaseModel):
     timestamp: Optional[str] = Field(None, description="Request timestamp")
     source: Optional[str] = Field(None, description="Request source identifier")
     
+    # Artifact delivery
+    response_mode: Literal["reference", "inline"] = Field(
+        default="reference",
+        description="'reference' returns storage IDs and URLs for artifacts; 'inline' embeds base64 "
+                    "annotated image and PDF (legacy, waits for the report)"
+    )
+    
+    # Execution
+    execution: Literal["sync", "async"] = Field(
+        default="sync",
+        description="'sync' holds the connection until the analysis finishes; 'async' queues it and "
+                    "returns 202 Accepted, results are polled from /api/requests/{request_id}"
+    )
+    callback_url: Optional[str] = Field(None, description="URL notified when an async analysis finishes")
+    
     def model_validate(cls, values):
         """Validate that either image_url or image_data is provided."""
         image_url = values.get('image_url')
@@ -92,6 +118,35 @@ class RequestStatusResponse(BaseResponse):
     artifacts: Dict[str, str] = Field(default_factory=dict, description="Available artifacts")
     created_at: str = Field(..., description="Request creation timestamp")
     updated_at: str = Field(..., description="Last update timestamp")
+    queue: Optional[Dict[str, Any]] = Field(None, description="Queue position for async analyses")
+    result: Optional[Dict[str, Any]] = Field(None, description="Analysis response once an async analysis completes")
+
+
+async def _inline_pdf_report(pdf_report: Dict[str, Any]) -> Dict[str, Any]:
+    """Wait for a queued report and embed it as base64 (legacy inline mode)."""
+    import base64
+    
+    try:
+        from app.config import config
+        timeout = config.report_timeout
+    except Exception:
+        # Fallback for testing
+        timeout = 5
+    
+    report_job = await report_job_service.wait(pdf_report['report_id'], timeout=timeout)
+    if report_job is None or report_job.status != "completed":
+        # Not ready in time; the client can still poll the status URL
+        logger.warning(f"PDF report {pdf_report['report_id']} not ready for inline response")
+        return {**pdf_report, 'status': report_job.status if report_job else 'unknown'}
+    
+    pdf_bytes = storage_service.retrieve_file(report_job.pdf_id)
+    return {
+        **pdf_report,
+        'status': report_job.status,
+        'download_url': report_job.download_url,
+        'content': base64.b64encode(pdf_bytes).decode('utf-8'),
+        'size_bytes': len(pdf_bytes)
+    }
 
 
 @router.post("/analyze", response_model=AnalyzeResponse)
@@ -121,24 +176,85 @@ async def analyze_image(
     - Patient-friendly diagnostic summary
     - Clinical report manifest with file references
     - Generated artifacts (annotated images, PDFs, etc.)
+    
+    With `execution: "async"` the analysis is queued instead and `202 Accepted`
+    is returned with the request ID and queue position; poll
+    `/api/requests/{request_id}` or pass `callback_url` to be notified.
+    A full queue returns 503.
     """
-    try:
-        # Get request ID from middleware
-        request_id = getattr(http_request.state, 'request_id', 'unknown')
+    # Get request ID from middleware; a fresh one keeps queued jobs distinct when it is disabled
+    request_id = getattr(http_request.state, 'request_id', None) or str(uuid4())
+    
+    if request.execution == "async":
+        callback_url = analysis_job_queue.resolve_callback_url(request.callback_url)
         
-        # Validate and sanitize request
-        request_data = request.dict()
+        # Bad input is rejected with a 4xx now rather than reported later as a failed job
+        _normalize_upload_fields(request)
+        image = None
+        if request.image_data and not request.image_url:
+            image = DecodedImage.from_base64(request.image_data)
+        else:
+            request_validator.validate_analyze_request(request.dict())
+        
+        async def run_job() -> Dict[str, Any]:
+            result = await _run_analysis(request, request_id, image, stream_diagnosis=True)
+            return result if isinstance(result, dict) else result.dict()
+        
+        job = analysis_job_queue.submit(request_id, run_job, callback_url)
+        status_url = f"/api/requests/{request_id}"
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "success": True,
+                "request_id": request_id,
+                "status": job["status"],
+                "status_url": status_url,
+                "events_url": f"{status_url}/events",
+                "queue": {
+                    "position": job["queue_position"],
+                    "depth": analysis_job_queue.queue_depth,
+                    "max_depth": analysis_job_queue.max_queue
+                },
+                "callback": job["callback"] is not None
+            },
+            headers={"Location": status_url}
+        )
+    
+    return await _run_analysis(request, request_id)
+
+
+def _normalize_upload_fields(request: AnalyzeRequest) -> None:
+    """Accept alternative frontend upload field names (Next.js backend may send file_data/file_name/file_type)."""
+    if not request.image_data and request.file_data:
+        request.image_data = request.file_data
+
+    if not request.image_filename and request.file_name:
+        request.image_filename = request.file_name
 
-        # Accept alternative frontend upload field names and normalize them
-        # (Next.js backend may send file_data/file_name/file_type)
-        if not request.image_data and request.file_data:
-            request.image_data = request.file_data
+    if not request.image_content_type and request.file_type:
+        request.image_content_type = request.file_type
 
-        if not request.image_filename and request.file_name:
-            request.image_filename = request.file_name
 
-        if not request.image_content_type and request.file_type:
-            request.image_content_type = request.file_type
+async def _run_analysis(
+    request: AnalyzeRequest,
+    request_id: str,
+    image: Optional[DecodedImage] = None,
+    stream_diagnosis: bool = False
+) -> AnalyzeResponse:
+    """
+    Run the analysis pipeline for one request (sync response or queued job).
+    
+    Args:
+        request: Analysis request
+        request_id: Identifier used for artifacts, uploads and reports
+        image: Upload already decoded while validating a queued request
+        stream_diagnosis: Publish the diagnosis model's output to the request's
+            event stream as ``diagnosis`` events while it is generated
+    """
+    try:
+        # Validate and sanitize request
+        request_data = request.dict()
+        _normalize_upload_fields(request)
         
         # Handle both image_url and image_data
         if request.image_data and not request.image_url:
@@ -149,20 +265,13 @@ async def analyze_image(
                 # Step 1: Simple body part detection using image analysis
                 logger.info(f"Starting body part detection for request {request_id}")
                 
-                # Convert base64 to bytes for agent processing
-                import base64
-                from PIL import Image
-                import io
-                
-                image_data_clean = request.image_data
-                if image_data_clean.startswith('data:'):
-                    image_data_clean = image_data_clean.split(',')[1]
-                image_bytes = base64.b64decode(image_data_clean)
+                # Decode once; every later stage reuses the same bytes and pixels
+                if image is None:
+                    image = DecodedImage.from_base64(request.image_data)
+                logger.info(f"Decoded upload {image} in {image.decode_time_ms}ms")
                 
                 # Simple body part detection based on image aspect ratio
-                image = Image.open(io.BytesIO(image_bytes))
-                width, height = image.size
-                aspect_ratio = width / height
+                aspect_ratio = image.aspect_ratio
                 
                 # Determine body part based on aspect ratio (simple heuristic)
                 if aspect_ratio > 1.2:  # Wide image - likely hand
@@ -180,14 +289,8 @@ async def analyze_image(
                 # Step 2: Run the appropriate YOLO agent for detailed analysis
                 logger.info(f"Running {detected_body_part} YOLO agent for fracture detection")
                 
-                if detected_body_part == 'hand':
-                    from agents.hand import get_hand_agent
-                    agent = get_hand_agent()
-                    agent_result = await agent.detect_fractures(image_bytes)
-                else:  # leg
-                    from agents.leg import get_leg_agent
-                    agent = get_leg_agent()
-                    agent_result = await agent.detect_fractures(image_bytes)
+                async with model_pool.lease(detected_body_part) as agent:
+                    agent_result = await agent.detect_fractures(image)
                 
                 # Create detection result structure
                 detection_result = {
@@ -199,24 +302,69 @@ async def analyze_image(
                     'inference_time_ms': agent_result.get('inference_time_ms', 0)
                 }
                 
-                # Step 3: Generate triage assessment via triage agent (rules-first, responsible thresholds)
-                from agents.triage import triage_agent
-                logger.info(f"Generating triage assessment for request {request_id} via TriageAgent")
-                triage_result = await triage_agent.process_triage_request(
-                    detections=detection_result['detections'],
-                    symptoms=request.symptoms,
-                    body_part=detection_result['body_part'],
-                    upstream_partial=False
+                # Re-submitted images with the same symptoms reuse triage and diagnosis
+                assessment_key = result_cache.image_key(
+                    image,
+                    detected_body_part,
+                    "assessment",
+                    model_path=agent.model_path,
+                    context={"symptoms": request.symptoms}
                 )
+                cached_assessment = None
+                if not agent_result.get('error'):
+                    cached_assessment = result_cache.get(assessment_key, detected_body_part, memory_only=True)
                 
-                # Step 4: Generate patient-friendly diagnosis summary using LLM with triage context
-                logger.info(f"Generating diagnosis summary for request {request_id}")
-                diagnosis_result = await groq_service.generate_diagnosis_summary(
-                    triage_result=triage_result,
-                    detections=detection_result['detections'],
-                    symptoms=request.symptoms,
-                    body_part=detection_result['body_part']
-                )
+                if cached_assessment is not None:
+                    logger.info(f"Reusing cached triage and diagnosis for request {request_id}")
+                    triage_result = cached_assessment['triage']
+                    diagnosis_result = cached_assessment['diagnosis']
+                else:
+                    # Step 3: Generate triage assessment via triage agent (rules-first, responsible thresholds)
+                    from agents.triage import triage_agent
+                    logger.info(f"Generating triage assessment for request {request_id} via TriageAgent")
+                    triage_result = await triage_agent.process_triage_request(
+                        detections=DetectionSet.from_dicts(detection_result['detections']),
+                        symptoms=request.symptoms,
+                        body_part=detection_result['body_part'],
+                        upstream_partial=False
+                    )
+                
+                    # Step 4: Generate patient-friendly diagnosis summary using LLM with triage context
+                    logger.info(f"Generating diagnosis summary for request {request_id}")
+                    if stream_diagnosis:
+                        # Same validated result as the blocking call; followers of
+                        # /api/requests/{request_id}/events see the text as it arrives
+                        async for event in groq_service.stream_diagnosis_summary(
+                            triage_result=triage_result,
+                            detections=detection_result['detections'],
+                            symptoms=request.symptoms,
+                            body_part=detection_result['body_part']
+                        ):
+                            if event["type"] == "token":
+                                step_event_hub.publish(request_id, "diagnosis", {
+                                    "request_id": request_id,
+                                    "content": event["content"]
+                                })
+                            else:
+                                diagnosis_result = event["data"]
+                    else:
+                        diagnosis_result = await groq_service.generate_diagnosis_summary(
+                            triage_result=triage_result,
+                            detections=detection_result['detections'],
+                            symptoms=request.symptoms,
+                            body_part=detection_result['body_part']
+                        )
+                    
+                    # Only cache complete, non-fallback results; derived from the
+                    # patient's symptoms, so they are never written to disk
+                    if not (agent_result.get('error') or triage_result.get('error')
+                            or diagnosis_result.get('error') or diagnosis_result.get('fallback_used')):
+                        result_cache.put(
+                            assessment_key,
+                            detected_body_part,
+                            {"triage": triage_result, "diagnosis": diagnosis_result},
+                            memory_only=True
+                        )
                 
                 # Build comprehensive response
                 steps_summary = {
@@ -297,45 +445,43 @@ async def analyze_image(
                 # Add annotated image data to response if available
                 response_dict = response_data.dict()
                 
-                # Upload images to Cloudinary and add URLs to response
-                from services.cloudinary_service import cloudinary_service
-                
-                cloudinary_urls = {}
-                
-                # Upload original image to Cloudinary
-                original_filename = request.image_filename or "original_image.jpg"
-                original_upload = cloudinary_service.upload_base64_image(
-                    request.image_data, 
-                    is_annotated=False, 
-                    filename=original_filename, 
-                    request_id=request_id
-                )
-                
-                if original_upload:
-                    cloudinary_urls['original_image_url'] = original_upload['url']
-                    cloudinary_urls['original_image_public_id'] = original_upload['public_id']
-                    logger.info(f"Original image uploaded to Cloudinary: {original_upload['url']}")
-                else:
-                    logger.warning("Failed to upload original image to Cloudinary")
-                
-                # Upload annotated image to Cloudinary if available
+                annotated_image = None
                 if detection_result.get('annotated_image_data'):
-                    annotated_upload = cloudinary_service.upload_annotated_image(
-                        detection_result['annotated_image_data'],
-                        original_filename,
-                        request_id
-                    )
+                    if detection_result['annotated_image_data'] is image.raw_bytes:
+                        # Annotation failed and the agent handed back the original
+                        annotated_image = image
+                    else:
+                        # Annotation preserves dimensions; pixels are only decoded if needed
+                        annotated_image = DecodedImage(
+                            detection_result['annotated_image_data'],
+                            width=image.width,
+                            height=image.height,
+                            format='JPEG'
+                        )
                     
-                    if annotated_upload:
-                        cloudinary_urls['annotated_image_url'] = annotated_upload['url']
-                        cloudinary_urls['annotated_image_public_id'] = annotated_upload['public_id']
-                        logger.info(f"Annotated image uploaded to Cloudinary: {annotated_upload['url']}")
+                    if request.response_mode == "inline":
+                        # Legacy clients read the image straight from the response
+                        response_dict['annotated_image_data'] = annotated_image.to_data_url()
                     else:
+                        # Stored once and served with ETag/Range from /api/annotated/{id}
+                        annotated_image_id = await asyncio.to_thread(
+                            storage_service.store_file, annotated_image.raw_bytes, "annotated", "jpg"
+                        )
+                        detection_result['annotated_image_id'] = annotated_image_id
+                        response_dict['artifacts']['annotated_image_id'] = annotated_image_id
+                        response_dict['artifacts']['annotated_image_url'] = f"/api/annotated/{annotated_image_id}"
+                
+                # Upload original and annotated images concurrently, off the event loop
+                annotated_bytes = annotated_image.raw_bytes if annotated_image else None
+                if upload_stage.mode == "after_response":
+                    # Provisional IDs now, uploads finish in the background
+                    cloudinary_urls = upload_stage.start_analysis_upload(request_id, image.raw_bytes, annotated_bytes)
+                else:
+                    cloudinary_urls = await upload_stage.upload_analysis_images(request_id, image.raw_bytes, annotated_bytes)
+                    if 'original_image_url' not in cloudinary_urls:
+                        logger.warning("Failed to upload original image to Cloudinary")
+                    if annotated_bytes is not None and 'annotated_image_url' not in cloudinary_urls:
                         logger.warning("Failed to upload annotated image to Cloudinary")
-                    
-                    # Still include base64 for backward compatibility
-                    annotated_b64 = base64.b64encode(detection_result['annotated_image_data']).decode('utf-8')
-                    response_dict['annotated_image_data'] = f"data:image/jpeg;base64,{annotated_b64}"
                 
                 # Add Cloudinary URLs to response
                 response_dict['cloudinary_urls'] = cloudinary_urls
@@ -343,10 +489,8 @@ async def analyze_image(
                 if detection_result.get('annotated_image_id'):
                     response_dict['annotated_image_id'] = detection_result['annotated_image_id']
                 
-                # Generate PDF report
+                # Queue PDF report generation; the client polls the status URL
                 try:
-                    from agents.pdf_report import pdf_report_agent
-                    
                     # Extract patient information from request
                     patient_info = None
                     if request.patient_info:
@@ -364,24 +508,27 @@ async def analyze_image(
                         if request.user_id:
                             patient_info['user_id'] = request.user_id
                     
-                    # Generate PDF report with patient information
-                    pdf_bytes = pdf_report_agent.generate_report(
-                        analysis_data=response_dict,
-                        patient_info=patient_info
+                    # Images are handed over in memory; the report is rendered
+                    # on the report worker pool after this response is sent
+                    report_job = report_job_service.submit(
+                        request_id=request_id,
+                        analysis_data=dict(response_dict),
+                        patient_info=patient_info,
+                        original_image=image,
+                        annotated_image=annotated_image
                     )
-                    
-                    # Convert PDF to base64 for JSON response
-                    pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
                     response_dict['pdf_report'] = {
-                        'content': pdf_base64,
+                        'report_id': report_job.report_id,
+                        'status': report_job.status,
                         'filename': f'orthoassist_report_{request_id}.pdf',
-                        'size_bytes': len(pdf_bytes)
+                        'status_url': f'/api/reports/{report_job.report_id}/status'
                     }
                     
-                    logger.info(f"PDF report generated successfully for request {request_id}")
+                    if request.response_mode == "inline":
+                        response_dict['pdf_report'] = await _inline_pdf_report(response_dict['pdf_report'])
                     
                 except Exception as e:
-                    logger.error(f"Failed to generate PDF report: {e}")
+                    logger.error(f"Failed to queue PDF report: {e}")
                     # Don't fail the entire request if PDF generation fails
                     response_dict['pdf_report'] = {
                         'error': 'PDF generation failed',
@@ -390,6 +537,8 @@ async def analyze_image(
                 
                 return response_dict
                 
+            except InferenceQueueFullError:
+                raise
             except Exception as e:
                 logger.error(f"Failed to process uploaded image: {e}")
                 raise HTTPException(
@@ -419,8 +568,8 @@ async def analyze_image(
             overrides=sanitized_data.get("overrides", {})
         )
         
-        # Process the request through orchestrator
-        processing_response = await orchestrator.process_request(processing_request)
+        # Process the request through orchestrator; the step graph shares the request ID
+        processing_response = await orchestrator.process_request(processing_request, UUID(request_id))
         
         # Extract results from processing response
         step_graph = processing_response.step_graph
@@ -475,8 +624,8 @@ async def analyze_image(
             artifacts=processing_response.artifacts
         )
         
-    except ValidationError:
-        # Re-raise validation errors (handled by middleware)
+    except (ValidationError, InferenceQueueFullError):
+        # Re-raise validation and backpressure errors (handled by middleware)
         raise
     except Exception as e:
         # Convert to ProcessingError with sanitized message
@@ -488,6 +637,31 @@ async def analyze_image(
         )
 
 
+def _job_status_response(job: Dict[str, Any]) -> RequestStatusResponse:
+    """Build the status response for a queued (async) analysis."""
+    from datetime import datetime, timezone
+    
+    result = job.get("result") or {}
+    overall_status = {"queued": "queued", "running": "processing"}.get(job["status"], job["status"])
+    updated_at = job.get("completed_at") or job.get("started_at") or job["created_at"]
+    
+    return RequestStatusResponse(
+        request_id=job["request_id"],
+        status=overall_status,
+        message=job.get("error"),
+        steps=result.get("steps", {}),
+        artifacts=result.get("artifacts", {}),
+        created_at=datetime.fromtimestamp(job["created_at"], tz=timezone.utc).isoformat(),
+        updated_at=datetime.fromtimestamp(updated_at, tz=timezone.utc).isoformat(),
+        queue={
+            "depth": analysis_job_queue.queue_depth,
+            "max_depth": analysis_job_queue.max_queue,
+            "callback": job.get("callback")
+        },
+        result=job.get("result")
+    )
+
+
 @router.get("/requests/{request_id}", response_model=RequestStatusResponse)
 async def get_request_status(request_id: str, http_request: Request) -> RequestStatusResponse:
     """
@@ -503,6 +677,11 @@ async def get_request_status(request_id: str, http_request: Request) -> RequestS
     - Creation and update timestamps
     """
     try:
+        # Analyses queued with execution="async" are tracked by the job queue
+        job = analysis_job_queue.get(request_id)
+        if job is not None:
+            return _job_status_response(job)
+        
         # Parse request ID
         try:
             request_uuid = UUID(request_id)
@@ -522,15 +701,7 @@ async def get_request_status(request_id: str, http_request: Request) -> RequestS
             )
         
         # Determine overall status
-        if step_graph.is_complete():
-            if step_graph.has_fatal_error():
-                overall_status = "failed"
-            elif step_graph.partial:
-                overall_status = "completed_partial"
-            else:
-                overall_status = "completed"
-        else:
-            overall_status = "processing"
+        overall_status = orchestrator.get_overall_status(step_graph)
         
         # Build detailed step information
         steps_detail = {
@@ -553,10 +724,12 @@ async def get_request_status(request_id: str, http_request: Request) -> RequestS
                     "duration_ms": step.duration_ms,
                     "error_message": step.error_message,
                     "retry_count": step.retry_count,
-                    "artifacts": step.artifacts
+                    "artifacts": step.artifacts,
+                    "depends_on": [name.value for name in step.depends_on]
                 }
                 for step in step_graph.steps
-            ]
+            ],
+            "timing": step_graph.get_timing_summary()
         }
         
         # Collect all artifacts
@@ -595,8 +768,102 @@ async def get_request_status(request_id: str, http_request: Request) -> RequestS
         )
 
 
-@router.get("/reports/{pdf_id}")
-async def get_report_pdf(pdf_id: str, http_request: Request, token: Optional[str] = None) -> StreamingResponse:
+@router.get("/requests/{request_id}/events")
+async def stream_request_events(request_id: str, http_request: Request) -> Response:
+    """
+    Stream step transitions of a processing request as Server-Sent Events.
+    
+    Replaces polling `/api/requests/{request_id}`: one `step` event is pushed
+    per transition (running, ok, error, timeout, skipped) with confidence,
+    duration_ms and artifacts, followed by a final `end` event with the
+    overall status and timing. Past transitions are replayed on connect;
+    reconnecting clients resume after `Last-Event-ID`.
+    
+    Analyses queued with `execution: "async"` can be followed by the ID
+    returned with `202 Accepted`: `job` events report the queued and running
+    state, then the step events of the pipeline, then `end`. For uploaded
+    images, `diagnosis` events carry the diagnosis model's raw output as it
+    is generated; the validated summary is part of the final result.
+    
+    Requests handled by another worker process get their current state as
+    a snapshot followed by `end` if they have finished.
+    """
+    try:
+        request_uuid = UUID(request_id)
+    except ValueError:
+        raise ValidationError(
+            "Invalid request ID format",
+            ErrorCode.INVALID_REQUEST_FORMAT
+        )
+    
+    try:
+        last_event_id = int(http_request.headers.get("last-event-id", ""))
+    except ValueError:
+        last_event_id = None
+    
+    if not step_event_hub.has_topic(request_id):
+        job = analysis_job_queue.get(request_id)
+        step_graph = orchestrator.get_request_status(request_uuid)
+        if not step_graph and job is None:
+            raise ValidationError(
+                "Request not found",
+                ErrorCode.INVALID_REQUEST_FORMAT
+            )
+        
+        async def snapshot_frames():
+            if job is not None:
+                yield format_sse("job", job_event_data(job))
+            if step_graph:
+                for step in step_graph.steps:
+                    yield format_sse("step", step_event_data(step_graph, step))
+            if job is not None:
+                if job["status"] in ("completed", "failed"):
+                    yield format_sse("end", job_event_data(job))
+                return
+            overall_status = orchestrator.get_overall_status(step_graph)
+            if overall_status != "processing":
+                yield format_sse("end", {
+                    "request_id": request_id,
+                    "status": overall_status,
+                    "partial": step_graph.partial,
+                    "triage_level": step_graph.triage_level,
+                    "timing": step_graph.get_timing_summary()
+                })
+        
+        return sse_response(snapshot_frames())
+    
+    async def event_frames():
+        async for event_id, event, data in step_event_hub.subscribe(request_id, last_event_id):
+            if event == "keepalive":
+                yield format_sse_comment()
+            else:
+                yield format_sse(event, data, event_id)
+    
+    return sse_response(event_frames())
+
+
+@router.get("/uploads/{request_id}/status", response_model=Dict[str, Any])
+async def get_upload_status(request_id: str) -> Dict[str, Any]:
+    """
+    Get the status of image uploads started after the analysis response.
+    
+    Only applies when UPLOAD_MODE is ``after_response``, where `/analyze`
+    returns provisional Cloudinary IDs before the uploads have finished.
+    
+    **Returns:**
+    - Overall status (pending, completed, failed) and per-image status
+    """
+    upload_status = upload_stage.get_upload_status(request_id)
+    if upload_status is None:
+        raise ValidationError(
+            "Upload not found",
+            ErrorCode.INVALID_REQUEST_FORMAT
+        )
+    return upload_status
+
+
+@router.api_route("/reports/{pdf_id}", methods=["GET", "HEAD"])
+async def get_report_pdf(pdf_id: str, http_request: Request, token: Optional[str] = None) -> Response:
     """
     Stream a generated PDF report.
     
@@ -609,7 +876,7 @@ async def get_report_pdf(pdf_id: str, http_request: Request, token: Optional[str
     - Content-Type: application/pdf
     
     **Returns:**
-    - PDF file stream with appropriate headers
+    - PDF file stream with appropriate headers (ETag, Range/206, HEAD from index)
     - 404 if report not found
     - 500 if streaming fails
     """
@@ -629,37 +896,30 @@ async def get_report_pdf(pdf_id: str, http_request: Request, token: Optional[str
         # Validate authorization for report access
         report_authorizer.validate_report_access(pdf_id, token)
         
-        # Retrieve PDF file from storage
-        pdf_data = storage_service.retrieve_file(pdf_id)
+        # Open PDF file in storage (contents are streamed, not loaded)
+        stored_file = storage_service.open_file(pdf_id)
         
-        if not pdf_data:
+        if not stored_file:
             logger.warning(f"PDF report not found: {pdf_id}")
             raise ValidationError(
                 "PDF report not found",
                 ErrorCode.INVALID_REPORT_ID
             )
         
-        # Create streaming response
-        def generate_pdf():
-            """Generator for PDF streaming."""
-            chunk_size = 8192
-            for i in range(0, len(pdf_data), chunk_size):
-                yield pdf_data[i:i + chunk_size]
-        
         # Log successful access (sanitized)
         log_data = DataSanitizer.sanitize_for_logging({
             "request_id": request_id,
             "pdf_id": pdf_id,
-            "file_size_bytes": len(pdf_data)
+            "file_size_bytes": stored_file.size
         })
         logger.info("PDF report access granted", **log_data)
         
-        return StreamingResponse(
-            generate_pdf(),
+        return stored_file_response(
+            http_request,
+            stored_file,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"inline; filename=\"orthopedic_report_{pdf_id}.pdf\"",
-                "Content-Length": str(len(pdf_data)),
                 "Cache-Control": "private, max-age=3600",  # Cache for 1 hour
                 "X-Content-Type-Options": "nosniff",
                 "X-Request-ID": request_id
@@ -690,12 +950,10 @@ async def list_active_requests() -> Dict[str, Any]:
     In production, access should be restricted to authorized users only.
     """
     try:
-        active_requests = orchestrator.active_requests
-        
         request_summaries = []
-        for request_id, step_graph in active_requests.items():
+        for step_graph in orchestrator.list_requests(limit=50):
             summary = {
-                "request_id": str(request_id),
+                "request_id": str(step_graph.request_id),
                 "mode": step_graph.mode,
                 "status": "completed" if step_graph.is_complete() else "processing",
                 "partial": step_graph.partial,
@@ -712,8 +970,8 @@ async def list_active_requests() -> Dict[str, Any]:
         request_summaries.sort(key=lambda x: x["created_at"], reverse=True)
         
         return {
-            "total_requests": len(request_summaries),
-            "requests": request_summaries[:50]  # Limit to 50 most recent
+            "total_requests": len(orchestrator.active_requests),
+            "requests": request_summaries  # Limited to 50 most recent
         }
         
     except Exception as e:
@@ -756,8 +1014,7 @@ async def cleanup_request(request_id: str) -> Dict[str, Any]:
             artifacts_to_delete.extend(step.artifacts.values())
         
         # Remove from orchestrator
-        if request_uuid in orchestrator.active_requests:
-            del orchestrator.active_requests[request_uuid]
+        orchestrator.remove_request(request_uuid)
         
         # Clean up artifacts from storage
         deleted_artifacts = 0
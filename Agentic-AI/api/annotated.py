@@ -2,13 +2,12 @@
 
 import os
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Response, Depends
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Request, Response, Depends
 from loguru import logger
-import io
 
 from services.storage import storage_service
 from services.security import verify_api_key
+from api.file_responses import stored_file_response
 
 router = APIRouter()
 
@@ -16,17 +15,22 @@ router = APIRouter()
 @router.get("/annotated/{image_id}")
 async def get_annotated_image(
     image_id: str,
+    request: Request,
     api_key: Optional[str] = Depends(verify_api_key)
-) -> StreamingResponse:
+) -> Response:
     """
     Retrieve an annotated image by ID.
     
+    Supports ``Range``/``If-Range`` (206) and ``If-None-Match`` (304); full
+    local files are sent with sendfile where the server supports it.
+    
     Args:
         image_id: The ID of the annotated image to retrieve
+        request: Incoming request (conditional and range headers)
         api_key: Optional API key for authentication
         
     Returns:
-        StreamingResponse with image bytes and appropriate content-type
+        Streaming file response with appropriate content-type
         
     Raises:
         HTTPException: If image not found or access denied
@@ -44,29 +48,11 @@ async def get_annotated_image(
         
         logger.info(f"Attempting to retrieve annotated image: {image_id}")
         
-        # Retrieve image data from storage
-        try:
-            image_data = storage_service.retrieve_file(image_id)
-            if image_data is None:
-                logger.warning(f"Annotated image not found in storage: {image_id}")
-                raise HTTPException(status_code=404, detail="Annotated image not found")
-            logger.info(f"Successfully retrieved annotated image: {image_id} ({len(image_data)} bytes)")
-        except FileNotFoundError:
-            logger.warning(f"Annotated image file not found: {image_id}")
+        # Open the stored image (index lookup only; contents are streamed)
+        stored_file = storage_service.open_file(image_id)
+        if stored_file is None:
+            logger.warning(f"Annotated image not found in storage: {image_id}")
             raise HTTPException(status_code=404, detail="Annotated image not found")
-        except Exception as e:
-            logger.error(f"Failed to retrieve annotated image {image_id}: {e}")
-            raise HTTPException(status_code=500, detail="Failed to retrieve image")
-        
-        # Determine content type based on image format
-        content_type = "image/jpeg"  # Default to JPEG
-        if image_id.lower().endswith('.png'):
-            content_type = "image/png"
-        elif image_id.lower().endswith('.jpg') or image_id.lower().endswith('.jpeg'):
-            content_type = "image/jpeg"
-        
-        # Create streaming response
-        image_stream = io.BytesIO(image_data)
         
         # Set appropriate headers
         headers = {
@@ -75,13 +61,9 @@ async def get_annotated_image(
             "X-Content-Type-Options": "nosniff"
         }
         
-        logger.debug(f"Serving annotated image: {image_id} ({len(image_data)} bytes)")
+        logger.debug(f"Serving annotated image: {image_id} ({stored_file.size} bytes)")
         
-        return StreamingResponse(
-            io.BytesIO(image_data),
-            media_type=content_type,
-            headers=headers
-        )
+        return stored_file_response(request, stored_file, headers=headers)
         
     except HTTPException:
         # Re-raise HTTP exceptions as-is
@@ -118,32 +100,17 @@ async def get_annotated_image_info(
         if sanitized_id != image_id:
             raise HTTPException(status_code=400, detail="Invalid image ID format")
         
-        # Check if image exists
-        try:
-            image_data = storage_service.retrieve_file(image_id)
-            if image_data is None:
-                raise HTTPException(status_code=404, detail="Annotated image not found")
-        except FileNotFoundError:
+        # Get file metadata from the storage index
+        stored_file = storage_service.open_file(image_id)
+        if stored_file is None:
             raise HTTPException(status_code=404, detail="Annotated image not found")
-        except Exception as e:
-            logger.error(f"Failed to check annotated image {image_id}: {e}")
-            raise HTTPException(status_code=500, detail="Failed to check image")
-        
-        # Get file metadata
-        file_size = len(image_data)
-        
-        # Determine format
-        image_format = "jpeg"
-        if image_id.lower().endswith('.png'):
-            image_format = "png"
-        elif image_id.lower().endswith('.jpg') or image_id.lower().endswith('.jpeg'):
-            image_format = "jpeg"
         
         return {
             "image_id": image_id,
-            "size_bytes": file_size,
-            "format": image_format,
-            "content_type": f"image/{image_format}",
+            "size_bytes": stored_file.size,
+            "format": stored_file.content_type.split("/")[-1],
+            "content_type": stored_file.content_type,
+            "sha256": stored_file.sha256,
             "url": f"/api/annotated/{image_id}"
         }
         
@@ -157,13 +124,17 @@ async def get_annotated_image_info(
 @router.head("/annotated/{image_id}")
 async def head_annotated_image(
     image_id: str,
+    request: Request,
     api_key: Optional[str] = Depends(verify_api_key)
 ) -> Response:
     """
     Check if an annotated image exists (HEAD request).
     
+    Served from index metadata; the image itself is not read.
+    
     Args:
         image_id: The ID of the annotated image
+        request: Incoming request
         api_key: Optional API key for authentication
         
     Returns:
@@ -182,32 +153,17 @@ async def head_annotated_image(
             raise HTTPException(status_code=400, detail="Invalid image ID format")
         
         # Check if image exists
-        try:
-            image_data = storage_service.retrieve_file(image_id)
-            if image_data is None:
-                raise HTTPException(status_code=404, detail="Annotated image not found")
-        except FileNotFoundError:
+        stored_file = storage_service.open_file(image_id)
+        if stored_file is None:
             raise HTTPException(status_code=404, detail="Annotated image not found")
-        except Exception as e:
-            logger.error(f"Failed to check annotated image {image_id}: {e}")
-            raise HTTPException(status_code=500, detail="Failed to check image")
-        
-        # Determine content type
-        content_type = "image/jpeg"
-        if image_id.lower().endswith('.png'):
-            content_type = "image/png"
-        elif image_id.lower().endswith('.jpg') or image_id.lower().endswith('.jpeg'):
-            content_type = "image/jpeg"
         
         # Return headers without body
         headers = {
-            "Content-Type": content_type,
-            "Content-Length": str(len(image_data)),
             "Cache-Control": "public, max-age=3600",
             "X-Content-Type-Options": "nosniff"
         }
         
-        return Response(headers=headers)
+        return stored_file_response(request, stored_file, headers=headers)
         
     except HTTPException:
         raise
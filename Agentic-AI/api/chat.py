@@ -4,7 +4,7 @@ import uuid
 import base64
 import asyncio
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from fastapi import APIRouter, HTTPException, BackgroundTasks, status
 from fastapi.responses import FileResponse, StreamingResponse
 from pathlib import Path
@@ -23,19 +23,22 @@ from schemas.base import PatientInfo, BaseResponse
 from services.chat_manager import chat_session_manager
 from services.mcp_tools import mcp_tool_handler
 from agents.pdf_report import pdf_report_agent
-from services.cloudinary_service import CloudinaryService
-from agents.router import RouterAgent
-from agents.hand import HandAgent
-from agents.leg import LegAgent
-from agents.diagnosis import DiagnosisAgent
-from agents.triage import TriageAgent
+from services.upload_stage import upload_stage
+from services.detection_set import DetectionSet
+from services.model_pool import model_pool
+from services.decoded_image import DecodedImage
+from services.speculative_detection import speculative_detection, aspect_ratio_prior
+from agents.diagnosis import diagnosis_agent
+from agents.triage import TriageAgent, triage_agent
 from agents.hospitals import HospitalAgent
+from services.sse import format_sse, sse_response
+from services.report_jobs import report_job_service
 
 # Create router
 router = APIRouter(prefix="/api", tags=["chat"])
 
-# Initialize cloudinary service
-cloudinary_service = CloudinaryService()
+# Called with a stage name and details as a handler reaches each pipeline stage
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
 
 
 async def detect_user_intent(message: str, image_data: Optional[str] = None) -> ChatIntent:
@@ -81,8 +84,16 @@ async def detect_user_intent(message: str, image_data: Optional[str] = None) ->
     return ChatIntent.GENERAL_CONVERSATION
 
 
-async def handle_xray_analysis(request: ChatMessage, chat_id: str) -> ChatResponse:
-    """Handle X-ray image analysis requests."""
+async def handle_xray_analysis(
+    request: ChatMessage,
+    chat_id: str,
+    progress: Optional[ProgressCallback] = None
+) -> ChatResponse:
+    """Handle X-ray image analysis requests, reporting each stage to ``progress``."""
+    def report(stage: str, **details: Any) -> None:
+        if progress is not None:
+            progress(stage, details)
+    
     try:
         if not request.image_data:
             return ChatResponse(
@@ -92,9 +103,9 @@ async def handle_xray_analysis(request: ChatMessage, chat_id: str) -> ChatRespon
                 actions=[ChatAction(type="upload_image", label="📤 Upload X-ray Image")]
             )
         
-        # Decode base64 image
+        # Decode once; routing, detection, annotation and upload share it
         try:
-            image_data = base64.b64decode(request.image_data)
+            image = DecodedImage.from_base64(request.image_data)
         except Exception as e:
             return ChatResponse(
                 message_type=MessageType.ERROR,
@@ -102,18 +113,6 @@ async def handle_xray_analysis(request: ChatMessage, chat_id: str) -> ChatRespon
                 chat_id=chat_id
             )
         
-        # Initialize agents
-        router_agent = RouterAgent()
-        hand_agent = HandAgent()
-        leg_agent = LegAgent()
-        diagnosis_agent = DiagnosisAgent()
-        triage_agent = TriageAgent()
-        
-        # Load models
-        await router_agent.load_model()
-        await hand_agent.load_model()
-        await leg_agent.load_model()
-        
         # First, check if user provided body part context in message
         message_lower = request.message.lower()
         context_body_part = None
@@ -126,97 +125,70 @@ async def handle_xray_analysis(request: ChatMessage, chat_id: str) -> ChatRespon
             context_body_part = "leg"
             logger.info("Body part context detected from message: leg")
         
+        async def route_body_part():
+            report("routing")
+            # Try router classification using the shared, preloaded router
+            async with model_pool.lease("router") as router_agent:
+                body_part_result = await router_agent.classify_body_part(image)
+            router_body_part = body_part_result.get("body_part", "unknown")
+            router_confidence = body_part_result.get("confidence", 0.0)
+            
+            # If router has high confidence, use its result
+            if router_confidence >= 0.70 and router_body_part in ["hand", "leg"]:
+                logger.info(f"Using router classification: {router_body_part} (confidence: {router_confidence:.3f})")
+                return router_body_part, router_confidence
+            
+            # Fallback to aspect ratio analysis (same as analyze.py)
+            logger.info("Router confidence too low, using aspect ratio fallback")
+            fallback_body_part, fallback_confidence = aspect_ratio_prior(image)
+            logger.info(f"Aspect ratio fallback: {fallback_body_part} (ratio: {image.aspect_ratio:.2f}, confidence: {fallback_confidence:.2f})")
+            return fallback_body_part, fallback_confidence
+        
+        async def detect_fractures(part: str):
+            report("detecting", body_part=part)
+            async with model_pool.lease(part) as detector_agent:
+                return await detector_agent.analyze(image)
+        
         # Determine body part using context, router, or fallback detection
         if context_body_part:
             # Use explicit context from user message
             body_part = context_body_part
             confidence = 0.95  # High confidence when user explicitly mentions body part
             logger.info(f"Using body part from message context: {body_part}")
+            analysis_result = await detect_fractures(body_part)
         else:
-            # Try router classification
-            body_part_result = await router_agent.classify_body_part(image_data)
-            router_body_part = body_part_result.get("body_part", "unknown")
-            router_confidence = body_part_result.get("confidence", 0.0)
-            
-            # If router has high confidence, use its result
-            if router_confidence >= 0.70 and router_body_part in ["hand", "leg"]:
-                body_part = router_body_part
-                confidence = router_confidence
-                logger.info(f"Using router classification: {body_part} (confidence: {confidence:.3f})")
-            else:
-                # Fallback to aspect ratio analysis (same as analyze.py)
-                logger.info("Router confidence too low, using aspect ratio fallback")
-                from PIL import Image
-                import io
-                
-                image = Image.open(io.BytesIO(image_data))
-                width, height = image.size
-                aspect_ratio = width / height
-                
-                # Determine body part based on aspect ratio (same logic as analyze.py)
-                if aspect_ratio > 1.2:  # Wide image - likely hand
-                    body_part = 'hand'
-                    confidence = 0.75
-                elif aspect_ratio < 0.8:  # Tall image - likely leg
-                    body_part = 'leg'
-                    confidence = 0.80
-                else:  # Square-ish - default to hand
-                    body_part = 'hand'
-                    confidence = 0.60
-                
-                logger.info(f"Aspect ratio fallback: {body_part} (ratio: {aspect_ratio:.2f}, confidence: {confidence:.2f})")
-        
-        # Run appropriate analysis based on determined body part
-        if body_part == "hand":
-            analysis_result = await hand_agent.analyze(image_data)
-        elif body_part == "leg":
-            analysis_result = await leg_agent.analyze(image_data)
-        else:
-            # Should not happen with our logic, but safety fallback
-            logger.warning(f"Unknown body part '{body_part}', defaulting to hand")
-            body_part = "hand"
-            analysis_result = await hand_agent.analyze(image_data)
+            # Detectors may start while the router runs (SPECULATION_ENABLED)
+            outcome = await speculative_detection.route_and_detect(image, route_body_part, detect_fractures)
+            body_part = outcome["body_part"]
+            confidence = outcome["confidence"]
+            analysis_result = outcome["result"]
         
         # Extract detections from analysis result
         detections = analysis_result.get("detections", [])
+        # Converted once and shared by both agents
+        detection_set = DetectionSet.coerce(detections)
         
         # Generate diagnosis
-        diagnosis = await diagnosis_agent.analyze(detections, request.message)
+        report("diagnosing", body_part=body_part, detection_count=len(detection_set))
+        diagnosis = await diagnosis_agent.analyze(detection_set, request.message)
         
         # Perform triage
-        triage_result = await triage_agent.assess(detections, diagnosis)
+        report("triaging")
+        triage_result = await triage_agent.assess(detection_set, diagnosis)
         
-        # Upload images to Cloudinary (FIXED: same logic as /api/analyze)
-        cloudinary_urls = {}
+        # Upload images to Cloudinary concurrently (same stage as /api/analyze)
+        annotated_image_data = analysis_result.get('annotated_image_data')
+        if not annotated_image_data:
+            logger.warning("No annotated image data found in analysis result")
         
-        # Upload original image
-        original_upload = cloudinary_service.upload_original_image(
-            image_data,
-            "chat_image.jpg", 
-            str(uuid.uuid4())
+        report("uploading")
+        cloudinary_urls = await upload_stage.upload_analysis_images(
+            str(uuid.uuid4()),
+            image.raw_bytes,
+            annotated_image_data or None
         )
-        
-        if original_upload:
-            cloudinary_urls['original_image_url'] = original_upload['url']
-            cloudinary_urls['original_image_public_id'] = original_upload['public_id']
-            logger.info(f"Original image uploaded to Cloudinary: {original_upload['url']}")
-        
-        # Upload annotated image ONLY if it exists and is different from original
-        if analysis_result.get('annotated_image_data'):
-            annotated_upload = cloudinary_service.upload_annotated_image(
-                analysis_result['annotated_image_data'],  # Use actual annotated image
-                "chat_image.jpg",
-                str(uuid.uuid4())
-            )
-            
-            if annotated_upload:
-                cloudinary_urls['annotated_image_url'] = annotated_upload['url']
-                cloudinary_urls['annotated_image_public_id'] = annotated_upload['public_id']
-                logger.info(f"Annotated image uploaded to Cloudinary: {annotated_upload['url']}")
-            else:
-                logger.warning("Failed to upload annotated image to Cloudinary")
-        else:
-            logger.warning("No annotated image data found in analysis result")
+        if annotated_image_data and 'annotated_image_url' not in cloudinary_urls:
+            logger.warning("Failed to upload annotated image to Cloudinary")
         
         # Compile analysis data (exclude binary data for JSON serialization)
         analysis_data = {
@@ -548,6 +520,91 @@ What would you like to do?"""
     )
 
 
+async def route_chat_intent(
+    request: ChatMessage,
+    chat_id: str,
+    intent: ChatIntent,
+    progress: Optional[ProgressCallback] = None
+) -> ChatResponse:
+    """Dispatch a chat message to the handler for its intent."""
+    if intent == ChatIntent.XRAY_ANALYSIS:
+        return await handle_xray_analysis(request, chat_id, progress)
+    elif intent == ChatIntent.SYMPTOM_CHECK:
+        return await handle_symptom_analysis(request, chat_id)
+    elif intent == ChatIntent.MEDICAL_QUESTION:
+        return await handle_medical_question(request, chat_id)
+    elif intent == ChatIntent.REPORT_GENERATION:
+        return await handle_report_generation(request, chat_id)
+    elif intent == ChatIntent.HOSPITAL_SEARCH:
+        # Use MCP tool for hospital search
+        result = await mcp_tool_handler.execute_tool("hospital_finder", {
+            "location": request.message,
+            "urgency_level": "AMBER",
+            "specialty": "orthopedic"
+        })
+        return ChatResponse(
+            message_type=MessageType.TEXT,
+            content=f"🏥 Hospital search results: {result['result']}",
+            data=result,
+            chat_id=chat_id,
+            intent=intent
+        )
+    else:
+        return await handle_general_conversation(request, chat_id)
+
+
+async def stream_chat_response(request: ChatMessage, chat_id: str, intent: ChatIntent):
+    """
+    Stream a chat response as Server-Sent Events.
+    
+    Runs the same handler as the non-streaming path and emits a ``progress``
+    event as it starts and as the X-ray pipeline reaches each stage
+    (routing, detecting, diagnosing, triaging, uploading), then a
+    ``message`` event with the regular ChatResponse. A final ``done`` event
+    closes the stream (``error`` on failure).
+    """
+    events: asyncio.Queue = asyncio.Queue()
+    
+    def progress(stage: str, details: Dict[str, Any]) -> None:
+        events.put_nowait(format_sse("progress", {"stage": stage, **details}))
+    
+    task = asyncio.create_task(route_chat_intent(request, chat_id, intent, progress))
+    try:
+        yield format_sse("progress", {"stage": "started", "intent": intent.value})
+        
+        # Forward progress until the handler finishes
+        while True:
+            next_event = asyncio.ensure_future(events.get())
+            await asyncio.wait({next_event, task}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_event.done():
+                next_event.cancel()
+                break
+            yield next_event.result()
+        while not events.empty():
+            yield events.get_nowait()
+        
+        response = task.result()
+        yield format_sse("message", response.dict())
+        
+        chat_session_manager.save_message(
+            chat_id=chat_id,
+            user_message=request.message,
+            bot_response=response.content,
+            intent=intent.value,
+            metadata={"has_image": bool(request.image_data), "streamed": True}
+        )
+        
+        yield format_sse("done", {"chat_id": chat_id})
+        
+    except Exception as e:
+        logger.error(f"Streamed chat processing failed: {e}")
+        yield format_sse("error", {"detail": f"Chat processing failed: {str(e)}", "chat_id": chat_id})
+    finally:
+        # Client disconnected mid-stream
+        if not task.done():
+            task.cancel()
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_interface(request: ChatMessage):
     """Main chat endpoint that handles user interactions and MCP tool calls."""
@@ -563,31 +620,10 @@ async def chat_interface(request: ChatMessage):
         # Detect user intent
         intent = await detect_user_intent(request.message, request.image_data)
         
-        # Route based on intent
-        if intent == ChatIntent.XRAY_ANALYSIS:
-            response = await handle_xray_analysis(request, chat_id)
-        elif intent == ChatIntent.SYMPTOM_CHECK:
-            response = await handle_symptom_analysis(request, chat_id)
-        elif intent == ChatIntent.MEDICAL_QUESTION:
-            response = await handle_medical_question(request, chat_id)
-        elif intent == ChatIntent.REPORT_GENERATION:
-            response = await handle_report_generation(request, chat_id)
-        elif intent == ChatIntent.HOSPITAL_SEARCH:
-            # Use MCP tool for hospital search
-            result = await mcp_tool_handler.execute_tool("hospital_finder", {
-                "location": request.message,
-                "urgency_level": "AMBER",
-                "specialty": "orthopedic"
-            })
-            response = ChatResponse(
-                message_type=MessageType.TEXT,
-                content=f"🏥 Hospital search results: {result['result']}",
-                data=result,
-                chat_id=chat_id,
-                intent=intent
-            )
-        else:
-            response = await handle_general_conversation(request, chat_id)
+        if request.stream:
+            return sse_response(stream_chat_response(request, chat_id, intent))
+        
+        response = await route_chat_intent(request, chat_id, intent)
         
         # Save message to session
         chat_session_manager.save_message(
@@ -934,6 +970,11 @@ async def download_report(report_id: str):
 async def get_report_status(report_id: str):
     """Check PDF generation status for async processing."""
     try:
+        # Reports queued by /api/analyze are tracked by the report job service
+        report_job = report_job_service.get(report_id)
+        if report_job is not None:
+            return {"success": True, **report_job.to_dict()}
+        
         report_path = Path("reports") / f"orthoassist_report_{report_id}.pdf"
         
         if report_path.exists():
@@ -5,9 +5,11 @@ Clinical Analysis API endpoint for multi-report analysis
 from fastapi import APIRouter, HTTPException
 from typing import List, Dict, Any
 import logging
+from datetime import datetime
 from agents.clinical_analysis import ClinicalAnalysisAgent, PatientAnalysisRequest, StudyData
 from services.groq_service import groq_service
 from services.error_handler import ErrorCode, ProcessingError
+from services.sse import format_sse, sse_response
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,20 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+def _validate_analysis_request(request: PatientAnalysisRequest) -> None:
+    """Reject empty or oversized multi-study requests."""
+    if not request.studies:
+        raise HTTPException(
+            status_code=400, 
+            detail="At least one study is required for analysis"
+        )
+    
+    if len(request.studies) > 50:  # Reasonable limit
+        raise HTTPException(
+            status_code=400,
+            detail="Too many studies provided. Maximum 50 studies allowed per analysis."
+        )
+
 @router.post("/analyze-patient")
 async def analyze_patient_studies(request: PatientAnalysisRequest):
     """
@@ -29,17 +45,7 @@ async def analyze_patient_studies(request: PatientAnalysisRequest):
         logger.info(f"Starting clinical analysis for patient {request.patientId} with {len(request.studies)} studies")
         
         # Validate request
-        if not request.studies:
-            raise HTTPException(
-                status_code=400, 
-                detail="At least one study is required for analysis"
-            )
-        
-        if len(request.studies) > 50:  # Reasonable limit
-            raise HTTPException(
-                status_code=400,
-                detail="Too many studies provided. Maximum 50 studies allowed per analysis."
-            )
+        _validate_analysis_request(request)
         
         # Create clinical analysis agent with global groq service
         analysis_agent = ClinicalAnalysisAgent(groq_service)
@@ -67,6 +73,41 @@ async def analyze_patient_studies(request: PatientAnalysisRequest):
             detail=f"Failed to generate clinical analysis: {str(e)}"
         )
 
+@router.post("/analyze-patient/stream")
+async def stream_patient_studies_analysis(request: PatientAnalysisRequest):
+    """
+    Stream the clinical analysis as Server-Sent Events
+    
+    Emits ``token`` events with text as the model generates it, then a ``done``
+    event carrying the same payload as ``/analyze-patient`` (or ``error``).
+    """
+    logger.info(f"Starting streamed clinical analysis for patient {request.patientId} with {len(request.studies)} studies")
+    _validate_analysis_request(request)
+    
+    analysis_agent = ClinicalAnalysisAgent(groq_service)
+    
+    async def event_stream():
+        chunks = []
+        try:
+            async for delta in analysis_agent.stream_patient_analysis(request):
+                chunks.append(delta)
+                yield format_sse("token", {"content": delta})
+            
+            logger.info(f"Streamed clinical analysis completed for patient {request.patientId}")
+            yield format_sse("done", {
+                "success": True,
+                "patient_id": request.patientId,
+                "studies_analyzed": len(request.studies),
+                "analysis": "".join(chunks),
+                "analysis_timestamp": datetime.utcnow().isoformat() + "Z",
+                "model_used": "llama-3.1-8b-instant"
+            })
+        except Exception as e:
+            logger.error(f"Error in streamed clinical analysis for patient {request.patientId}: {str(e)}")
+            yield format_sse("error", {"detail": f"Failed to generate clinical analysis: {str(e)}"})
+    
+    return sse_response(event_stream())
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint for clinical analysis service"""
@@ -0,0 +1,129 @@
+"""HTTP responses for stored files with ETag, Range and sendfile support."""
+
+import re
+from typing import Dict, Optional, Tuple
+from fastapi import Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+
+from services.storage import StoredFile
+
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range lies outside the file."""
+
+
+def parse_range_header(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range ``Range`` header into inclusive byte offsets.
+
+    Multi-range and malformed headers return None, in which case the full
+    file is served (as RFC 9110 allows).
+
+    Raises:
+        RangeNotSatisfiable: If the range does not overlap the file
+    """
+    match = _RANGE_PATTERN.match(range_header.strip())
+    if not match:
+        return None
+
+    start_text, end_text = match.groups()
+    if not start_text and not end_text:
+        return None
+
+    if not start_text:
+        # Suffix range: the last N bytes
+        suffix_length = int(end_text)
+        if suffix_length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - suffix_length), size - 1
+
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+def _etag_matches(header_value: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in header_value.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def stored_file_response(
+    request: Request,
+    stored_file: StoredFile,
+    media_type: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Build the response for a stored file.
+
+    - ``If-None-Match`` matching the ETag returns 304
+    - HEAD returns headers from metadata only
+    - A single ``Range`` returns 206 streamed from the requested offset
+      (honouring ``If-Range``); unsatisfiable ranges return 416
+    - Full local files go through ``FileResponse`` so the server can use
+      sendfile; GridFS files are streamed chunk by chunk
+
+    Args:
+        request: Incoming request (method and conditional headers)
+        stored_file: Handle from ``storage_service.open_file``
+        media_type: Content type override (defaults to the stored type)
+        headers: Extra response headers (caching, disposition, ...)
+    """
+    media_type = media_type or stored_file.content_type
+    size = stored_file.size
+    response_headers = {
+        **(headers or {}),
+        "ETag": stored_file.etag,
+        "Accept-Ranges": "bytes"
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, stored_file.etag):
+        return Response(status_code=304, headers=response_headers)
+
+    if request.method == "HEAD":
+        return Response(
+            media_type=media_type,
+            headers={**response_headers, "Content-Length": str(size)}
+        )
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == stored_file.etag):
+        try:
+            byte_range = parse_range_header(range_header, size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=416,
+                headers={**response_headers, "Content-Range": f"bytes */{size}"}
+            )
+
+    if byte_range is not None:
+        start, end = byte_range
+        return StreamingResponse(
+            stored_file.iter_bytes(start, end),
+            status_code=206,
+            media_type=media_type,
+            headers={
+                **response_headers,
+                "Content-Range": f"bytes {start}-{end}/{size}",
+                "Content-Length": str(end - start + 1)
+            }
+        )
+
+    if stored_file.path is not None:
+        return FileResponse(stored_file.path, media_type=media_type, headers=response_headers)
+
+    return StreamingResponse(
+        stored_file.iter_bytes(),
+        media_type=media_type,
+        headers={**response_headers, "Content-Length": str(size)}
+    )
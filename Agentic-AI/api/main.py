@@ -80,26 +80,18 @@ async def startup_event():
     from app.mcp.server import mcp_server
     await mcp_server.initialize()
     
-    # Preload YOLO models for faster inference
-    logger.info("Preloading YOLO models...")
-    try:
-        # Load hand agent and its model
-        from agents.hand import get_hand_agent
-        hand_agent = get_hand_agent()
-        await hand_agent.load_model()
-        logger.info("✅ Hand YOLO model loaded successfully")
-        
-        # Load leg agent and its model
-        from agents.leg import get_leg_agent
-        leg_agent = get_leg_agent()
-        await leg_agent.load_model()
-        logger.info("✅ Leg YOLO model loaded successfully")
-        
-        logger.info("🎯 All YOLO models preloaded and ready for inference")
-        
-    except Exception as e:
-        logger.error(f"❌ Failed to preload YOLO models: {e}")
-        logger.warning("⚠️  Server will continue but models will load on first use")
+    # Preload shared models once; every request path leases them from the pool
+    logger.info("Preloading models into the shared model pool...")
+    from services.model_pool import model_pool
+    load_status = await model_pool.load(["router", "hand", "leg"])
+    for name, loaded in load_status.items():
+        if loaded:
+            logger.info(f"✅ {name.title()} model loaded successfully")
+        else:
+            logger.warning(f"⚠️  {name.title()} model failed to preload, it will load on first use")
+    
+    if all(load_status.values()):
+        logger.info("🎯 All models preloaded and ready for inference")
     
     logger.info("Orthopedic Assistant MCP Server started successfully")
 
@@ -108,6 +100,30 @@ async def startup_event():
 async def shutdown_event():
     """Clean up on shutdown."""
     logger.info("Shutting down Orthopedic Assistant MCP Server...")
+    
+    # Stop inference workers
+    from services.inference_executor import inference_executor
+    inference_executor.shutdown(wait=False)
+    
+    # Close pooled LLM connections
+    from services.groq_service import groq_service
+    await groq_service.close()
+    
+    # Stop report workers
+    from services.report_jobs import report_job_service
+    report_job_service.shutdown(wait=False)
+    
+    # Stop upload workers
+    from services.upload_stage import upload_stage
+    upload_stage.shutdown(wait=False)
+    
+    # Stop queued analysis workers
+    from services.analysis_jobs import analysis_job_queue
+    analysis_job_queue.shutdown()
+    
+    # Write queued audit events
+    from services.audit_log import audit_log
+    audit_log.shutdown()
 
 
 # Mount static files from frontend directory
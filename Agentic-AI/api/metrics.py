@@ -2,11 +2,46 @@
 
 from typing import Dict, Any
 from services.telemetry import telemetry_service
+from services.inference_executor import inference_executor
+from services.micro_batcher import micro_batcher
+from services.model_pool import model_pool
+from services.result_cache import result_cache
+from services.groq_service import groq_service
+from services.report_jobs import report_job_service
+from services.upload_stage import upload_stage
+from services.orchestrator import orchestrator
+from services.speculative_detection import speculative_detection
+from services.analysis_jobs import analysis_job_queue
+from services.step_events import step_event_hub
+from services.triage_rules import triage_rule_cache
+from services.phi_redaction import prompt_phi_redactor, patient_input_redactor, error_message_redactor
+from services.audit_log import audit_log
+from services.client_rate_limiter import client_rate_limiter
 
 
 def get_metrics_json() -> Dict[str, Any]:
     """Get metrics in JSON format."""
-    return telemetry_service.get_metrics()
+    metrics = telemetry_service.get_metrics()
+    metrics["inference_executor"] = inference_executor.get_stats()
+    metrics["micro_batcher"] = micro_batcher.get_stats()
+    metrics["model_pool"] = model_pool.get_stats()
+    metrics["result_cache"] = result_cache.get_stats()
+    metrics["groq"] = groq_service.get_stats()
+    metrics["report_jobs"] = report_job_service.get_stats()
+    metrics["upload_stage"] = upload_stage.get_stats()
+    metrics["request_store"] = orchestrator.get_stats()
+    metrics["speculative_detection"] = speculative_detection.get_stats()
+    metrics["analysis_jobs"] = analysis_job_queue.get_stats()
+    metrics["step_events"] = step_event_hub.get_stats()
+    metrics["triage_rules"] = triage_rule_cache.get_stats()
+    metrics["phi_redaction"] = {
+        "prompt": prompt_phi_redactor.get_stats(),
+        "patient_input": patient_input_redactor.get_stats(),
+        "error_message": error_message_redactor.get_stats()
+    }
+    metrics["audit_log"] = audit_log.get_stats()
+    metrics["client_rate_limiter"] = client_rate_limiter.get_stats()
+    return metrics
 
 
 def get_metrics_prometheus() -> str:
@@ -1,5 +1,7 @@
 """Security and validation middleware for the orthopedic assistant API."""
 
+import asyncio
+import math
 import time
 import uuid
 from typing import Callable
@@ -8,7 +10,7 @@ from fastapi.responses import JSONResponse
 from loguru import logger
 
 from services.security import request_validator, DataSanitizer
-from services.error_handler import ErrorCode, ValidationError, error_handler
+from services.error_handler import ErrorCode, RateLimitError, ValidationError, error_handler
 
 
 class SecurityMiddleware:
@@ -47,9 +49,13 @@ class SecurityMiddleware:
         except ValidationError as e:
             # Handle validation errors
             response_data = error_handler.create_error_response(e, request_id)
+            headers = None
+            if isinstance(e, RateLimitError):
+                headers = {"Retry-After": str(e.details["retry_after_seconds"])}
             response = JSONResponse(
                 status_code=e.http_status,
-                content=response_data
+                content=response_data,
+                headers=headers
             )
             await response(scope, receive, send_wrapper)
         
@@ -72,12 +78,19 @@ class SecurityMiddleware:
         # Determine endpoint for rate limiting
         endpoint = self._get_endpoint_type(request.url.path)
         
-        # Check rate limits
-        if not request_validator.check_rate_limit(client_id, endpoint):
-            raise ValidationError(
+        # Check rate limits; a shared SQLite store may wait on other workers for its
+        # write lock, which must not stall the event loop
+        if request_validator.rate_limiter.blocking:
+            decision = await asyncio.to_thread(request_validator.rate_limit, client_id, endpoint)
+        else:
+            decision = request_validator.rate_limit(client_id, endpoint)
+        if not decision.allowed:
+            # Whole seconds until the client's budget admits another request
+            retry_after = max(1, math.ceil(decision.retry_after))
+            raise RateLimitError(
                 "Rate limit exceeded. Please try again later.",
-                ErrorCode.RATE_LIMIT_EXCEEDED,
-                {"retry_after_seconds": 60}
+                decision.retry_after,
+                {"retry_after_seconds": retry_after, "limit": decision.limit}
             )
         
         # Log request (with sanitization)
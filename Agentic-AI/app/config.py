@@ -18,6 +18,12 @@ class Config(BaseSettings):
     
     # Groq API Configuration
     groq_api_key: str = Field(default="your_groq_api_key_here", env="GROQ_API_KEY")
+    groq_max_concurrency: int = Field(default=8, ge=1, env="GROQ_MAX_CONCURRENCY")
+    groq_requests_per_minute: int = Field(default=30, ge=0, env="GROQ_REQUESTS_PER_MINUTE")
+    groq_tokens_per_minute: int = Field(default=30000, ge=0, env="GROQ_TOKENS_PER_MINUTE")
+    llm_cache_enabled: bool = Field(default=True, env="LLM_CACHE_ENABLED")
+    llm_cache_max_entries: int = Field(default=512, ge=1, env="LLM_CACHE_MAX_ENTRIES")
+    llm_cache_ttl_seconds: int = Field(default=3600, ge=1, env="LLM_CACHE_TTL_SECONDS")
     
     # Model Configuration
     router_model_path: Path = Field(default=Path("models/router.pt"), env="ROUTER_MODEL_PATH")
@@ -29,6 +35,11 @@ class Config(BaseSettings):
     detector_score_min: float = Field(default=0.35, ge=0.0, le=1.0, env="DETECTOR_SCORE_MIN")
     nms_iou: float = Field(default=0.50, ge=0.0, le=1.0, env="NMS_IOU")
     
+    # Speculative Detection (start detectors while the router is still running)
+    speculation_enabled: bool = Field(default=False, env="SPECULATION_ENABLED")
+    speculation_band_low: float = Field(default=0.50, ge=0.0, le=1.0, env="SPECULATION_BAND_LOW")
+    speculation_band_high: float = Field(default=0.75, ge=0.0, le=1.0, env="SPECULATION_BAND_HIGH")
+    
     # Triage Thresholds
     triage_red_threshold: float = Field(default=0.8, ge=0.0, le=1.0, env="TRIAGE_RED_THRESHOLD")
     triage_amber_threshold: float = Field(default=0.6, ge=0.0, le=1.0, env="TRIAGE_AMBER_THRESHOLD")
@@ -44,14 +55,58 @@ class Config(BaseSettings):
     
     # Retry Configuration
     max_retries: int = Field(default=1, ge=0, env="MAX_RETRIES")
-    
+
+    # Inference Executor Configuration
+    inference_executor_mode: str = Field(default="thread", env="INFERENCE_EXECUTOR_MODE")
+    inference_max_workers: int = Field(default=2, ge=1, env="INFERENCE_MAX_WORKERS")
+    inference_max_queue_depth: int = Field(default=32, ge=1, env="INFERENCE_MAX_QUEUE_DEPTH")
+    inference_per_model_concurrency: int = Field(default=1, ge=1, env="INFERENCE_PER_MODEL_CONCURRENCY")
+    inference_batch_max_size: int = Field(default=8, ge=1, env="INFERENCE_BATCH_MAX_SIZE")
+    inference_batch_max_wait_ms: int = Field(default=10, ge=0, env="INFERENCE_BATCH_MAX_WAIT_MS")
+
+    # Inference Result Cache
+    result_cache_enabled: bool = Field(default=True, env="RESULT_CACHE_ENABLED")
+    result_cache_max_entries: int = Field(default=256, ge=1, env="RESULT_CACHE_MAX_ENTRIES")
+    result_cache_disk_enabled: bool = Field(default=True, env="RESULT_CACHE_DISK_ENABLED")
+    result_cache_disk_max_bytes: int = Field(default=64 * 1024 * 1024, ge=1024, env="RESULT_CACHE_DISK_MAX_BYTES")
+
     # Storage Configuration
     storage_type: str = Field(default="local", env="STORAGE_TYPE")
     storage_path: Path = Field(default=Path("./storage"), env="STORAGE_PATH")
     storage_bucket: Optional[str] = Field(default=None, env="STORAGE_BUCKET")
+
+    # Request State
+    request_store_backend: str = Field(default="memory", env="REQUEST_STORE_BACKEND")
+    request_store_path: Path = Field(default=Path("./storage/request_state.sqlite3"), env="REQUEST_STORE_PATH")
+    request_store_max_entries: int = Field(default=10000, ge=1, env="REQUEST_STORE_MAX_ENTRIES")
+    request_store_ttl_seconds: int = Field(default=86400, ge=1, env="REQUEST_STORE_TTL_SECONDS")
+
+    # Incoming Request Rate Limits ("sqlite" shares budgets across workers)
+    rate_limit_backend: str = Field(default="memory", env="RATE_LIMIT_BACKEND")
+    rate_limit_path: Path = Field(default=Path("./storage/rate_limits.sqlite3"), env="RATE_LIMIT_PATH")
+    rate_limit_max_clients: int = Field(default=10000, ge=1, env="RATE_LIMIT_MAX_CLIENTS")
+    
+    # Report Generation
+    report_workers: int = Field(default=2, ge=1, env="REPORT_WORKERS")
+    report_job_history: int = Field(default=1000, ge=1, env="REPORT_JOB_HISTORY")
+    
+    # Asynchronous Analysis Jobs (POST /api/analyze with execution="async")
+    analysis_job_workers: int = Field(default=4, ge=1, env="ANALYSIS_JOB_WORKERS")
+    analysis_job_queue_size: int = Field(default=100, ge=1, env="ANALYSIS_JOB_QUEUE_SIZE")
+    analysis_callback_url: Optional[str] = Field(default=None, env="ANALYSIS_CALLBACK_URL")
+    analysis_callback_allowed_hosts: str = Field(default="", env="ANALYSIS_CALLBACK_ALLOWED_HOSTS")
+    analysis_callback_secret: Optional[str] = Field(default=None, env="ANALYSIS_CALLBACK_SECRET")
+    analysis_callback_timeout: float = Field(default=10.0, gt=0, env="ANALYSIS_CALLBACK_TIMEOUT")
+    analysis_callback_attempts: int = Field(default=3, ge=1, env="ANALYSIS_CALLBACK_ATTEMPTS")
     
     # Cloudinary Configuration
     cloudinary_url: Optional[str] = Field(default=None, env="CLOUDINARY_URL")
+    upload_backend: str = Field(default="cloudinary", env="UPLOAD_BACKEND")
+    upload_mode: str = Field(default="inline", env="UPLOAD_MODE")
+    upload_max_concurrency: int = Field(default=4, ge=1, env="UPLOAD_MAX_CONCURRENCY")
+    upload_max_attempts: int = Field(default=3, ge=1, env="UPLOAD_MAX_ATTEMPTS")
+    upload_backoff_seconds: float = Field(default=0.5, ge=0, env="UPLOAD_BACKOFF_SECONDS")
+    upload_local_latency_ms: float = Field(default=0.0, ge=0, env="UPLOAD_LOCAL_LATENCY_MS")
     
     # Medical Compliance
     medical_disclaimer_enabled: bool = Field(default=True, env="MEDICAL_DISCLAIMER_ENABLED")
@@ -60,6 +115,11 @@ class Config(BaseSettings):
     # Monitoring
     metrics_enabled: bool = Field(default=True, env="METRICS_ENABLED")
     audit_logging_enabled: bool = Field(default=True, env="AUDIT_LOGGING_ENABLED")
+    audit_log_path: Path = Field(default=Path("./storage/audit"), env="AUDIT_LOG_PATH")
+    audit_segment_max_bytes: int = Field(default=8 * 1024 * 1024, ge=1024, env="AUDIT_SEGMENT_MAX_BYTES")
+    audit_retention_bytes: int = Field(default=256 * 1024 * 1024, ge=1024, env="AUDIT_RETENTION_BYTES")
+    audit_batch_size: int = Field(default=64, ge=1, env="AUDIT_BATCH_SIZE")
+    audit_flush_interval_ms: int = Field(default=200, ge=1, env="AUDIT_FLUSH_INTERVAL_MS")
     
     class Config:
         env_file = ".env"
@@ -81,6 +141,38 @@ class Config(BaseSettings):
             raise ValueError("STORAGE_TYPE must be 'local' or 's3'")
         return v
 
+    @field_validator("inference_executor_mode")
+    @classmethod
+    def validate_inference_executor_mode(cls, v):
+        """Validate inference executor mode is supported."""
+        if v not in ["thread", "process"]:
+            raise ValueError("INFERENCE_EXECUTOR_MODE must be 'thread' or 'process'")
+        return v
+
+    @field_validator("request_store_backend")
+    @classmethod
+    def validate_request_store_backend(cls, v):
+        """Validate request store backend is supported."""
+        if v not in ["memory", "sqlite"]:
+            raise ValueError("REQUEST_STORE_BACKEND must be 'memory' or 'sqlite'")
+        return v
+
+    @field_validator("upload_backend")
+    @classmethod
+    def validate_upload_backend(cls, v):
+        """Validate upload backend is supported."""
+        if v not in ["cloudinary", "local"]:
+            raise ValueError("UPLOAD_BACKEND must be 'cloudinary' or 'local'")
+        return v
+
+    @field_validator("upload_mode")
+    @classmethod
+    def validate_upload_mode(cls, v):
+        """Validate upload mode is supported."""
+        if v not in ["inline", "after_response"]:
+            raise ValueError("UPLOAD_MODE must be 'inline' or 'after_response'")
+        return v
+
 
 def load_config() -> Config:
     """Load and validate configuration, fail closed on errors."""
@@ -0,0 +1 @@
+# Performance measurement scripts
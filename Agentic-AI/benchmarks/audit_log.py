@@ -0,0 +1,128 @@
+"""Measure audit logging: in-memory deque versus the write-behind ``AuditLogSink``.
+
+Before, ``TelemetryService.log_audit_event`` appended each event to a 10k
+deque under the telemetry lock, and ``get_audit_logs`` copied the deque,
+filtered it linearly and sorted it. This benchmark replays that next to the
+sink, which queues events and serves ``request_id`` lookups from its index:
+
+* every event of a sampled request is returned, newest first, exactly as
+  the linear filter over all events returns it;
+* retention keeps the segments within ``retention_bytes`` (plus at most
+  one segment) while rotating;
+* per-event append cost on the request path, and lookup time per query.
+
+Usage (from the Agentic-AI directory):
+    python -m benchmarks.audit_log [--events 100000] [--requests 20000]
+"""
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from loguru import logger
+
+from services.audit_log import AuditLogSink
+
+OPERATIONS = ["analyze", "chat", "processing", "report"]
+EVENT_TYPES = ["request_start", "step_execution", "request_success"]
+
+
+def make_events(count: int, requests: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "timestamp": f"2026-01-01T{index // 3600000:02d}:{index // 60000 % 60:02d}:{index // 1000 % 60:02d}."
+                         f"{index % 1000:03d}000",
+            "request_id": f"req-{rng.randrange(requests):012x}",
+            "event_type": rng.choice(EVENT_TYPES),
+            "operation": rng.choice(OPERATIONS),
+            "step": None,
+            "duration": round(rng.uniform(0.001, 2.0), 6),
+            "versions": {"model": "yolov8-hand-1.2"},
+            "metadata": {"status": "success", "body_part": rng.choice(["hand", "leg"])}
+        }
+        for index in range(count)
+    ]
+
+
+class DequeAuditLog:
+    """The previous audit storage of ``TelemetryService``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.audit_logs = deque(maxlen=10000)
+
+    def append(self, entry: dict) -> None:
+        with self._lock:
+            self.audit_logs.append(entry)
+
+    def query(self, request_id=None, operation=None, limit=None) -> list:
+        with self._lock:
+            logs = list(self.audit_logs)
+        if request_id:
+            logs = [log for log in logs if log.get("request_id") == request_id]
+        if operation:
+            logs = [log for log in logs if log.get("operation") == operation]
+        logs = sorted(logs, key=lambda x: x.get("timestamp", ""), reverse=True)
+        return logs[:limit] if limit else logs
+
+
+def time_per_call(func, items: list) -> float:
+    """Mean microseconds per ``func(item)``."""
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) * 1e6 / len(items)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    logger.remove()
+    events = make_events(args.events, args.requests)
+    sample_ids = [event["request_id"] for event in random.Random(1).sample(events, 200)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        sink = AuditLogSink(Path(directory), segment_max_bytes=512 * 1024, retention_bytes=64 * 1024 * 1024)
+        legacy = DequeAuditLog()
+
+        before = time_per_call(legacy.append, events)
+        after = time_per_call(sink.append, events)
+        start = time.perf_counter()
+        sink.flush(timeout=120)
+        drain = time.perf_counter() - start
+        stats = sink.get_stats()
+        print(f"append: deque {before:5.2f} us/event, sink {after:5.2f} us/event "
+              f"(writer drained the backlog {drain:5.2f} s later; {stats['bytes'] / 1024:.0f} KiB in "
+              f"{stats['segment']} segments for {stats['entries']} events)")
+
+        # The deque only ever held the last 10k events; compare the sink with all of them
+        for request_id in sample_ids:
+            expected = sorted((event for event in events if event["request_id"] == request_id),
+                              key=lambda x: x["timestamp"], reverse=True)
+            assert sink.query(request_id=request_id) == expected, request_id
+
+        before = time_per_call(lambda request_id: legacy.query(request_id=request_id), sample_ids)
+        after = time_per_call(lambda request_id: sink.query(request_id=request_id), sample_ids)
+        print(f"query by request_id: deque {before:8.1f} us (last 10000 events only), "
+              f"index {after:8.1f} us (all {args.events} events)")
+
+        sink.retention_bytes = 1024 * 1024
+        sink.append(events[0])
+        sink.flush()
+        stats = sink.get_stats()
+        on_disk = sum(path.stat().st_size for path in Path(directory).glob("audit-*.jsonl.gz"))
+        assert on_disk == stats["bytes"] <= sink.retention_bytes + sink.segment_max_bytes, (on_disk, stats)
+        print(f"retention 1 MiB: {on_disk / 1024:.0f} KiB kept, {stats['segments_deleted']} segments deleted, "
+              f"{stats['entries']} events retained")
+        sink.shutdown()
+
+
+if __name__ == "__main__":
+    main()
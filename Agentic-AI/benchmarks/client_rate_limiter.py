@@ -0,0 +1,126 @@
+"""Measure incoming request rate limiting: per-client timestamp lists versus GCRA.
+
+Before, ``RequestValidator.check_rate_limit`` kept a list of request times
+per client IP in an unbounded dict and rebuilt the list on every check.
+This benchmark compares it with ``ClientRateLimiter``:
+
+* a client gets exactly ``limit`` requests in a burst, the next is rejected
+  with ``retry_after`` equal to the spacing ``window / limit`` and allowed
+  once that has passed;
+* with the SQLite store, several processes hammering one client share a
+  single budget;
+* check cost for a hot client near its limit, and memory held after many
+  distinct clients (the memory store evicts beyond ``max_clients``).
+
+Usage (from the Agentic-AI directory):
+    python -m benchmarks.client_rate_limiter [--clients 100000] [--limit 100] [--processes 4]
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from loguru import logger
+
+from services.client_rate_limiter import (
+    ClientRateLimiter, MemoryRateLimitStore, SQLiteRateLimitStore, gcra
+)
+
+
+class TimestampListLimiter:
+    """The previous ``RequestValidator.check_rate_limit`` bookkeeping."""
+
+    def __init__(self):
+        self.request_history = {}
+
+    def check(self, client_id: str, endpoint: str, limit: int, window_seconds: float) -> bool:
+        current_time = time.time()
+        client_requests = self.request_history.setdefault(client_id, [])
+        client_requests[:] = [req_time for req_time in client_requests if current_time - req_time < window_seconds]
+        if len(client_requests) >= limit:
+            return False
+        client_requests.append(current_time)
+        return True
+
+
+def check_semantics(limit: int, window: float) -> None:
+    tat, now = None, 1000.0
+    for index in range(limit):
+        tat, decision = gcra(tat, now, limit, window)
+        assert decision.allowed and decision.remaining == limit - index - 1, (index, decision)
+    rejected_tat, decision = gcra(tat, now, limit, window)
+    assert rejected_tat is None and abs(decision.retry_after - window / limit) < 1e-9, decision
+    _, decision = gcra(tat, now + decision.retry_after, limit, window)
+    assert decision.allowed, decision
+
+
+def hammer(db_path: str, attempts: int, limit: int, results) -> None:
+    limiter = ClientRateLimiter(SQLiteRateLimitStore(Path(db_path)))
+    results.put(sum(limiter.check("10.0.0.1", "analyze", limit, 3600).allowed for _ in range(attempts)))
+
+
+def check_shared_budget(db_path: Path, processes: int, limit: int) -> int:
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=hammer, args=(str(db_path), limit, limit, results))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    allowed = sum(results.get() for _ in workers)
+    for worker in workers:
+        worker.join()
+    assert allowed == limit, (allowed, limit)
+    return allowed
+
+
+def time_hot_client(check, limit: int, calls: int) -> float:
+    """Microseconds per check for one client making ``calls`` requests in its window."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        check("10.0.0.1", "analyze", limit, 60)
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+def retained_kib(check, clients: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for index in range(clients):
+        check(f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}", "analyze", 10, 60)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    logger.remove()
+    check_semantics(args.limit, 60.0)
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = Path(directory) / "rate_limits.sqlite3"
+        allowed = check_shared_budget(db_path, args.processes, args.limit)
+        print(f"burst of {args.limit} then retry_after = window / limit; "
+              f"{args.processes} processes sharing SQLite were allowed {allowed} of {args.processes * args.limit}")
+
+        legacy = TimestampListLimiter()
+        memory = ClientRateLimiter(MemoryRateLimitStore(max_clients=10000))
+        sqlite = ClientRateLimiter(SQLiteRateLimitStore(Path(directory) / "timing.sqlite3"))
+        calls = args.limit * 10
+        print(f"hot client, limit {args.limit}/min, {calls} checks: "
+              f"timestamp list {time_hot_client(legacy.check, args.limit, calls):6.1f} us, "
+              f"memory GCRA {time_hot_client(memory.check, args.limit, calls):6.1f} us, "
+              f"SQLite GCRA {time_hot_client(sqlite.check, args.limit, calls):6.1f} us")
+
+        legacy = TimestampListLimiter()
+        memory = ClientRateLimiter(MemoryRateLimitStore(max_clients=10000))
+        print(f"{args.clients} distinct clients: timestamp lists retain {retained_kib(legacy.check, args.clients):8.0f} KiB, "
+              f"memory GCRA (max 10000 clients) {retained_kib(memory.check, args.clients):8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""Measure memory and time of detections as dicts versus ``DetectionSet``.
+
+Builds 1-10000 synthetic detections and compares:
+
+* memory held by a list of ``Detection.to_dict`` style dicts against the
+  columns of a ``DetectionSet`` (tracemalloc, retained bytes),
+* the per-detection work of the triage rules and report sections as the
+  agents previously did it (one dict lookup and pattern scan per box)
+  against the same figures from the ``DetectionSet`` methods the agents
+  now call (labels matched once per label type).
+
+Before anything is timed, the legacy loops are checked to give the same
+triage scores, rationale and report figures as the agent methods. Both
+timed sides leave out the rest of the agent methods (logging,
+recommendations, result dicts), which cost the same either way.
+
+Usage (from the Agentic-AI directory):
+    python -m benchmarks.detection_set [--sizes 1 3 10 32 100 1000 10000] [--repeat 20]
+"""
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from loguru import logger
+
+from agents.report import report_agent
+from agents.triage import triage_agent
+from services.detection_set import DetectionSet
+from services.policies import policy_service
+from services.triage_rules import CompiledTriageRules, UNKNOWN, AMBER
+
+LABELS = ["fracture", "displaced_fracture", "hairline fracture", "dislocation", "soft-tissue swelling",
+          "bone_lesion", "implant", "cast", "avulsion", "sprain"]
+
+
+def make_dicts(count: int, seed: int = 0) -> list:
+    """``count`` detections in the ``Detection.to_dict`` format."""
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, len(LABELS), count).tolist()
+    scores = np.round(rng.uniform(0.05, 0.99, count), 3).tolist()
+    boxes = rng.integers(0, 1800, (count, 4)).tolist()
+    return [
+        {"label": LABELS[label], "bbox": bbox, "score": score}
+        for label, bbox, score in zip(labels, boxes, scores)
+    ]
+
+
+def retained_bytes(build) -> int:
+    """Bytes still allocated after ``build()`` returns (result kept alive)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def legacy_triage(detections: list, config: dict) -> dict:
+    """Per-detection loops previously in ``TriageAgent._apply_rules``/``_apply_dynamic_rules``."""
+    red_patterns, amber_patterns, green_patterns = (
+        config["red_patterns"], config["amber_patterns"], config["green_patterns"]
+    )
+    rationale = []
+    severity_scores = {"RED": 0.0, "AMBER": 0.0, "GREEN": 0.0}
+    max_confidence = 0.0
+    for detection in detections:
+        raw_label = detection.get("label", "")
+        normalized_label = raw_label.lower().replace(" ", "").replace("-", "")
+        score = detection.get("score")
+        if score is None:
+            score = detection.get("confidence", 0.0)
+        if any(pattern in normalized_label for pattern in red_patterns):
+            base_severity = "RED"
+            rationale.append(f"Severe injury detected: {raw_label} (confidence: {score:.2f})")
+        elif any(pattern in normalized_label for pattern in green_patterns):
+            base_severity = "GREEN"
+            rationale.append(f"Minor injury detected: {raw_label} (confidence: {score:.2f})")
+        elif any(pattern in normalized_label for pattern in amber_patterns):
+            base_severity = "AMBER"
+            rationale.append(f"Moderate injury detected: {raw_label} (confidence: {score:.2f})")
+        else:
+            base_severity = "AMBER"
+            rationale.append(f"Injury detected: {raw_label} (confidence: {score:.2f})")
+        severity_scores[base_severity] += score
+        max_confidence = max(max_confidence, score)
+    high_conf = [d for d in detections if (d.get("confidence") or d.get("score", 0)) > config["high_confidence_threshold"]]
+    counts = [
+        sum(1 for d in detections if any(pattern in d.get("label", "").lower() for pattern in patterns))
+        for patterns in (red_patterns, amber_patterns, green_patterns)
+    ]
+
+    triage_score = 0.0
+    for detection in detections:
+        label = detection.get("label", "").lower()
+        score = detection.get("score", 0.0)
+        contribution = (score * 0.7) + (triage_agent._calculate_severity_score(label) * 0.3)
+        triage_score = max(triage_score, contribution)
+    return {
+        "rationale": rationale,
+        "severity_scores": severity_scores,
+        "max_confidence": max_confidence,
+        "high_conf": len(high_conf),
+        "pattern_counts": counts,
+        "triage_score": triage_score
+    }
+
+
+def set_triage(detections: DetectionSet, rules: CompiledTriageRules, config: dict) -> dict:
+    """The figures of ``legacy_triage`` from the ``DetectionSet`` calls in ``TriageAgent``."""
+    prefixes = ["Severe injury detected", "Moderate injury detected", "Minor injury detected", "Injury detected"]
+    categories = detections.label_values(rules.category)
+    rationale = [
+        f"{prefixes[category]}: {raw_label} (confidence: {score:.2f})"
+        for category, raw_label, score in zip(categories, detections.labels, detections.scores)
+    ]
+    weighted = [0.0, 0.0, 0.0]
+    for category, score in zip(categories, detections.scores):
+        weighted[AMBER if category == UNKNOWN else category] += score
+    return {
+        "rationale": rationale,
+        "severity_scores": {"RED": weighted[0], "AMBER": weighted[1], "GREEN": weighted[2]},
+        "max_confidence": max(detections.scores),
+        "high_conf": detections.count_scores_above(config["high_confidence_threshold"]),
+        "pattern_counts": [sum(tier) for tier in zip(*detections.label_values(rules.pattern_matches))],
+        "triage_score": detections.max_weighted_score(lambda label: rules.severity(label.lower()), 0.7, 0.3)
+    }
+
+
+def current_triage(detections: DetectionSet, config: dict) -> dict:
+    rules = triage_agent._apply_rules(detections, None, "hand", config)
+    dynamic = triage_agent._apply_dynamic_rules(detections, None, "hand", config)
+    return {"rules": rules, "dynamic": dynamic}
+
+
+def legacy_report(detections: list) -> dict:
+    """Grouping and statistics previously in ``ReportAgent``."""
+    groups = {}
+    for detection in detections:
+        groups.setdefault(detection.get("label", "unknown"), []).append(detection)
+    details = [
+        (label, len(group), sum(d.get("score", 0.0) for d in group) / len(group))
+        for label, group in groups.items()
+    ]
+    scores = [d.get("score", 0.0) for d in detections]
+    return {
+        "details": details,
+        "fractures": sum(1 for d in detections if "fracture" in d.get("label", "").lower()),
+        "stats": (min(scores), max(scores), sum(scores) / len(scores))
+    }
+
+
+def set_report(detections: DetectionSet) -> dict:
+    """The figures of ``legacy_report`` from the ``DetectionSet`` calls in ``ReportAgent``."""
+    min_score, max_score, score_sum = detections.score_stats()
+    return {
+        "details": [
+            (label, group["count"], group["mean_score"]) for label, group in detections.label_groups().items()
+        ],
+        "fractures": detections.count_labels(lambda label: "fracture" in label.lower()),
+        "stats": (min_score, max_score, score_sum / len(detections))
+    }
+
+
+def current_report(detections: DetectionSet) -> dict:
+    return {
+        "findings": report_agent._prepare_findings_section(detections),
+        "recommendations": report_agent._prepare_recommendations_section({"level": "AMBER"}, detections),
+        "technical": report_agent._prepare_technical_details(detections, None)
+    }
+
+
+def check_equivalent(dicts: list, detections: DetectionSet, config: dict) -> None:
+    legacy = legacy_triage(dicts, config)
+    timed = set_triage(detections, triage_agent._rules(config), config)
+    for key, value in legacy.items():
+        if isinstance(value, dict):
+            assert all(abs(timed[key][level] - value[level]) < 1e-9 for level in value), f"timed {key} differs"
+        else:
+            assert timed[key] == value or abs(timed[key] - value) < 1e-9, f"timed {key} differs"
+    current = current_triage(detections, config)
+    rules, breakdown = current["rules"], current["rules"]["severity_breakdown"]
+    assert rules["rationale"][:len(dicts)] == legacy["rationale"], "rationale differs"
+    for key, level in (("red_score", "RED"), ("amber_score", "AMBER"), ("green_score", "GREEN")):
+        assert abs(breakdown[key] - legacy["severity_scores"][level]) < 1e-9, f"{key} differs"
+    assert current["dynamic"]["rationale"][:len(dicts)] == [
+        f"{d['label']} detected (confidence: {d['score']:.2f})" for d in dicts
+    ], "dynamic rationale differs"
+    assert abs(current["dynamic"]["triage_score"] - legacy["triage_score"]) < 1e-9, "triage score differs"
+
+    legacy_rep = legacy_report(dicts)
+    timed_rep = set_report(detections)
+    assert timed_rep["details"] == legacy_rep["details"] and timed_rep["fractures"] == legacy_rep["fractures"], "timed report differs"
+    assert all(abs(a - b) < 1e-9 for a, b in zip(timed_rep["stats"], legacy_rep["stats"])), "timed report stats differ"
+    report = current_report(detections)
+    assert len(report["findings"]["details"]) == len(legacy_rep["details"]), "finding groups differ"
+    for detail, (label, count, mean) in zip(report["findings"]["details"], legacy_rep["details"]):
+        assert f"{mean:.2f}" == detail["confidence"], f"mean score for {label} differs"
+    expected_range = f"{legacy_rep['stats'][0]:.2f} - {legacy_rep['stats'][1]:.2f}"
+    assert report["technical"]["detection_stats"]["confidence_range"] == expected_range, "score range differs"
+    fracture_lines = [line for line in report["recommendations"]["detection_specific"] if line.startswith("Fracture")]
+    expected_lines = [
+        f"Fracture management protocol appropriate for {legacy_rep['fractures']} detected fracture(s)"
+    ] if legacy_rep["fractures"] else []
+    assert fracture_lines == expected_lines, "fracture count differs"
+
+
+def time_call(func, repeat: int) -> float:
+    """Median wall time of ``func()`` in microseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return sorted(samples)[len(samples) // 2]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 3, 10, 32, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    logger.remove()
+    config = policy_service.get_triage_config()
+    rules = triage_agent._rules(config)
+    for size in args.sizes:
+        dicts = make_dicts(size)
+        detections = DetectionSet.from_dicts(dicts)
+        check_equivalent(dicts, detections, config)
+
+        dict_bytes = retained_bytes(lambda: make_dicts(size))
+        set_bytes = retained_bytes(lambda: DetectionSet.from_dicts(dicts))
+        legacy_us = time_call(lambda: (legacy_triage(dicts, config), legacy_report(dicts)), args.repeat)
+        current_us = time_call(lambda: (set_triage(detections, rules, config), set_report(detections)), args.repeat)
+        convert_us = time_call(lambda: DetectionSet.from_dicts(dicts), args.repeat)
+        print(f"{size:>6} detections: memory dicts {dict_bytes / 1024:9.1f} KiB, set {set_bytes / 1024:8.1f} KiB | "
+              f"triage+report dicts {legacy_us:10.1f} us, set {current_us:9.1f} us "
+              f"({legacy_us / current_us:5.1f}x, one-off conversion {convert_us:8.1f} us)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Measure per-request CPU time and peak memory of the upload image pipeline.
+
+Compares the legacy flow (decode/reopen the upload at every stage) with the
+single-decode ``DecodedImage`` flow. Model inference, Cloudinary and PDF
+layout are left out so only image handling is measured.
+
+Usage (from the Agentic-AI directory):
+    python -m benchmarks.image_pipeline [--width 2048] [--height 1536] [--requests 20]
+"""
+
+import argparse
+import base64
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Typical detections drawn on the annotated image
+BOXES = [(300, 400, 520, 610), (900, 700, 1150, 980)]
+
+
+def make_upload(width: int, height: int) -> str:
+    """Create a base64 JPEG upload resembling a grayscale X-ray."""
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(40, 200, width, dtype=np.float32)[None, :].repeat(height, axis=0)
+    noisy = np.clip(gradient + rng.normal(0, 25, (height, width)), 0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(noisy).save(buffer, format="JPEG", quality=92)
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+def _annotate(image: Image.Image) -> bytes:
+    draw = ImageDraw.Draw(image)
+    for box in BOXES:
+        draw.rectangle(box, outline="#FF0000", width=3)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=95)
+    return buffer.getvalue()
+
+
+def legacy_request(upload: str) -> None:
+    """Image handling as done before DecodedImage."""
+    image_bytes = base64.b64decode(upload)
+
+    # Aspect-ratio routing heuristic
+    image = Image.open(io.BytesIO(image_bytes))
+    _ = image.size[0] / image.size[1]
+
+    # Detector preprocessing
+    image = Image.open(io.BytesIO(image_bytes))
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    _ = np.array(image)
+
+    # Annotation
+    image = Image.open(io.BytesIO(image_bytes))
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    annotated = _annotate(image)
+
+    # Cloudinary upload of the original (base64 decoded again)
+    _ = base64.b64decode(upload)
+
+    # Response copy of the annotated image
+    _ = base64.b64encode(annotated).decode("utf-8")
+
+    # PDF embedding re-downloads and re-encodes both images
+    for data in (image_bytes, annotated):
+        with Image.open(io.BytesIO(data)) as pil_img:
+            if pil_img.mode != "RGB":
+                pil_img = pil_img.convert("RGB")
+            pil_img.save(io.BytesIO(), format="JPEG", quality=85)
+
+
+def decoded_request(upload: str) -> None:
+    """Image handling with a single DecodedImage shared by all stages."""
+    from services.decoded_image import DecodedImage
+
+    image = DecodedImage.from_base64(upload)
+    _ = image.aspect_ratio
+    _ = image.array
+    annotated_bytes = _annotate(image.to_pil())
+    annotated = DecodedImage(annotated_bytes, image.width, image.height, format="JPEG")
+    _ = image.raw_bytes
+    _ = annotated.to_data_url()
+    # JPEG streams are embedded in the PDF as-is
+    _ = (io.BytesIO(image.raw_bytes), io.BytesIO(annotated.raw_bytes))
+
+
+VARIANTS = {"legacy": legacy_request, "decoded": decoded_request}
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process in KiB."""
+    # ru_maxrss survives exec on Linux and would include the parent's peak
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_variant(name: str, upload: str, requests: int) -> dict:
+    """Run one variant in this process and report CPU and peak RSS."""
+    func = VARIANTS[name]
+    if name == "decoded":
+        import services.decoded_image  # noqa: F401 - keep import cost out of the numbers
+
+    baseline_rss = peak_rss_kb()
+    cpu_start = time.process_time()
+    for _ in range(requests):
+        func(upload)
+    cpu_ms = (time.process_time() - cpu_start) * 1000 / requests
+    peak_rss = peak_rss_kb()
+
+    return {
+        "variant": name,
+        "cpu_ms_per_request": round(cpu_ms, 2),
+        "peak_rss_growth_mb": round((peak_rss - baseline_rss) / 1024, 1)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=2048)
+    parser.add_argument("--height", type=int, default=1536)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--variant", choices=list(VARIANTS))
+    parser.add_argument("--upload", help="File with the base64 upload (set by the parent run)")
+    args = parser.parse_args()
+
+    if args.variant:
+        with open(args.upload) as f:
+            upload = f.read()
+        print(json.dumps(run_variant(args.variant, upload, args.requests)))
+        return
+
+    # Each variant runs in a fresh interpreter so peak RSS is not shared;
+    # the upload is generated here so its scratch memory does not count
+    with tempfile.NamedTemporaryFile("w", suffix=".b64") as upload_file:
+        upload_file.write(make_upload(args.width, args.height))
+        upload_file.flush()
+
+        print(f"Image {args.width}x{args.height}, {args.requests} requests per variant")
+        for name in VARIANTS:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.image_pipeline", "--variant", name,
+                 "--upload", upload_file.name, "--requests", str(args.requests)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{name:>8}: {result['cpu_ms_per_request']:8.2f} ms CPU/request, "
+                  f"peak RSS +{result['peak_rss_growth_mb']} MB")
+
+
+if __name__ == "__main__":
+    main()
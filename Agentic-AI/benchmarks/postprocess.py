@@ -0,0 +1,127 @@
+"""Measure YOLO detection postprocessing time per result.
+
+Compares the legacy per-box loop (tensor indexing and a host copy for every
+box) with the vectorized ``DetectionPostprocessor`` on synthetic Ultralytics
+style results of 10-1000 boxes, and checks both produce the same detections.
+Uses torch tensors when torch is installed, NumPy arrays otherwise.
+
+Usage (from the Agentic-AI directory):
+    python -m benchmarks.postprocess [--sizes 10 100 1000] [--repeat 200] [--threshold 0.35]
+"""
+
+import argparse
+import time
+import numpy as np
+
+from services.detection_postprocess import DetectionPostprocessor
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+CLASS_NAMES = ["fracture", "displaced_fracture", "hairline_fracture", "comminuted_fracture", "avulsion_fracture"]
+MODEL_NAMES = {0: "fracture", 1: "displaced_fracture", 2: "hairline_fracture", 3: "comminuted_fracture",
+               4: "avulsion_fracture", 5: "implant", 6: "cast"}
+
+
+class SyntheticBoxes:
+    """Minimal stand-in for ``ultralytics.engine.results.Boxes``."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def xyxy(self):
+        return self.data[:, :4]
+
+    @property
+    def conf(self):
+        return self.data[:, -2]
+
+    @property
+    def cls(self):
+        return self.data[:, -1]
+
+
+class SyntheticResult:
+    def __init__(self, data):
+        self.boxes = SyntheticBoxes(data)
+        self.names = MODEL_NAMES
+
+
+def make_results(count: int, seed: int = 0) -> list:
+    """One result with ``count`` random boxes on a 2048x1536 image."""
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(0, 1800, (count, 2))
+    wh = rng.uniform(10, 240, (count, 2))
+    conf = rng.uniform(0.05, 0.99, count)
+    cls = rng.integers(0, len(MODEL_NAMES) + 2, count)  # includes IDs unknown to the model
+    data = np.column_stack([xy, xy + wh, conf, cls]).astype(np.float32)
+    if torch is not None:
+        data = torch.from_numpy(data)
+    return [SyntheticResult(data)]
+
+
+def legacy_postprocess(model_results, score_threshold: float) -> list:
+    """Per-box loop as previously used by HandAgent/LegAgent."""
+    detections = []
+    result = model_results[0]
+    boxes = result.boxes
+    for i in range(len(boxes)):
+        confidence = float(boxes.conf[i])
+        if confidence < score_threshold:
+            continue
+        class_id = int(boxes.cls[i])
+        if class_id < len(CLASS_NAMES):
+            label = CLASS_NAMES[class_id]
+        else:
+            label = result.names.get(class_id, f"detection_{class_id}")
+        normalized_label = "fracture" if "fracture" in label else label
+        if torch is not None:
+            x1, y1, x2, y2 = boxes.xyxy[i].cpu().numpy()
+        else:
+            x1, y1, x2, y2 = boxes.xyxy[i]
+        bbox = (int(x1), int(y1), int(x2 - x1), int(y2 - y1))
+        detections.append((normalized_label, bbox, confidence))
+    detections.sort(key=lambda d: d[2], reverse=True)
+    return detections
+
+
+def time_call(func, repeat: int) -> float:
+    """Median wall time of ``func()`` in microseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return sorted(samples)[len(samples) // 2]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--threshold", type=float, default=0.35)
+    args = parser.parse_args()
+
+    postprocessor = DetectionPostprocessor(CLASS_NAMES)
+    print(f"backend: {'torch ' + torch.__version__ if torch is not None else 'numpy'}, "
+          f"score threshold {args.threshold}")
+    for size in args.sizes:
+        results = make_results(size)
+        legacy = legacy_postprocess(results, args.threshold)
+        vectorized = postprocessor.records(results, args.threshold)
+        assert legacy == vectorized, f"outputs differ for {size} boxes"
+
+        legacy_us = time_call(lambda: legacy_postprocess(results, args.threshold), args.repeat)
+        vectorized_us = time_call(lambda: postprocessor.records(results, args.threshold), args.repeat)
+        print(f"{size:>5} boxes ({len(legacy):>4} kept): legacy {legacy_us:9.1f} us, "
+              f"vectorized {vectorized_us:8.1f} us, {legacy_us / vectorized_us:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Check that speculative detection overlaps the router's forward pass.
+
+Runs ``RouterAgent.classify_body_part`` with a classification step that
+blocks its thread for ``--route-ms`` (like a CPU forward pass) and a detector
+that takes ``--detect-ms`` off the event loop, as the YOLO agents do.
+Compares routing followed by detection with
+``SpeculativeDetection.route_and_detect`` and fails if a speculative
+detector did not start before routing returned.
+
+Usage (from the Agentic-AI directory):
+    python -m benchmarks.speculative_detection [--route-ms 300] [--detect-ms 300] [--requests 5]
+"""
+
+import argparse
+import asyncio
+import io
+import statistics
+import time
+from uuid import uuid4
+
+from PIL import Image
+
+from agents.router import RouterAgent
+from schemas.orchestrator import ProcessingMode
+from services.decoded_image import DecodedImage
+from services.policies import policy_service
+from services.speculative_detection import SpeculativeDetection
+
+
+def make_image() -> DecodedImage:
+    """Wide image, so the prior confidently guesses hand."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 448), (128, 128, 128)).save(buffer, format="PNG")
+    return DecodedImage.from_bytes(buffer.getvalue())
+
+
+async def run(route_ms: float, detect_ms: float, requests: int) -> None:
+    router = RouterAgent()
+
+    def blocking_classify(image: DecodedImage) -> dict:
+        # Stands in for preprocessing plus the forward pass, so no weights are needed
+        time.sleep(route_ms / 1000)
+        return {"body_part": "hand", "confidence": 0.9}
+
+    router._classify = blocking_classify
+    router.is_loaded = True
+    image = make_image()
+    speculation = SpeculativeDetection()
+
+    request_id = uuid4()
+    policy_service.get_config_for_request(request_id, ProcessingMode.ADVANCED, {"speculation_enabled": True})
+
+    timeline = {}
+
+    async def route():
+        result = await router.classify_body_part(image)
+        timeline["routed"] = time.perf_counter()
+        return result["body_part"], result["confidence"]
+
+    async def detect(part: str):
+        timeline.setdefault("detect_started", time.perf_counter())
+        await asyncio.sleep(detect_ms / 1000)
+        return {"detections": []}
+
+    sequential, speculative = [], []
+    for _ in range(requests):
+        start = time.perf_counter()
+        body_part, _ = await route()
+        await detect(body_part)
+        sequential.append((time.perf_counter() - start) * 1000)
+
+        timeline.clear()
+        start = time.perf_counter()
+        await speculation.route_and_detect(image, route, detect, request_id=request_id)
+        speculative.append((time.perf_counter() - start) * 1000)
+        if timeline["detect_started"] >= timeline["routed"]:
+            raise SystemExit("Speculative detection did not start before routing returned")
+
+    policy_service.cleanup_request_config(request_id)
+    print(f"{requests} requests, {route_ms:.0f}ms router forward pass, {detect_ms:.0f}ms detector")
+    print(f"{'sequential':>12}: p50 {statistics.median(sequential):7.1f} ms")
+    print(f"{'speculative':>12}: p50 {statistics.median(speculative):7.1f} ms "
+          f"(detector started before routing returned)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--route-ms", type=float, default=300)
+    parser.add_argument("--detect-ms", type=float, default=300)
+    parser.add_argument("--requests", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.route_ms, args.detect_ms, args.requests))
+
+
+if __name__ == "__main__":
+    main()
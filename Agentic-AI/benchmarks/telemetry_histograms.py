@@ -0,0 +1,147 @@
+"""Measure latency recording and scrapes: sliding sample deques versus log-linear histograms.
+
+Before, ``TelemetryService`` appended every duration to a 1000-sample deque
+under its global lock and each scrape sorted a copy of every deque. This
+benchmark replays that against the histograms:
+
+* accuracy: p50/p95/p99 of the histograms are within one bucket (~3%) of
+  the exact percentiles of *all* samples, and Prometheus ``_bucket``
+  counts equal the number of samples at or below each ``le`` bound;
+* record cost with 1 and several threads recording concurrently;
+* ``get_metrics`` and ``export_metrics_prometheus`` time for many keys,
+  both when every key recorded since the previous scrape (statistics are
+  recomputed) and when none did (cached statistics).
+
+Usage (from the Agentic-AI directory):
+    python -m benchmarks.telemetry_histograms [--keys 40] [--samples 200000] [--threads 8]
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from loguru import logger
+
+from services.latency_histogram import PROMETHEUS_BUCKET_BOUNDS, SUB_BUCKETS
+from services.telemetry import TelemetryService
+
+
+class DequeLatencies:
+    """The previous recording and statistics of ``TelemetryService``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency_samples = defaultdict(lambda: deque(maxlen=1000))
+
+    def record(self, key: str, duration: float) -> None:
+        with self._lock:
+            self.latency_samples[key].append(duration)
+
+    def stats(self) -> dict:
+        stats = {}
+        with self._lock:
+            for key, samples in self.latency_samples.items():
+                sorted_samples = sorted(samples)
+                n = len(sorted_samples)
+                stats[key] = {
+                    "count": n,
+                    "min": min(sorted_samples),
+                    "max": max(sorted_samples),
+                    "mean": sum(sorted_samples) / n,
+                    "p50": sorted_samples[n // 2],
+                    "p95": sorted_samples[int(n * 0.95)],
+                    "p99": sorted_samples[int(n * 0.99)]
+                }
+        return stats
+
+
+def make_samples(count: int, seed: int = 0) -> list:
+    """Log-normal durations around 50 ms with a long tail."""
+    rng = random.Random(seed)
+    return [rng.lognormvariate(-3.0, 1.0) for _ in range(count)]
+
+
+def check_accuracy(samples: list) -> None:
+    telemetry = TelemetryService()
+    for duration in samples:
+        telemetry.latency_histograms.record("step_detect", duration)
+    stats = telemetry.get_metrics()["latency_stats"]["step_detect"]
+    exact = sorted(samples)
+    n = len(exact)
+    assert stats["count"] == n and stats["min"] == exact[0] and stats["max"] == exact[-1]
+    for name, quantile in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        expected = exact[int(n * quantile)]
+        assert expected <= stats[name] <= expected * (1 + 1 / SUB_BUCKETS) + 1e-12, (name, expected, stats[name])
+
+    exported = telemetry.export_metrics_prometheus().splitlines()
+    for bound in PROMETHEUS_BUCKET_BOUNDS:
+        line = next(line for line in exported if f'le="{bound!r}"' in line)
+        assert int(line.rsplit(" ", 1)[1]) == sum(1 for duration in samples if duration <= bound), line
+    assert f'orthopedic_request_duration_seconds_bucket{{operation="detect",le="+Inf"}} {n}' in exported
+
+
+def time_records(record, keys: list, samples: list, threads: int) -> float:
+    """Nanoseconds per ``record`` call with ``threads`` threads sharing the samples."""
+    per_thread = len(samples) // threads
+
+    def worker(offset: int) -> None:
+        for index in range(offset, offset + per_thread):
+            record(keys[index % len(keys)], samples[index])
+
+    workers = [threading.Thread(target=worker, args=(offset * per_thread,)) for offset in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return (time.perf_counter() - start) * 1e9 / (per_thread * threads)
+
+
+def time_call(func, repeat: int = 20, setup=None) -> float:
+    """Median wall time of ``func()`` in microseconds, ``setup()`` run untimed before each call."""
+    durations = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1e6)
+    return sorted(durations)[len(durations) // 2]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=40)
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    logger.remove()
+    samples = make_samples(args.samples)
+    check_accuracy(samples[:50000])
+    print("percentiles within one bucket of exact values over all samples; Prometheus buckets exact")
+
+    keys = [f"step_{index}" for index in range(args.keys)]
+    legacy = DequeLatencies()
+    telemetry = TelemetryService()
+    for threads in (1, args.threads):
+        before = time_records(legacy.record, keys, samples, threads)
+        after = time_records(telemetry.latency_histograms.record, keys, samples, threads)
+        print(f"record, {threads} thread(s): deque {before:7.0f} ns, histogram {after:7.0f} ns")
+
+    def touch_all_keys() -> None:
+        for index, key in enumerate(keys):
+            telemetry.latency_histograms.record(key, samples[index])
+
+    before = time_call(legacy.stats)
+    print(f"scrape, {args.keys} keys: deque stats {before:9.0f} us (last 1000 samples per key)")
+    for label, setup in (("every key changed", touch_all_keys), ("no key changed", None)):
+        after = time_call(telemetry.get_metrics, setup=setup)
+        export = time_call(telemetry.export_metrics_prometheus, setup=setup)
+        print(f"scrape, {args.keys} keys, {label}: histogram stats {after:8.1f} us (all samples), "
+              f"Prometheus export {export:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Measure bulk triage: per-case dynamic rules versus ``TriageAgent.triage_batch``.
+
+Generates synthetic cases (0-8 detections each, some with symptoms), checks
+that ``triage_batch`` returns the same level, score and confidence as
+``_apply_dynamic_rules`` for every case, then times both.
+
+Usage (from the Agentic-AI directory):
+    python -m benchmarks.triage_batch [--cases 100 1000 10000] [--repeat 5]
+"""
+
+import argparse
+import time
+import numpy as np
+from loguru import logger
+
+from agents.triage import triage_agent
+from services.detection_set import DetectionSet
+from services.policies import policy_service
+
+LABELS = ["fracture", "displaced_fracture", "hairline fracture", "comminuted_fracture", "stress-fracture",
+          "dislocation", "avulsion", "soft tissue swelling", "implant", "normal"]
+SYMPTOMS = [None, None, "mild pain when moving", "severe pain and swelling", "numbness in fingers",
+            "bruising after a fall", "Unable to bear weight"]
+
+
+def make_cases(count: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    cases = []
+    for _ in range(count):
+        size = int(rng.integers(0, 9))
+        detections = [
+            {"label": LABELS[int(label)], "bbox": [0, 0, 10, 10], "score": round(float(score), 3)}
+            for label, score in zip(rng.integers(0, len(LABELS), size), rng.uniform(0.05, 0.99, size))
+        ]
+        cases.append({
+            "detections": DetectionSet.from_dicts(detections),
+            "symptoms": SYMPTOMS[int(rng.integers(0, len(SYMPTOMS)))],
+            "body_part": "hand"
+        })
+    return cases
+
+
+def per_case(cases: list, config: dict) -> list:
+    return [
+        triage_agent._apply_dynamic_rules(case["detections"], case["symptoms"], case["body_part"], config)
+        for case in cases
+    ]
+
+
+def time_call(func, repeat: int) -> float:
+    """Median wall time of ``func()`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e3)
+    return sorted(samples)[len(samples) // 2]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logger.remove()
+    config = policy_service.get_triage_config()
+    for count in args.cases:
+        cases = make_cases(count)
+        expected = per_case(cases, config)
+        batch = triage_agent.triage_batch(cases)
+        for single, batched in zip(expected, batch):
+            assert single["level"] == batched["level"], (single, batched)
+            if "triage_score" in single:  # not reported for cases without detections
+                assert single["triage_score"] == batched["triage_score"], (single, batched)
+            assert single["confidence"] == batched["confidence"], (single, batched)
+
+        per_case_ms = time_call(lambda: per_case(cases, config), args.repeat)
+        batch_ms = time_call(lambda: triage_agent.triage_batch(cases), args.repeat)
+        print(f"{count:>6} cases: per-case {per_case_ms:9.2f} ms, batch {batch_ms:8.2f} ms "
+              f"({per_case_ms / batch_ms:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Measure request-visible latency of the Cloudinary upload step.
+
+Runs against ``LocalUploadBackend`` with a simulated round-trip so no
+network is needed. Compares the legacy flow (two blocking uploads, one after
+the other, on the event loop) with the concurrent ``UploadStage`` and its
+upload-after-response mode. Also reports the longest event-loop stall seen by
+a ticker coroutine while requests are in flight.
+
+Usage (from the Agentic-AI directory):
+    python -m benchmarks.uploads [--latency-ms 150] [--requests 8] [--concurrency 4]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from services.upload_stage import LocalUploadBackend, UploadStage
+
+IMAGE = os.urandom(256 * 1024)
+
+
+async def legacy_request(backend: LocalUploadBackend, stage: UploadStage, request_id: str) -> None:
+    """Blocking uploads on the request coroutine, as done before UploadStage."""
+    for kind in ("original", "annotated"):
+        backend.upload_image(IMAGE, kind, f"{request_id}_{kind}")
+
+
+async def concurrent_request(backend: LocalUploadBackend, stage: UploadStage, request_id: str) -> None:
+    await stage.upload_analysis_images(request_id, IMAGE, IMAGE)
+
+
+async def after_response_request(backend: LocalUploadBackend, stage: UploadStage, request_id: str) -> None:
+    stage.start_analysis_upload(request_id, IMAGE, IMAGE)
+
+
+VARIANTS = {
+    "legacy": legacy_request,
+    "concurrent": concurrent_request,
+    "after_response": after_response_request
+}
+
+
+async def run_variant(name: str, root: str, latency_ms: float, requests: int, concurrency: int) -> dict:
+    """Run ``requests`` overlapping requests and collect latency and loop stalls."""
+    backend = LocalUploadBackend(root=root, latency_ms=latency_ms)
+    stage = UploadStage(backend=backend, max_concurrency=concurrency, max_attempts=1, mode="inline")
+    func = VARIANTS[name]
+
+    max_stall_ms = 0.0
+    running = True
+
+    async def ticker() -> None:
+        nonlocal max_stall_ms
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            max_stall_ms = max(max_stall_ms, (time.perf_counter() - start) * 1000 - 5)
+
+    async def timed(index: int) -> float:
+        # All requests arrive together, so time spent queued behind a
+        # blocked event loop counts towards latency
+        await func(backend, stage, f"{name}-{index}")
+        return (time.perf_counter() - wall_start) * 1000
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    wall_start = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(timed(i) for i in range(requests))))
+    wall_ms = (time.perf_counter() - wall_start) * 1000
+
+    # Let background uploads drain before tearing down
+    while stage.get_stats()["pending_background"]:
+        await asyncio.sleep(0.01)
+    running = False
+    await ticker_task
+    stage.shutdown()
+
+    return {
+        "variant": name,
+        "p50_ms": latencies[len(latencies) // 2],
+        "max_ms": latencies[-1],
+        "wall_ms": wall_ms,
+        "max_loop_stall_ms": max_stall_ms
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--requests", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{args.requests} concurrent requests, 2 uploads each, {args.latency_ms:.0f}ms simulated round-trip")
+    with tempfile.TemporaryDirectory() as root:
+        for name in VARIANTS:
+            result = asyncio.run(run_variant(name, root, args.latency_ms, args.requests, args.concurrency))
+            print(f"{name:>15}: p50 {result['p50_ms']:8.1f} ms, max {result['max_ms']:8.1f} ms, "
+                  f"wall {result['wall_ms']:8.1f} ms, loop stall {result['max_loop_stall_ms']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
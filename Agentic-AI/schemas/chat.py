@@ -63,6 +63,7 @@ class ChatMessage(BaseModel):
     mcp_context: Optional[Dict[str, Any]] = Field(None, description="MCP context data")
     patient_info: Optional[PatientInfo] = Field(None, description="Patient information")
     timestamp: Optional[str] = Field(None, description="Message timestamp")
+    stream: bool = Field(default=False, description="Stream the response as Server-Sent Events")
 
 
 class ChatResponse(BaseResponse):
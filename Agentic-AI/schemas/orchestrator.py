@@ -42,6 +42,7 @@ class ProcessingStep(BaseModel):
     error_message: Optional[str] = None
     retry_count: int = 0
     artifacts: Dict[str, str] = Field(default_factory=dict)  # artifact_type -> file_id
+    depends_on: List[StepName] = Field(default_factory=list)  # steps that must finish first
     
     def start(self) -> None:
         """Mark step as started."""
@@ -107,9 +108,9 @@ class StepGraph(BaseModel):
                 return step
         return None
     
-    def add_step(self, step_name: StepName) -> ProcessingStep:
-        """Add a new step to the graph."""
-        step = ProcessingStep(name=step_name)
+    def add_step(self, step_name: StepName, depends_on: Optional[List[StepName]] = None) -> ProcessingStep:
+        """Add a new step to the graph, optionally after the given steps."""
+        step = ProcessingStep(name=step_name, depends_on=depends_on or [])
         self.steps.append(step)
         self.updated_at = datetime.utcnow()
         return step
@@ -145,6 +146,68 @@ class StepGraph(BaseModel):
     def get_failed_steps(self) -> List[ProcessingStep]:
         """Get all failed steps."""
         return [step for step in self.steps if step.status in {StepStatus.ERROR, StepStatus.TIMEOUT}]
+    
+    def get_ready_steps(self) -> List[ProcessingStep]:
+        """
+        Get pending steps whose dependencies have all finished.
+        
+        Dependencies on steps that are not in the graph (e.g. a detector that
+        routing did not select) are treated as satisfied.
+        """
+        terminal_statuses = {StepStatus.OK, StepStatus.ERROR, StepStatus.SKIPPED, StepStatus.TIMEOUT}
+        ready = []
+        for step in self.steps:
+            if step.status != StepStatus.PENDING:
+                continue
+            dependencies = [self.get_step(name) for name in step.depends_on]
+            if all(dep is None or dep.status in terminal_statuses for dep in dependencies):
+                ready.append(step)
+        return ready
+    
+    def get_critical_path(self) -> List[ProcessingStep]:
+        """
+        Get the chain of steps that determined the request's wall-clock time.
+        
+        Walks back from the last step to finish, each time following the
+        dependency that finished last.
+        """
+        finished = [step for step in self.steps if step.completed_at]
+        if not finished:
+            return []
+        
+        step = max(finished, key=lambda s: s.completed_at)
+        path = [step]
+        while True:
+            dependencies = [self.get_step(name) for name in step.depends_on]
+            dependencies = [dep for dep in dependencies if dep and dep.completed_at]
+            if not dependencies:
+                break
+            step = max(dependencies, key=lambda s: s.completed_at)
+            path.append(step)
+        return list(reversed(path))
+    
+    def get_timing_summary(self) -> Dict[str, Any]:
+        """Get wall-clock, summed step and critical-path timings in milliseconds."""
+        started = [step.started_at for step in self.steps if step.started_at]
+        completed = [step.completed_at for step in self.steps if step.completed_at]
+        wall_ms = int((max(completed) - min(started)).total_seconds() * 1000) if started and completed else 0
+        
+        path = []
+        previous_end = min(started) if started else None
+        for step in self.get_critical_path():
+            # Time between the previous critical step finishing and this one starting
+            wait_ms = None
+            if step.started_at and previous_end:
+                wait_ms = max(0, int((step.started_at - previous_end).total_seconds() * 1000))
+            path.append({"name": step.name.value, "duration_ms": step.duration_ms or 0, "wait_ms": wait_ms})
+            previous_end = step.completed_at
+        
+        return {
+            "wall_ms": wall_ms,
+            "total_step_ms": sum(step.duration_ms or 0 for step in self.steps),
+            "critical_path_ms": sum(entry["duration_ms"] for entry in path),
+            "critical_path": path
+        }
 
 
 class GuidedPrompt(BaseModel):
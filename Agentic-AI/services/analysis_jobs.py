@@ -0,0 +1,297 @@
+"""Queued execution of analysis requests (202 Accepted job mode)."""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from loguru import logger
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+from services.error_handler import ErrorCode, OrthopedicError, ValidationError
+from services.request_store import create_request_store
+from services.security import DataSanitizer
+from services.step_events import step_event_hub
+
+
+class AnalysisQueueFullError(OrthopedicError):
+    """Raised when the analysis job queue is at capacity."""
+
+    def __init__(self, queue_depth: int, max_queue: int):
+        super().__init__(
+            "Analysis queue is full, please retry shortly",
+            ErrorCode.SERVICE_UNAVAILABLE,
+            details={"queue_depth": queue_depth, "max_queue": max_queue},
+            http_status=503
+        )
+
+
+def _encode_job(job: Dict[str, Any]) -> str:
+    # Results can carry numpy scalars and datetimes from the agents
+    return json.dumps(job, default=str)
+
+
+def job_event_data(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Payload of a ``job`` event (and of ``end`` once the job has finished)."""
+    return {
+        "request_id": job["request_id"],
+        "status": job["status"],
+        "queue_position": job["queue_position"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "completed_at": job["completed_at"],
+        "error": job["error"]
+    }
+
+
+class AnalysisJobQueue:
+    """Bounded local work queue that runs analysis requests on a worker pool.
+
+    ``submit`` enqueues a coroutine factory and returns the job record at
+    once; ``max_workers`` worker coroutines drain the queue. When
+    ``max_queue`` jobs are already waiting, new submissions fail fast with
+    ``AnalysisQueueFullError`` (503) instead of piling up. Job records live in
+    a request store, so with REQUEST_STORE_BACKEND=sqlite any worker process
+    can answer status polls. When a job finishes, its outcome is POSTed to the
+    callback URL, signed with HMAC-SHA256 if a secret is configured.
+    Queued and running states are published to the step event hub under the
+    job's request ID, followed by ``end`` when the job finishes.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None):
+        """Initialize queue from arguments or application config."""
+        try:
+            from app.config import config
+            self.max_workers = max_workers or config.analysis_job_workers
+            self.max_queue = max_queue or config.analysis_job_queue_size
+            self.default_callback_url = config.analysis_callback_url
+            self.allowed_callback_hosts = {
+                host.strip().lower() for host in config.analysis_callback_allowed_hosts.split(",") if host.strip()
+            }
+            self.callback_secret = config.analysis_callback_secret
+            self.callback_timeout = config.analysis_callback_timeout
+            self.callback_attempts = config.analysis_callback_attempts
+        except Exception:
+            # Fallback for testing
+            self.max_workers = max_workers or 4
+            self.max_queue = max_queue or 100
+            self.default_callback_url = None
+            self.allowed_callback_hosts = set()
+            self.callback_secret = None
+            self.callback_timeout = 10.0
+            self.callback_attempts = 3
+
+        self._jobs = create_request_store("analysis_jobs", _encode_job, json.loads)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._running = 0
+
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.callbacks_delivered = 0
+        self.callbacks_failed = 0
+
+        logger.info(f"AnalysisJobQueue initialized with {self.max_workers} workers, queue size {self.max_queue}")
+
+    def _ensure_workers(self) -> asyncio.Queue:
+        # Created on first use so the queue binds to the server's event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < self.max_workers:
+            self._workers.append(asyncio.create_task(self._worker()))
+        return self._queue
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def resolve_callback_url(self, callback_url: Optional[str]) -> Optional[str]:
+        """
+        Validate a per-request callback URL, falling back to ANALYSIS_CALLBACK_URL.
+
+        Per-request callbacks are only accepted for hosts listed in
+        ANALYSIS_CALLBACK_ALLOWED_HOSTS, so the server cannot be pointed at
+        arbitrary internal addresses.
+        """
+        if not callback_url:
+            return self.default_callback_url
+
+        parsed = urlparse(callback_url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise ValidationError(
+                "Callback URL must be an absolute http(s) URL",
+                ErrorCode.INVALID_REQUEST_FORMAT
+            )
+        if parsed.hostname.lower() not in self.allowed_callback_hosts:
+            raise ValidationError(
+                "Callback host is not allowed",
+                ErrorCode.INVALID_REQUEST_FORMAT,
+                {"host": parsed.hostname}
+            )
+        return callback_url
+
+    def submit(
+        self,
+        request_id: str,
+        run: Callable[[], Awaitable[Dict[str, Any]]],
+        callback_url: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue an analysis for background execution.
+
+        Args:
+            request_id: Identifier clients poll with
+            run: Coroutine factory producing the analysis response dict
+            callback_url: Already-resolved URL to notify on completion
+
+        Returns:
+            Job record including queue position
+
+        Raises:
+            AnalysisQueueFullError: If ``max_queue`` jobs are already waiting
+        """
+        queue = self._ensure_workers()
+        if queue.full():
+            self.rejected += 1
+            logger.warning(f"Analysis queue full ({queue.qsize()}/{self.max_queue}), rejecting {request_id}")
+            raise AnalysisQueueFullError(queue.qsize(), self.max_queue)
+
+        job = {
+            "request_id": request_id,
+            "status": "queued",
+            "created_at": time.time(),
+            "started_at": None,
+            "completed_at": None,
+            "queue_position": queue.qsize() + 1,
+            "result": None,
+            "error": None,
+            "callback": {"url": callback_url, "status": "pending", "attempts": 0} if callback_url else None
+        }
+        self._jobs.put(request_id, job)
+        queue.put_nowait((job, run))
+        step_event_hub.publish(request_id, "job", job_event_data(job))
+        self.submitted += 1
+        logger.info(f"Queued analysis {request_id} (depth {queue.qsize()}/{self.max_queue})")
+        return job
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job record by request ID."""
+        return self._jobs.get(request_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job, run = await self._queue.get()
+            self._running += 1
+            try:
+                await self._run_job(job, run)
+            except Exception as e:
+                logger.error(f"Analysis worker error for {job['request_id']}: {e}")
+            finally:
+                self._running -= 1
+                self._queue.task_done()
+
+    async def _run_job(self, job: Dict[str, Any], run: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+        request_id = job["request_id"]
+        job["status"] = "running"
+        job["started_at"] = time.time()
+        job["queue_position"] = None
+        self._jobs.put(request_id, job)
+        step_event_hub.publish(request_id, "job", job_event_data(job))
+
+        try:
+            job["result"] = await run()
+            job["status"] = "completed"
+            self.completed += 1
+        except Exception as e:
+            # HTTPException carries its message in detail
+            message = getattr(e, "message", None) or getattr(e, "detail", None) or str(e)
+            job["error"] = DataSanitizer.sanitize_error_message(str(message))
+            job["status"] = "failed"
+            self.failed += 1
+            logger.error(f"Queued analysis {request_id} failed: {job['error']}")
+        job["completed_at"] = time.time()
+        self._jobs.put(request_id, job)
+        # No-op if the orchestrator already ended the stream with its step graph
+        step_event_hub.close(request_id, job_event_data(job))
+
+        if job["callback"]:
+            await self._deliver_callback(job)
+            self._jobs.put(request_id, job)
+
+    async def _deliver_callback(self, job: Dict[str, Any]) -> None:
+        """POST the finished job to its callback URL, retrying with backoff."""
+        callback = job["callback"]
+        if not HTTPX_AVAILABLE:
+            logger.warning("httpx not installed, cannot deliver analysis callbacks")
+            callback["status"] = "failed"
+            self.callbacks_failed += 1
+            return
+
+        body = _encode_job({
+            "event": f"analysis.{job['status']}",
+            "request_id": job["request_id"],
+            "status": job["status"],
+            "status_url": f"/api/requests/{job['request_id']}",
+            "result": job["result"],
+            "error": job["error"]
+        }).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.callback_secret:
+            signature = hmac.new(self.callback_secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+            headers["X-OrthoAssist-Signature"] = f"sha256={signature}"
+
+        async with httpx.AsyncClient(timeout=self.callback_timeout) as client:
+            for attempt in range(1, self.callback_attempts + 1):
+                callback["attempts"] = attempt
+                try:
+                    response = await client.post(callback["url"], content=body, headers=headers)
+                    if response.status_code < 300:
+                        callback["status"] = "delivered"
+                        self.callbacks_delivered += 1
+                        return
+                    logger.warning(f"Callback for {job['request_id']} returned {response.status_code}")
+                except httpx.HTTPError as e:
+                    logger.warning(f"Callback for {job['request_id']} failed (attempt {attempt}): {e}")
+                if attempt < self.callback_attempts:
+                    await asyncio.sleep(0.5 * 2 ** (attempt - 1) * (1 + random.random()))
+
+        callback["status"] = "failed"
+        self.callbacks_failed += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue statistics."""
+        return {
+            "workers": self.max_workers,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "running": self._running,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+            "callbacks_delivered": self.callbacks_delivered,
+            "callbacks_failed": self.callbacks_failed,
+            "jobs": self._jobs.get_stats()
+        }
+
+    def shutdown(self) -> None:
+        """Stop worker coroutines; queued jobs are abandoned."""
+        for task in self._workers:
+            task.cancel()
+        self._workers = []
+
+
+# Global analysis job queue instance
+analysis_job_queue = AnalysisJobQueue()
@@ -0,0 +1,391 @@
+"""Write-behind audit log in compressed JSONL segments with a request index."""
+
+import gzip
+import json
+import queue
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from loguru import logger
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_segments (
+    segment INTEGER PRIMARY KEY,
+    bytes INTEGER NOT NULL,
+    entries INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS audit_index (
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    request_id TEXT,
+    operation TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_audit_request ON audit_index (request_id, segment, offset);
+CREATE INDEX IF NOT EXISTS idx_audit_operation ON audit_index (operation, segment, offset);
+CREATE INDEX IF NOT EXISTS idx_audit_segment ON audit_index (segment);
+"""
+
+
+def _index_key(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+class AuditLogSink:
+    """Persists audit events off the request path.
+
+    ``append`` only puts the event on an unbounded ``queue.SimpleQueue``. A
+    writer thread drains it in batches; each batch is appended to the
+    current segment file as one gzip member, so ``audit-*.jsonl.gz`` files
+    read as plain gzipped JSONL while every batch can be decompressed on its
+    own. A SQLite index maps request IDs and operations to the batches
+    holding them, so a request's events are found by a B-tree lookup and
+    one small decompression instead of a scan. Segments rotate at
+    ``segment_max_bytes`` and the oldest are deleted once all segments
+    exceed ``retention_bytes``. Several processes may share a directory:
+    a batch's segment and offset are chosen and its member appended while
+    holding the index's write transaction, which serializes writers.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_max_bytes: int = 8 * 1024 * 1024,
+        retention_bytes: int = 256 * 1024 * 1024,
+        batch_size: int = 64,
+        flush_interval: float = 0.2
+    ):
+        """Initialize sink; files are opened and the writer started on first use."""
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.retention_bytes = retention_bytes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Held by the writer per batch and by readers; never by ``append``
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stopping = False
+
+        self._segment = 0
+        self._total_bytes = 0
+        self._total_entries = 0
+
+        self.events_written = 0
+        self.batches_written = 0
+        self.segments_deleted = 0
+        self.write_errors = 0
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"audit-{segment:08d}.jsonl.gz"
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.directory / "audit_index.sqlite3"), check_same_thread=False, isolation_level=None, timeout=5.0
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._read_totals(conn)
+            logger.debug(f"Audit log opened at {self.directory} (segment {self._segment})")
+        return self._conn
+
+    def _read_totals(self, conn: sqlite3.Connection) -> None:
+        # The index is shared with other processes, so it, not this process, knows the totals
+        row = conn.execute("SELECT MAX(segment), COALESCE(SUM(bytes), 0), COALESCE(SUM(entries), 0) "
+                           "FROM audit_segments").fetchone()
+        self._segment = row[0] or 1
+        self._total_bytes, self._total_entries = row[1], row[2]
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._start_lock:
+            if self._writer is None and not self._stopping:
+                self._writer = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+                self._writer.start()
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """
+        Queue an audit event for writing.
+
+        Args:
+            entry: JSON-serializable event with ``request_id`` and ``operation``
+        """
+        self._queue.put(entry)
+        if self._writer is None:
+            self._ensure_writer()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._stopping:
+                    return
+                continue
+            if item is None:
+                return
+
+            batch, waiters = [], []
+            while True:
+                if isinstance(item, threading.Event):
+                    # Queued by ``flush``: set once earlier events are on disk
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)  # stop after this batch
+                    break
+
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except Exception as e:
+                    self.write_errors += 1
+                    logger.error(f"Failed to write {len(batch)} audit events: {e}")
+            for waiter in waiters:
+                waiter.set()
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        payload = "".join(json.dumps(entry, default=str) + "\n" for entry in batch).encode("utf-8")
+        member = gzip.compress(payload, compresslevel=6)
+        # Stored as text like in the JSON lines, so e.g. UUID request IDs index and match
+        keys = {(_index_key(entry.get("request_id")), _index_key(entry.get("operation"))) for entry in batch}
+
+        with self._lock:
+            conn = self._connection()
+            # Writers of every process wait here, so the newest segment and its end
+            # cannot change until this batch is indexed
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._read_totals(conn)
+                segment = self._segment
+                path = self._segment_path(segment)
+                size = path.stat().st_size if path.exists() else 0
+                if size and size + len(member) > self.segment_max_bytes:
+                    segment += 1
+                with open(self._segment_path(segment), "ab") as f:
+                    # The file end, even if a failed batch left bytes the index does not know about
+                    offset = f.tell()
+                    f.write(member)
+
+                conn.executemany(
+                    "INSERT INTO audit_index VALUES (?, ?, ?, ?, ?)",
+                    [(segment, offset, len(member), request_id, operation) for request_id, operation in keys]
+                )
+                conn.execute(
+                    "INSERT INTO audit_segments VALUES (?, ?, ?) ON CONFLICT(segment) DO UPDATE SET "
+                    "bytes = bytes + excluded.bytes, entries = entries + excluded.entries",
+                    (segment, len(member), len(batch))
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            self._segment = segment
+            self._total_bytes += len(member)
+            self._total_entries += len(batch)
+            self.events_written += len(batch)
+            self.batches_written += 1
+            if self._total_bytes > self.retention_bytes:
+                self._enforce_retention(conn)
+
+    def _enforce_retention(self, conn: sqlite3.Connection) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-read in the transaction: another process may have deleted segments already
+            self._read_totals(conn)
+            deleted = []
+            # The segment being written is never deleted
+            for segment, size, entries in conn.execute(
+                "SELECT segment, bytes, entries FROM audit_segments WHERE segment < ? ORDER BY segment",
+                (self._segment,)
+            ).fetchall():
+                if self._total_bytes <= self.retention_bytes:
+                    break
+                conn.execute("DELETE FROM audit_index WHERE segment = ?", (segment,))
+                conn.execute("DELETE FROM audit_segments WHERE segment = ?", (segment,))
+                self._total_bytes -= size
+                self._total_entries -= entries
+                deleted.append((segment, size))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        # Older segments are never appended to again, so their files can go after the commit
+        for segment, size in deleted:
+            self._segment_path(segment).unlink(missing_ok=True)
+            self.segments_deleted += 1
+            logger.debug(f"Deleted audit segment {segment} ({size} bytes) for retention")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until events queued before this call are written.
+
+        Returns:
+            True if they were written within ``timeout`` seconds
+        """
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _read_member(self, segment: int, offset: int, length: int, needle: Optional[str] = None) -> List[Dict[str, Any]]:
+        try:
+            with open(self._segment_path(segment), "rb") as f:
+                f.seek(offset)
+                data = f.read(length)
+        except FileNotFoundError:
+            return []  # deleted for retention after the index was read
+        text = zlib.decompress(data, 16 + zlib.MAX_WBITS)  # one gzip member
+        if needle is None:
+            return [json.loads(line) for line in text.splitlines()]
+        # Only lines containing the serialized filter value are located and parsed
+        needle_bytes = needle.encode("utf-8")
+        entries = []
+        position = text.find(needle_bytes)
+        while position != -1:
+            start = text.rfind(b"\n", 0, position) + 1
+            end = text.find(b"\n", position)
+            entries.append(json.loads(text[start:end]))
+            position = text.find(needle_bytes, end)
+        return entries
+
+    def query(self, request_id: Optional[str] = None, operation: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get audit events, newest first.
+
+        Events still queued are flushed first, so the result includes
+        everything appended before the call.
+
+        Args:
+            request_id: Only events of this request
+            operation: Only events of this operation
+            limit: Maximum number of events
+
+        Returns:
+            Matching events sorted by timestamp, newest first
+        """
+        self.flush()
+        request_id, operation = _index_key(request_id), _index_key(operation)
+        conditions, params = [], []
+        if request_id:
+            conditions.append("request_id = ?")
+            params.append(request_id)
+        if operation:
+            conditions.append("operation = ?")
+            params.append(operation)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+
+        with self._lock:
+            members: List[Tuple[int, int, int]] = self._connection().execute(
+                f"SELECT DISTINCT segment, offset, length FROM audit_index {where}"
+                "ORDER BY segment DESC, offset DESC",
+                params
+            ).fetchall()
+
+        needle = json.dumps(request_id or operation) if conditions else None
+        logs = []
+        # Batches are read newest first until the limit is reached
+        for segment, offset, length in members:
+            for entry in reversed(self._read_member(segment, offset, length, needle)):
+                if request_id and entry.get("request_id") != request_id:
+                    continue
+                if operation and entry.get("operation") != operation:
+                    continue
+                logs.append(entry)
+            if limit and len(logs) >= limit:
+                break
+
+        logs.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+        return logs[:limit] if limit else logs
+
+    def clear(self) -> None:
+        """Delete all segments and index entries."""
+        self.flush()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._read_totals(conn)
+                conn.execute("DELETE FROM audit_index")
+                conn.execute("DELETE FROM audit_segments")
+                # Segment numbers keep increasing, so offsets read before the clear never
+                # point into new data
+                conn.execute("INSERT INTO audit_segments VALUES (?, 0, 0)", (self._segment + 1,))
+                # Unlinked before the commit, while no other process can append
+                for path in self.directory.glob("audit-*.jsonl.gz"):
+                    path.unlink(missing_ok=True)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._segment += 1
+            self._total_bytes = 0
+            self._total_entries = 0
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Write queued events and stop the writer thread."""
+        self._stopping = True
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join(timeout)
+            self._writer = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        logger.info("Audit log shut down")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get audit log statistics."""
+        with self._lock:
+            self._read_totals(self._connection())
+        return {
+            "queued": self._queue.qsize(),
+            "entries": self._total_entries,
+            "bytes": self._total_bytes,
+            "segment": self._segment,
+            "events_written": self.events_written,
+            "batches_written": self.batches_written,
+            "segments_deleted": self.segments_deleted,
+            "write_errors": self.write_errors
+        }
+
+
+def _create_audit_log() -> AuditLogSink:
+    try:
+        from app.config import config
+        return AuditLogSink(
+            config.audit_log_path,
+            segment_max_bytes=config.audit_segment_max_bytes,
+            retention_bytes=config.audit_retention_bytes,
+            batch_size=config.audit_batch_size,
+            flush_interval=config.audit_flush_interval_ms / 1000
+        )
+    except Exception:
+        # Fallback for testing
+        return AuditLogSink(Path("./storage/audit"))
+
+
+# Global audit log instance
+audit_log = _create_audit_log()
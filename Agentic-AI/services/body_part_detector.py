@@ -1,12 +1,10 @@
 """Body part detection service with real PyTorch YOLO models."""
 
-import base64
-import io
+import asyncio
 import logging
 import os
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
-from PIL import Image
 import numpy as np
 
 # Import PyTorch and YOLO dependencies
@@ -19,6 +17,12 @@ except ImportError:
     torch = None
     YOLO = None
 
+from services.inference_executor import InferenceQueueFullError
+from services.micro_batcher import micro_batcher
+from services.model_pool import model_pool
+from services.decoded_image import DecodedImage
+from services.detection_postprocess import DetectionPostprocessor
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,22 +32,22 @@ class BodyPartDetector:
     and determines the best match based on confidence scores.
     """
     
-    def ___init___(self):
+    def __init__(self):
         """Initialize the body part detector."""
+        # Mock models are only set when the shared model pool cannot be used
         self.hand_model = None
         self.leg_model = None
         self.initialized = False
-        self.models_path = Path("models")
         self.device = "cuda" if torch and torch.cuda.is_available() else "cpu"
-        
-        # Model file paths
-        self.hand_model_path = self.models_path / "hand_fracture_model.pt"
-        self.leg_model_path = self.models_path / "leg_fracture_model.pt"
+        self._postprocessors = {
+            model_type: DetectionPostprocessor(normalize_labels=False, fallback_label=f"{model_type}_detection")
+            for model_type in ("hand", "leg")
+        }
         
         logger.info(f"BodyPartDetector initialized with device: {self.device}")
         
     async def initialize(self):
-        """Initialize the detection models."""
+        """Make sure the shared hand and leg models are loaded."""
         try:
             logger.info("Initializing body part detection models...")
             
@@ -54,35 +58,13 @@ class BodyPartDetector:
                 self.initialized = True
                 return
             
-            # Check if models directory exists
-            if not self.models_path.exists():
-                logger.warning(f"Models directory {self.models_path} not found, creating it")
-                self.models_path.mkdir(parents=True, exist_ok=True)
-            
-            # Load hand fracture detection model
-            if self.hand_model_path.exists():
-                logger.info(f"Loading hand model from {self.hand_model_path}")
-                self.hand_model = YOLO(str(self.hand_model_path))
-                self.hand_model.to(self.device)
-                logger.info("Hand fracture model loaded successfully")
-            else:
-                logger.warning(f"Hand model not found at {self.hand_model_path}, using YOLOv8 base model")
-                self.hand_model = YOLO('yolov8n.pt')  # Use base YOLOv8 as fallback
-                self.hand_model.to(self.device)
-            
-            # Load leg fracture detection model
-            if self.leg_model_path.exists():
-                logger.info(f"Loading leg model from {self.leg_model_path}")
-                self.leg_model = YOLO(str(self.leg_model_path))
-                self.leg_model.to(self.device)
-                logger.info("Leg fracture model loaded successfully")
-            else:
-                logger.warning(f"Leg model not found at {self.leg_model_path}, using YOLOv8 base model")
-                self.leg_model = YOLO('yolov8n.pt')  # Use base YOLOv8 as fallback
-                self.leg_model.to(self.device)
+            # Hand and leg models are shared with the agents through the model pool
+            load_status = await model_pool.load(["hand", "leg"])
+            if not all(load_status.values()):
+                raise RuntimeError(f"Shared models failed to load: {load_status}")
             
             self.initialized = True
-            logger.info(f"Body part detection models initialized successfully on {self.device}")
+            logger.info("Body part detection using shared hand and leg models from the model pool")
             
         except Exception as e:
             logger.error(f"Failed to initialize body part detection models: {e}")
@@ -95,7 +77,7 @@ class BodyPartDetector:
     def _create_mock_model(self, model_type: str):
         """Create a mock model for testing when real models aren't available."""
         class MockModel:
-            def ___init___(self, model_type: str):
+            def __init__(self, model_type: str):
                 self.model_type = model_type
                 self.device = "cpu"
             
@@ -171,7 +153,7 @@ class BodyPartDetector:
                 return self
         
         class MockResult:
-            def ___init___(self, detections, model_type):
+            def __init__(self, detections, model_type):
                 self.boxes = MockBoxes(detections) if detections else None
                 self.names = {
                     0: f'{model_type}_fracture',
@@ -180,7 +162,7 @@ class BodyPartDetector:
                 }
             
         class MockBoxes:
-            def ___init___(self, detections):
+            def __init__(self, detections):
                 if torch and detections:
                     self.data = torch.tensor([[
                         det['bbox'][0], det['bbox'][1], det['bbox'][2], det['bbox'][3],
@@ -198,51 +180,37 @@ class BodyPartDetector:
         
         return MockModel(model_type)
     
-    def _decode_image(self, image_data: str) -> Image.Image:
+    def _decode_image(self, image_data: str) -> DecodedImage:
         """
-        Decode base64 image data to PIL Image.
+        Decode base64 image data once for feature analysis and both models.
         
         Args:
             image_data: Base64 encoded image data (with or without data URL prefix)
             
         Returns:
-            PIL Image object
+            DecodedImage with the shared RGB array
         """
         try:
-            # Remove data URL prefix if present
-            if image_data.startswith('data:'):
-                image_data = image_data.split(',')[1]
-            
-            # Decode base64
-            image_bytes = base64.b64decode(image_data)
-            
-            # Convert to PIL Image
-            image = Image.open(io.BytesIO(image_bytes))
-            
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-                
-            return image
+            return DecodedImage.from_base64(image_data)
             
         except Exception as e:
             logger.error(f"Failed to decode image data: {e}")
             raise ValueError(f"Invalid image data: {e}")
     
-    def _analyze_image_features(self, image: Image.Image) -> Dict[str, float]:
+    def _analyze_image_features(self, image: DecodedImage) -> Dict[str, float]:
         """
         Analyze image features to determine if it's more likely a hand or leg.
         Enhanced analysis with better fracture detection simulation.
         
         Args:
-            image: PIL Image object
+            image: Decoded image
             
         Returns:
             Dictionary with hand and leg confidence scores
         """
         try:
-            # Convert to numpy array for analysis
-            img_array = np.array(image)
+            # Shared read-only RGB array, no per-stage copy
+            img_array = image.array
             height, width = img_array.shape[:2]
             
             # Calculate aspect ratio
@@ -311,63 +279,45 @@ class BodyPartDetector:
             # Return default values if analysis fails
             return {'hand': 0.6, 'leg': 0.4}
     
-    def _run_model_detection(self, image: Image.Image, model, model_type: str) -> List[Dict[str, Any]]:
+    async def _run_model_detection(self, image: DecodedImage, model, model_type: str,
+                                   model_path: Optional[Path] = None) -> List[Dict[str, Any]]:
         """
         Run YOLO model detection on the image.
         
         Args:
-            image: PIL Image object
+            image: Decoded image
             model: YOLO model instance
             model_type: 'hand' or 'leg'
+            model_path: Weights path of the model (used by process-mode inference)
             
         Returns:
             List of detection results
         """
         try:
-            # Convert PIL image to numpy array
-            img_array = np.array(image)
+            # Reuse the decoded RGB array shared with the other model
+            img_array = image.array
             
-            # Run inference
-            results = model.predict(
+            # Run inference on the shared inference executor, batched with concurrent requests
+            results = await micro_batcher.predict(
+                model_type,
+                model,
                 img_array,
+                model_path=model_path,
                 conf=0.25,  # Confidence threshold
                 iou=0.45,   # IoU threshold for NMS
                 verbose=False
             )
             
-            detections = []
-            
-            if results and len(results) > 0:
-                result = results[0]  # Get first result
-                
-                # Extract detections
-                if hasattr(result, 'boxes') and result.boxes is not None:
-                    boxes = result.boxes
-                    
-                    # Process each detection
-                    for i in range(len(boxes.conf)):
-                        confidence = float(boxes.conf[i])
-                        class_id = int(boxes.cls[i])
-                        bbox = boxes.xyxy[i].tolist()  # [x1, y1, x2, y2]
-                        
-                        # Get class name
-                        class_name = result.names.get(class_id, f'{model_type}_detection')
-                        
-                        detection = {
-                            'label': class_name,
-                            'confidence': confidence,
-                            'bbox': bbox,
-                            'class_id': class_id,
-                            'model_type': model_type,
-                            'body_part': model_type
-                        }
-                        detections.append(detection)
-                        
-                        logger.debug(f"Detection: {class_name} with confidence {confidence:.3f}")
+            # Vectorized over all boxes; labels come from the model's names
+            detections = self._postprocessors[model_type].dicts(
+                results, model_type=model_type, body_part=model_type
+            )
             
             logger.info(f"{model_type} model found {len(detections)} detections")
             return detections
             
+        except InferenceQueueFullError:
+            raise
         except Exception as e:
             logger.error(f"Failed to run {model_type} model detection: {e}")
             return []
@@ -401,9 +351,18 @@ class BodyPartDetector:
             feature_analysis = self._analyze_image_features(image)
             logger.info(f"Feature analysis complete: {feature_analysis}")
             
-            # Run both models and get detections
-            hand_detections = self._run_model_detection(image, self.hand_model, 'hand')
-            leg_detections = self._run_model_detection(image, self.leg_model, 'leg')
+            # Run both models concurrently and get detections
+            if self.hand_model is not None and self.leg_model is not None:
+                hand_detections, leg_detections = await asyncio.gather(
+                    self._run_model_detection(image, self.hand_model, 'hand'),
+                    self._run_model_detection(image, self.leg_model, 'leg')
+                )
+            else:
+                async with model_pool.lease("hand") as hand_agent, model_pool.lease("leg") as leg_agent:
+                    hand_detections, leg_detections = await asyncio.gather(
+                        self._run_model_detection(image, hand_agent.model, 'hand', hand_agent.model_path),
+                        self._run_model_detection(image, leg_agent.model, 'leg', leg_agent.model_path)
+                    )
             
             # Determine the best body part based on detection confidence and image features
             hand_max_confidence = max([d['confidence'] for d in hand_detections], default=0.0)
@@ -0,0 +1,221 @@
+"""GCRA rate limiting of incoming requests per client, optionally shared by workers."""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from loguru import logger
+
+
+# Idle rows are swept at most this often (seconds); an idle row never limits anyone
+_PURGE_INTERVAL = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    tat REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rate_limits_tat ON rate_limits (tat);
+"""
+
+
+class RateLimitDecision(NamedTuple):
+    """Outcome of one rate limit check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # Seconds until the request would be allowed (0 if allowed)
+
+
+def gcra(tat: Optional[float], now: float, limit: int, window_seconds: float) -> Tuple[Optional[float], RateLimitDecision]:
+    """
+    Generic cell rate algorithm step for ``limit`` requests per ``window_seconds``.
+
+    A client's whole state is its theoretical arrival time (TAT): requests
+    are spaced ``window / limit`` apart, and a request is allowed while the
+    TAT it would leave is at most one window ahead of now. That admits a
+    burst of ``limit`` requests, then one per interval as the window drains.
+
+    Args:
+        tat: Stored TAT of the client (None if unknown)
+        now: Current time on the same clock as ``tat``
+        limit: Requests allowed per window
+        window_seconds: Window length
+
+    Returns:
+        Tuple of the TAT to store (None if the request is rejected) and the decision
+    """
+    interval = window_seconds / limit
+    new_tat = max(tat or now, now) + interval
+    allow_at = new_tat - window_seconds
+    if allow_at > now:
+        return None, RateLimitDecision(False, limit, 0, allow_at - now)
+    remaining = int((window_seconds - (new_tat - now)) / interval + 1e-9)
+    return new_tat, RateLimitDecision(True, limit, remaining, 0.0)
+
+
+class MemoryRateLimitStore:
+    """Per-process TATs, least recently used evicted beyond ``max_clients``.
+
+    A TAT in the past means the client has its full budget again, so such
+    entries are dropped from the LRU end as they are reached.
+    """
+
+    def __init__(self, max_clients: int = 10000):
+        """Initialize store with a bound on tracked clients."""
+        self.max_clients = max_clients
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def check(self, key: str, limit: int, window_seconds: float) -> RateLimitDecision:
+        """Check and, if allowed, count a request for ``key``."""
+        now = time.monotonic()
+        with self._lock:
+            new_tat, decision = gcra(self._tats.get(key), now, limit, window_seconds)
+            if new_tat is not None:
+                self._tats[key] = new_tat
+                self._tats.move_to_end(key)
+            # Idle clients at the LRU end carry no state worth keeping
+            while self._tats:
+                oldest_key, oldest_tat = next(iter(self._tats.items()))
+                if oldest_tat > now and len(self._tats) <= self.max_clients:
+                    break
+                del self._tats[oldest_key]
+                if oldest_tat > now:
+                    self.evictions += 1
+        return decision
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tats.clear()
+
+
+class SQLiteRateLimitStore:
+    """TATs in a SQLite table shared by every worker process.
+
+    Each check is one ``BEGIN IMMEDIATE`` transaction, so workers are
+    serialized on the row and enforce a single budget per client. TATs use
+    wall-clock time, which is common to all processes.
+    """
+
+    def __init__(self, db_path: Path):
+        """Initialize store; the database is opened on first use."""
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self.evictions = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            logger.debug(f"Rate limit store opened at {self.db_path}")
+        return self._conn
+
+    def check(self, key: str, limit: int, window_seconds: float) -> RateLimitDecision:
+        """Check and, if allowed, count a request for ``key``."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tat FROM rate_limits WHERE key = ?", (key,)).fetchone()
+                new_tat, decision = gcra(row[0] if row else None, now, limit, window_seconds)
+                if new_tat is not None:
+                    conn.execute("INSERT OR REPLACE INTO rate_limits VALUES (?, ?)", (key, new_tat))
+                if now - self._last_purge > _PURGE_INTERVAL:
+                    cursor = conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+                    self.evictions += cursor.rowcount
+                    self._last_purge = now
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return decision
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM rate_limits")
+
+
+class ClientRateLimiter:
+    """Per-client, per-endpoint request budgets with O(1) checks.
+
+    The memory backend bounds state with LRU eviction of idle clients; the
+    SQLite backend shares budgets across uvicorn workers.
+    """
+
+    def __init__(self, store: Any):
+        """Initialize limiter over a ``MemoryRateLimitStore`` or ``SQLiteRateLimitStore``."""
+        self.store = store
+        # SQLite checks can wait on other workers' transactions; async callers
+        # should run them off the event loop
+        self.blocking = isinstance(store, SQLiteRateLimitStore)
+        self.allowed = 0
+        self.rejected = 0
+
+    def check(self, client_id: str, endpoint: str, limit: int, window_seconds: float) -> RateLimitDecision:
+        """
+        Check a request of ``client_id`` against the endpoint's budget.
+
+        Args:
+            client_id: Client identifier (e.g. IP address)
+            endpoint: Endpoint type the budget applies to
+            limit: Requests allowed per window
+            window_seconds: Window length in seconds
+
+        Returns:
+            RateLimitDecision; rejected requests are not counted
+        """
+        decision = self.store.check(f"{endpoint}:{client_id}", limit, window_seconds)
+        if decision.allowed:
+            self.allowed += 1
+        else:
+            self.rejected += 1
+        return decision
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rate limiter statistics."""
+        return {
+            "backend": "sqlite" if isinstance(self.store, SQLiteRateLimitStore) else "memory",
+            "tracked_clients": len(self.store),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "evictions": self.store.evictions
+        }
+
+
+def _create_client_rate_limiter() -> ClientRateLimiter:
+    try:
+        from app.config import config
+        backend = config.rate_limit_backend
+        db_path = config.rate_limit_path
+        max_clients = config.rate_limit_max_clients
+    except Exception:
+        # Fallback for testing
+        backend = "memory"
+        db_path = Path("./storage/rate_limits.sqlite3")
+        max_clients = 10000
+
+    if backend == "sqlite":
+        return ClientRateLimiter(SQLiteRateLimitStore(db_path))
+    return ClientRateLimiter(MemoryRateLimitStore(max_clients=max_clients))
+
+
+# Global client rate limiter instance
+client_rate_limiter = _create_client_rate_limiter()
@@ -4,6 +4,7 @@ import os
 import base64
 import cloudinary
 import cloudinary.uploader
+import cloudinary.utils
 from typing import Optional, Dict, Any
 from loguru import logger
 from datetime import datetime
@@ -12,6 +13,16 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+UPLOAD_FOLDERS = {
+    "original": "OrthoImage/original",
+    "annotated": "OrthoImage/annotated"
+}
+
+UPLOAD_TAGS = {
+    "original": ["orthopedic", "original", "x-ray"],
+    "annotated": ["orthopedic", "annotated", "x-ray", "ai-analysis"]
+}
+
 class CloudinaryService:
     """Service for uploading images to Cloudinary."""
     
@@ -44,6 +55,63 @@ class CloudinaryService:
         else:
             logger.warning("CLOUDINARY_URL not found in environment variables")
     
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.cloudinary_url)
+    
+    @staticmethod
+    def build_public_id(request_id: str, kind: str) -> str:
+        """
+        Build the unique public ID (without folder) for an upload.
+        
+        Args:
+            request_id: Unique request identifier
+            kind: "original" or "annotated"
+            
+        Returns:
+            Public ID of the form {request_id}_{timestamp}_{kind}
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"{request_id}_{timestamp}_{kind}"
+    
+    def build_url(self, kind: str, public_id: str) -> str:
+        """Delivery URL of an image, known before its upload completes."""
+        url, _ = cloudinary.utils.cloudinary_url(f"{UPLOAD_FOLDERS[kind]}/{public_id}", secure=True)
+        return url
+    
+    def upload_image(self, image_data: bytes, kind: str, public_id: str) -> Dict[str, Any]:
+        """
+        Upload image bytes to the OrthoImage folder for ``kind``.
+        
+        Unlike the upload_*_image helpers this raises on failure, so callers
+        can decide whether to retry.
+        
+        Args:
+            image_data: Raw image bytes
+            kind: "original" or "annotated"
+            public_id: Public ID from build_public_id
+            
+        Returns:
+            Dict with upload result including URL
+        """
+        result = cloudinary.uploader.upload(
+            image_data,
+            folder=UPLOAD_FOLDERS[kind],
+            public_id=public_id,
+            resource_type="image",
+            overwrite=True,
+            tags=UPLOAD_TAGS[kind]
+        )
+        return {
+            "url": result.get("secure_url"),
+            "public_id": result.get("public_id"),
+            "version": result.get("version"),
+            "format": result.get("format"),
+            "width": result.get("width"),
+            "height": result.get("height"),
+            "bytes": result.get("bytes")
+        }
+    
     def upload_original_image(self, image_data: bytes, filename: str, request_id: str) -> Optional[Dict[str, Any]]:
         """
         Upload original image to Cloudinary in OrthoImage/original/ folder.
@@ -61,31 +129,10 @@ class CloudinaryService:
                 logger.error("Cloudinary not configured")
                 return None
             
-            # Generate unique filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_ext = filename.split('.')[-1] if '.' in filename else 'jpg'
-            unique_filename = f"{request_id}_{timestamp}_original.{file_ext}"
-            
-            # Upload to OrthoImage/original/ folder
-            result = cloudinary.uploader.upload(
-                image_data,
-                folder="OrthoImage/original",
-                public_id=unique_filename.replace(f'.{file_ext}', ''),
-                resource_type="image",
-                overwrite=True,
-                tags=["orthopedic", "original", "x-ray"]
-            )
+            result = self.upload_image(image_data, "original", self.build_public_id(request_id, "original"))
             
-            logger.info(f"Original image uploaded to Cloudinary: {result.get('secure_url')}")
-            return {
-                "url": result.get("secure_url"),
-                "public_id": result.get("public_id"),
-                "version": result.get("version"),
-                "format": result.get("format"),
-                "width": result.get("width"),
-                "height": result.get("height"),
-                "bytes": result.get("bytes")
-            }
+            logger.info(f"Original image uploaded to Cloudinary: {result.get('url')}")
+            return result
             
         except Exception as e:
             logger.error(f"Failed to upload original image to Cloudinary: {e}")
@@ -108,31 +155,10 @@ class CloudinaryService:
                 logger.error("Cloudinary not configured")
                 return None
             
-            # Generate unique filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_ext = filename.split('.')[-1] if '.' in filename else 'jpg'
-            unique_filename = f"{request_id}_{timestamp}_annotated.{file_ext}"
-            
-            # Upload to OrthoImage/annotated/ folder
-            result = cloudinary.uploader.upload(
-                image_data,
-                folder="OrthoImage/annotated",
-                public_id=unique_filename.replace(f'.{file_ext}', ''),
-                resource_type="image",
-                overwrite=True,
-                tags=["orthopedic", "annotated", "x-ray", "ai-analysis"]
-            )
+            result = self.upload_image(image_data, "annotated", self.build_public_id(request_id, "annotated"))
             
-            logger.info(f"Annotated image uploaded to Cloudinary: {result.get('secure_url')}")
-            return {
-                "url": result.get("secure_url"),
-                "public_id": result.get("public_id"),
-                "version": result.get("version"),
-                "format": result.get("format"),
-                "width": result.get("width"),
-                "height": result.get("height"),
-                "bytes": result.get("bytes")
-            }
+            logger.info(f"Annotated image uploaded to Cloudinary: {result.get('url')}")
+            return result
             
         except Exception as e:
             logger.error(f"Failed to upload annotated image to Cloudinary: {e}")
@@ -0,0 +1,155 @@
+"""Decode-once image container shared by every stage of an analysis request."""
+
+import base64
+import binascii
+import hashlib
+import io
+import time
+from typing import Optional, Tuple, Union
+import numpy as np
+from PIL import Image
+
+from services.error_handler import ErrorCode, ValidationError
+
+
+_CONTENT_TYPES = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "GIF": "image/gif",
+    "BMP": "image/bmp",
+    "TIFF": "image/tiff",
+    "WEBP": "image/webp"
+}
+
+
+class DecodedImage:
+    """An uploaded image decoded exactly once.
+
+    Holds the original encoded bytes (for storage, Cloudinary and PDF
+    embedding), the RGB pixel array (for routing heuristics, detection and
+    annotation) and basic metadata. The pixel array is read-only so stages can
+    share it safely; annotation draws on a copy via ``to_pil``.
+
+    For images we produced ourselves (e.g. annotated JPEGs) the array can be
+    omitted and is only decoded if something asks for it.
+    """
+
+    def __init__(self, raw_bytes: bytes, width: int, height: int, format: Optional[str] = None,
+                 mode: str = "RGB", array: Optional[np.ndarray] = None, decode_time_ms: float = 0.0):
+        self.raw_bytes = raw_bytes
+        self.width = width
+        self.height = height
+        self.format = format
+        self.mode = mode
+        self.decode_time_ms = decode_time_ms
+        self._array = array
+        self._base64: Optional[str] = None
+        self._pixel_sha256: Optional[str] = None
+
+        if self._array is not None:
+            self._array.flags.writeable = False
+
+    @classmethod
+    def from_bytes(cls, raw_bytes: bytes) -> "DecodedImage":
+        """Decode encoded image bytes into an RGB array."""
+        start_time = time.perf_counter()
+        try:
+            with Image.open(io.BytesIO(raw_bytes)) as image:
+                image_format = image.format
+                original_mode = image.mode
+                rgb = image if image.mode == "RGB" else image.convert("RGB")
+                array = np.asarray(rgb)
+        except Exception as e:
+            raise ValidationError(
+                f"Invalid image data: {e}",
+                ErrorCode.INVALID_IMAGE_FORMAT
+            )
+
+        height, width = array.shape[:2]
+        return cls(
+            raw_bytes=raw_bytes,
+            width=width,
+            height=height,
+            format=image_format,
+            mode=original_mode,
+            array=array,
+            decode_time_ms=round((time.perf_counter() - start_time) * 1000, 2)
+        )
+
+    @classmethod
+    def from_base64(cls, data: str) -> "DecodedImage":
+        """Decode a base64 string (optionally a ``data:`` URL) into an image."""
+        if data.startswith("data:"):
+            data = data.split(",", 1)[1]
+        try:
+            raw_bytes = base64.b64decode(data)
+        except (binascii.Error, ValueError) as e:
+            raise ValidationError(
+                f"Invalid base64 image data: {e}",
+                ErrorCode.INVALID_IMAGE_FORMAT
+            )
+        image = cls.from_bytes(raw_bytes)
+        # The caller already holds the encoded form, keep it for the response
+        image._base64 = data
+        return image
+
+    @classmethod
+    def coerce(cls, image: Union["DecodedImage", bytes]) -> "DecodedImage":
+        """Accept either a decoded image or raw bytes (legacy callers)."""
+        if isinstance(image, DecodedImage):
+            return image
+        return cls.from_bytes(image)
+
+    @property
+    def array(self) -> np.ndarray:
+        """Read-only RGB pixel array (H, W, 3)."""
+        if self._array is None:
+            decoded = DecodedImage.from_bytes(self.raw_bytes)
+            self._array = decoded._array
+            self.decode_time_ms = decoded.decode_time_ms
+        return self._array
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Image size as (width, height), matching PIL."""
+        return (self.width, self.height)
+
+    @property
+    def aspect_ratio(self) -> float:
+        return self.width / self.height
+
+    @property
+    def content_type(self) -> str:
+        return _CONTENT_TYPES.get(self.format or "", "image/jpeg")
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the encoded bytes and the decoded array."""
+        array_bytes = self._array.nbytes if self._array is not None else 0
+        return len(self.raw_bytes) + array_bytes
+
+    @property
+    def pixel_sha256(self) -> str:
+        """SHA-256 of the decoded pixels, independent of container format/metadata."""
+        if self._pixel_sha256 is None:
+            array = np.ascontiguousarray(self.array)
+            digest = hashlib.sha256(f"{array.shape}|{array.dtype}|".encode())
+            digest.update(memoryview(array).cast("B"))
+            self._pixel_sha256 = digest.hexdigest()
+        return self._pixel_sha256
+
+    def to_pil(self) -> Image.Image:
+        """Get a writable PIL copy of the pixels (e.g. for drawing annotations)."""
+        return Image.fromarray(self.array)
+
+    def to_base64(self) -> str:
+        """Base64 of the encoded bytes, computed at most once."""
+        if self._base64 is None:
+            self._base64 = base64.b64encode(self.raw_bytes).decode("utf-8")
+        return self._base64
+
+    def to_data_url(self) -> str:
+        return f"data:{self.content_type};base64,{self.to_base64()}"
+
+    def __repr__(self) -> str:
+        return f"DecodedImage({self.width}x{self.height}, format={self.format}, bytes={len(self.raw_bytes)})"
@@ -0,0 +1,160 @@
+"""Vectorized postprocessing of Ultralytics YOLO detection results."""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+def boxes_to_numpy(boxes) -> np.ndarray:
+    """
+    Copy a ``Boxes`` object to host memory in one transfer.
+
+    Args:
+        boxes: Ultralytics ``Boxes`` (``data`` rows are x1, y1, x2, y2,
+            [track_id,] conf, cls)
+
+    Returns:
+        (N, 6) array of x1, y1, x2, y2, conf, cls
+    """
+    data = boxes.data
+    if hasattr(data, "cpu"):
+        data = data.cpu().numpy()
+    data = np.asarray(data)
+    if data.ndim != 2:
+        # Empty boxes may come back as a flat (0,) array
+        return data.reshape(0, 6)
+    if data.shape[1] == 6:
+        return data
+    # Tracked results carry an extra track ID column before conf
+    return np.concatenate([data[:, :4], data[:, -2:]], axis=1)
+
+
+class DetectionPostprocessor:
+    """Turns a YOLO result into filtered, sorted detection arrays in one pass.
+
+    Box data is moved off the device once, low scores are dropped with a
+    NumPy mask and class IDs are mapped to labels through a lookup array
+    built once per model ``names`` mapping. Labels come from ``class_names``
+    first, then the model's own names, then ``fallback_label`` (formatted
+    with the class ID). With ``normalize_labels`` every label containing
+    "fracture" is reported as "fracture".
+    """
+
+    def __init__(
+        self,
+        class_names: Sequence[str] = (),
+        normalize_labels: bool = True,
+        fallback_label: str = "detection_{}"
+    ):
+        """Initialize postprocessor with label mapping rules."""
+        self.class_names = list(class_names)
+        self.normalize_labels = normalize_labels
+        self.fallback_label = fallback_label
+        self._label_tables: Dict[int, Tuple[Dict[int, str], np.ndarray]] = {}
+
+    def _label(self, class_id: int, names: Dict[int, str]) -> str:
+        if class_id < len(self.class_names):
+            label = self.class_names[class_id]
+        else:
+            label = names.get(class_id, self.fallback_label.format(class_id))
+        if self.normalize_labels and "fracture" in label:
+            return "fracture"
+        return label
+
+    def _label_table(self, names: Dict[int, str]) -> np.ndarray:
+        # A model's names dict is created once, so identity is a safe cache key
+        cached = self._label_tables.get(id(names))
+        if cached is not None and cached[0] is names:
+            return cached[1]
+        size = max([len(self.class_names), *(class_id + 1 for class_id in names)])
+        table = np.array([self._label(class_id, names) for class_id in range(size)], dtype=object)
+        self._label_tables[id(names)] = (names, table)
+        return table
+
+    def extract(
+        self,
+        model_results,
+        score_threshold: float = 0.0,
+        sort: bool = True
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Filter and label the detections of the first result.
+
+        Args:
+            model_results: List returned by ``model.predict``
+            score_threshold: Minimum confidence to keep
+            sort: Order by confidence, highest first (stable for ties)
+
+        Returns:
+            Dict of parallel arrays ``xyxy`` (N, 4), ``score``, ``class_id`` and
+            ``label``, or None if there are no detections
+        """
+        if not model_results:
+            return None
+        result = model_results[0]
+        boxes = getattr(result, "boxes", None)
+        if boxes is None:
+            return None
+
+        data = boxes_to_numpy(boxes)
+        if len(data) == 0:
+            return None
+        # float64 so the comparison matches float(conf) >= threshold exactly
+        scores = data[:, 4].astype(np.float64)
+        keep = scores >= score_threshold
+        order = np.flatnonzero(keep)
+        if sort:
+            order = order[np.argsort(-scores[order], kind="stable")]
+
+        class_ids = data[order, 5].astype(np.int64)
+        table = self._label_table(getattr(result, "names", None) or {})
+        labels = np.empty(len(order), dtype=object)
+        in_table = class_ids < len(table)
+        labels[in_table] = table[class_ids[in_table]]
+        for index in np.flatnonzero(~in_table):
+            labels[index] = self._label(int(class_ids[index]), result.names or {})
+
+        return {
+            "xyxy": data[order, :4],
+            "score": scores[order],
+            "class_id": class_ids,
+            "label": labels
+        }
+
+    def records(self, model_results, score_threshold: float = 0.0) -> List[Tuple[str, Tuple[int, int, int, int], float]]:
+        """
+        Detections as (label, (x, y, w, h), score) tuples, highest score first.
+
+        Coordinates are truncated to ints like ``int(x)`` on each value.
+        """
+        arrays = self.extract(model_results, score_threshold)
+        if arrays is None:
+            return []
+        # Width/height are computed in the model's dtype, as in per-box code
+        xyxy = arrays["xyxy"]
+        xywh = np.concatenate([xyxy[:, :2], xyxy[:, 2:] - xyxy[:, :2]], axis=1)
+        xywh = np.trunc(xywh).astype(np.int64)
+        return list(zip(arrays["label"].tolist(), map(tuple, xywh.tolist()), arrays["score"].tolist()))
+
+    def dicts(self, model_results, **fields: Any) -> List[Dict[str, Any]]:
+        """
+        Unfiltered detections as dicts with label, confidence, xyxy bbox and class_id.
+
+        Args:
+            model_results: List returned by ``model.predict``
+            **fields: Constant fields added to every dict
+
+        Returns:
+            Detections in model output order
+        """
+        arrays = self.extract(model_results, sort=False)
+        if arrays is None:
+            return []
+        return [
+            {"label": label, "confidence": score, "bbox": bbox, "class_id": class_id, **fields}
+            for label, score, bbox, class_id in zip(
+                arrays["label"].tolist(),
+                arrays["score"].tolist(),
+                arrays["xyxy"].tolist(),
+                arrays["class_id"].tolist()
+            )
+        ]
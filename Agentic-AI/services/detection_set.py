@@ -0,0 +1,184 @@
+"""Compact column-wise container for detection results."""
+
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+
+class DetectionSet:
+    """Detections stored column-wise instead of as one dict per box.
+
+    Labels are interned into ``vocabulary`` and stored as indices
+    (``label_ids``), next to parallel ``scores`` and (x, y, w, h) ``boxes``
+    lists. Label checks such as severity patterns are evaluated once per
+    distinct label and looked up through ``label_ids``, so consumers scale
+    with the number of label types rather than the number of boxes.
+    ``to_dicts`` gives the stable API/JSON view, identical to
+    ``Detection.to_dict``.
+
+    The columns are plain lists: a single X-ray has a handful of detections,
+    where NumPy's per-call overhead outweighs any vectorized work. Bulk
+    paths (``TriageAgent.triage_batch``) build arrays from the columns of
+    many sets at once. Columns are shared, not copied; do not modify them.
+    """
+
+    __slots__ = ("vocabulary", "label_ids", "scores", "boxes")
+
+    def __init__(self, vocabulary: List[str], label_ids: List[int], scores: List[float], boxes: List[Sequence[int]]):
+        """Initialize from already built columns."""
+        self.vocabulary = vocabulary
+        self.label_ids = label_ids
+        self.scores = scores
+        self.boxes = boxes
+
+    @classmethod
+    def empty(cls) -> "DetectionSet":
+        return cls([], [], [], [])
+
+    @classmethod
+    def from_columns(cls, labels: Sequence[str], boxes: Sequence[Sequence[int]], scores: Sequence[float]) -> "DetectionSet":
+        """
+        Build from parallel label, (x, y, w, h) box and score sequences.
+
+        Args:
+            labels: Label per detection
+            boxes: Box per detection
+            scores: Confidence per detection
+
+        Returns:
+            DetectionSet in the same order
+        """
+        # Intern labels in order of first appearance
+        index: Dict[str, int] = {}
+        label_ids = [index.setdefault(label, len(index)) for label in labels]
+        return cls(list(index), label_ids, [float(score) for score in scores], list(boxes))
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, Sequence[int], float]]) -> "DetectionSet":
+        """Build from (label, (x, y, w, h), score) tuples, e.g. ``DetectionPostprocessor.records``."""
+        records = list(records)
+        if not records:
+            return cls.empty()
+        labels, boxes, scores = zip(*records)
+        return cls.from_columns(labels, boxes, scores)
+
+    @classmethod
+    def from_dicts(cls, detections: Iterable[Dict[str, Any]]) -> "DetectionSet":
+        """Build from detection dicts (``label``/``bbox``/``score``, or ``class``/``confidence``)."""
+        labels, boxes, scores = [], [], []
+        for detection in detections:
+            label = detection.get("label")
+            labels.append(label if label is not None else detection.get("class", "unknown"))
+            score = detection.get("score")
+            scores.append(score if score is not None else detection.get("confidence", 0.0))
+            bbox = detection.get("bbox")
+            boxes.append(bbox[:4] if bbox else (0, 0, 0, 0))
+        return cls.from_columns(labels, boxes, scores)
+
+    @classmethod
+    def coerce(cls, detections: Any) -> "DetectionSet":
+        """
+        Return ``detections`` as a DetectionSet.
+
+        Accepts a DetectionSet (returned as is), None, a list of detection
+        dicts or a list of ``Detection`` objects.
+        """
+        if isinstance(detections, DetectionSet):
+            return detections
+        if not detections:
+            return cls.empty()
+        if isinstance(detections[0], dict):
+            return cls.from_dicts(detections)
+        return cls.from_records((d.label, d.bbox, d.score) for d in detections)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __bool__(self) -> bool:
+        return bool(self.scores)
+
+    @property
+    def labels(self) -> List[str]:
+        """Label of every detection, in order."""
+        vocabulary = self.vocabulary
+        return [vocabulary[label_id] for label_id in self.label_ids]
+
+    def score_stats(self) -> Tuple[float, float, float]:
+        """Min, max and sum of the scores (zeros if empty)."""
+        scores = self.scores
+        if not scores:
+            return 0.0, 0.0, 0.0
+        return min(scores), max(scores), sum(scores)
+
+    def count_scores_above(self, threshold: float) -> int:
+        """Number of detections whose score exceeds ``threshold``."""
+        return len([score for score in self.scores if score > threshold])
+
+    def label_values(self, func: Callable[[str], Any]) -> List[Any]:
+        """
+        Apply ``func`` once per distinct label and broadcast it to every detection.
+
+        Args:
+            func: Function of a label
+
+        Returns:
+            Per-detection list of ``func(label)``
+        """
+        per_label = [func(label) for label in self.vocabulary]
+        return [per_label[label_id] for label_id in self.label_ids]
+
+    def count_labels(self, predicate: Callable[[str], bool]) -> int:
+        """Number of detections whose label satisfies ``predicate`` (evaluated once per distinct label)."""
+        matches = [predicate(label) for label in self.vocabulary]
+        return len([label_id for label_id in self.label_ids if matches[label_id]])
+
+    def max_weighted_score(self, func: Callable[[str], float], score_weight: float, label_weight: float) -> float:
+        """Highest ``score * score_weight + func(label) * label_weight`` over the detections."""
+        per_label = [func(label) for label in self.vocabulary]
+        return max([
+            score * score_weight + per_label[label_id] * label_weight
+            for label_id, score in zip(self.label_ids, self.scores)
+        ])
+
+    def best_index(self) -> int:
+        """Index of the highest score (first one on ties)."""
+        scores = self.scores
+        return scores.index(max(scores))
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """Dict view of one detection."""
+        return {
+            "label": self.vocabulary[self.label_ids[index]],
+            "bbox": list(self.boxes[index]),
+            "score": self.scores[index]
+        }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Stable API/JSON view: one {label, bbox, score} dict per detection."""
+        return [
+            {"label": label, "bbox": list(bbox), "score": round(score, 3)}
+            for label, bbox, score in zip(self.labels, self.boxes, self.scores)
+        ]
+
+    def label_groups(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-label count, first score and mean score, in order of first appearance.
+
+        Returns:
+            Dict of label -> {count, first_score, mean_score}
+        """
+        vocabulary = self.vocabulary
+        groups: Dict[str, Dict[str, Any]] = {}
+        for label_id, score in zip(self.label_ids, self.scores):
+            group = groups.get(vocabulary[label_id])
+            if group is None:
+                # mean_score holds the running sum until all scores are added
+                groups[vocabulary[label_id]] = {"count": 1, "first_score": score, "mean_score": score}
+            else:
+                group["count"] += 1
+                group["mean_score"] += score
+        for group in groups.values():
+            if group["count"] > 1:
+                group["mean_score"] /= group["count"]
+        return groups
+
+    def __repr__(self) -> str:
+        return f"DetectionSet({len(self)} detections, {len(self.vocabulary)} labels)"
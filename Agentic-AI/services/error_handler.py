@@ -73,6 +73,15 @@ class ValidationError(OrthopedicError):
         super().__init__(message, error_code, details, http_status=400)
 
 
+class RateLimitError(ValidationError):
+    """Request rejected by rate limiting (HTTP 429)."""
+    
+    def __init__(self, message: str, retry_after: float, details: Optional[Dict[str, Any]] = None):
+        super().__init__(message, ErrorCode.RATE_LIMIT_EXCEEDED, details)
+        self.http_status = 429
+        self.retry_after = retry_after
+
+
 class AuthorizationError(OrthopedicError):
     """Authorization related errors."""
     
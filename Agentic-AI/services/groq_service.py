@@ -2,18 +2,21 @@
 
 import asyncio
 import time
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 from loguru import logger
 
 try:
-    from groq import Groq
+    import httpx
+    from groq import AsyncGroq
     GROQ_AVAILABLE = True
 except ImportError:
     GROQ_AVAILABLE = False
-    Groq = None
+    AsyncGroq = None
 
 from app.config import config
 from services.prompt_templates import MedicalPromptTemplates
+from services.rate_limiter import LLMRateLimiter
+from services.llm_cache import LLMResponseCache
 
 
 class GroqService:
@@ -41,9 +44,20 @@ class GroqService:
         self.timeout = 45.0  # Increased timeout for complex medical reasoning
         self.max_retries = 3  # Configurable retry attempts
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # Minimum seconds between requests
+        # Rate limiting: N in-flight calls within the account's RPM/TPM budgets
+        self.rate_limiter = LLMRateLimiter(
+            requests_per_minute=config.groq_requests_per_minute,
+            tokens_per_minute=config.groq_tokens_per_minute,
+            max_concurrency=config.groq_max_concurrency,
+            name="groq"
+        )
+        
+        # Template prompts repeat for common cases; identical requests skip the API
+        self.response_cache = LLMResponseCache(
+            max_entries=config.llm_cache_max_entries,
+            ttl_seconds=config.llm_cache_ttl_seconds,
+            enabled=config.llm_cache_enabled
+        )
         
         logger.info("GroqService initialized with enhanced medical configuration")
     
@@ -59,7 +73,16 @@ class GroqService:
             self.use_mock = True
         else:
             try:
-                self.client = Groq(api_key=self.api_key)
+                # Pooled keep-alive connections sized to the concurrency limit;
+                # retries are handled in _make_api_call
+                http_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=config.groq_max_concurrency,
+                        max_keepalive_connections=config.groq_max_concurrency
+                    ),
+                    timeout=self.timeout
+                )
+                self.client = AsyncGroq(api_key=self.api_key, http_client=http_client, max_retries=0)
                 self.use_mock = False
                 logger.info("Groq client initialized successfully")
             except Exception as e:
@@ -277,7 +300,8 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
         detections: List[Dict[str, Any]],
         symptoms: Optional[str] = None,
         body_part: Optional[str] = None,
-        image_quality: Optional[str] = None
+        image_quality: Optional[str] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Generate triage assessment using Groq API with enhanced medical prompting.
@@ -287,6 +311,7 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
             symptoms: Optional patient-reported symptoms (will be redacted for PHI)
             body_part: Detected body part (hand/leg)
             image_quality: Assessment of image quality
+            use_cache: Reuse a cached completion for an identical prompt
             
         Returns:
             Dict with triage level, rationale, confidence, and medical disclaimers
@@ -309,22 +334,27 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
             )
             
             # Make API call with retry logic
+            system_prompt = MedicalPromptTemplates.get_triage_system_prompt()
             response = await self._make_api_call(
-                system_prompt=MedicalPromptTemplates.get_triage_system_prompt(),
+                system_prompt=system_prompt,
                 user_prompt=user_prompt,
                 model=self.triage_model,
-                request_id=request_id
+                request_id=request_id,
+                use_cache=use_cache
             )
             
             # Parse and validate response
             result = self._parse_triage_response(response)
+            if result.get("parse_error"):
+                self.response_cache.discard(self._response_cache_key(system_prompt, user_prompt, self.triage_model))
             
             # Add metadata
             result.update({
                 "inference_time_ms": round((time.time() - start_time) * 1000, 2),
                 "request_id": request_id,
                 "model_used": self.triage_model,
-                "phi_redacted": bool(symptoms)  # Indicate if PHI redaction was applied
+                "phi_redacted": bool(symptoms),  # Indicate if PHI redaction was applied
+                "cache_hit": bool(getattr(response, "cached", False))
             })
             
             logger.info(f"Triage assessment {request_id} completed: {result['level']} (confidence: {result.get('confidence', 0):.2f})")
@@ -353,7 +383,8 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
         system_prompt: str, 
         user_prompt: str, 
         model: Optional[str] = None,
-        request_id: Optional[str] = None
+        request_id: Optional[str] = None,
+        use_cache: bool = True
     ) -> Any:
         """
         Make API call to Groq with enhanced retry logic and rate limiting.
@@ -363,18 +394,24 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
             user_prompt: User prompt content
             model: Model to use (defaults to triage model)
             request_id: Optional request ID for logging
+            use_cache: Serve/store identical requests from the response cache
             
         Returns:
-            API response object
+            API response object (``cached=True`` attribute on cache hits)
         """
+        model = model or self.triage_model
+        
+        cache_key = self._response_cache_key(system_prompt, user_prompt, model) if use_cache else None
+        if cache_key:
+            cached_content = self.response_cache.get(cache_key)
+            if cached_content is not None:
+                logger.debug(f"LLM response cache hit for {request_id or 'unknown'}")
+                return self.response_cache.as_completion(cached_content)
+        
         # Initialize client if not already done
         if not self.is_initialized:
             self._initialize_client()
         
-        # Rate limiting
-        await self._enforce_rate_limit()
-        
-        model = model or self.triage_model
         messages = [
             {
                 "role": "system",
@@ -395,17 +432,20 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
                     logger.debug(f"Making Groq API call with model {current_model} (attempt {attempt + 1}/{self.max_retries + 1}) for {request_id or 'unknown'}")
                     
                     if not self.use_mock and GROQ_AVAILABLE and self.client is not None and hasattr(self.client, 'chat') and hasattr(self.client.chat, 'completions'):
-                        response = self.client.chat.completions.create(
-                            model=current_model,
-                            messages=messages,
-                            temperature=self.temperature,
-                            max_tokens=self.max_tokens,
-                            timeout=self.timeout,
-                            # Additional safety parameters
-                            top_p=0.9,  # Nucleus sampling for consistency
-                            frequency_penalty=0.1,  # Slight penalty for repetition
-                            presence_penalty=0.1   # Encourage diverse vocabulary
-                        )
+                        async with self.rate_limiter.acquire(self._estimate_tokens(messages)) as reservation:
+                            response = await self.client.chat.completions.create(
+                                model=current_model,
+                                messages=messages,
+                                temperature=self.temperature,
+                                max_tokens=self.max_tokens,
+                                timeout=self.timeout,
+                                # Additional safety parameters
+                                top_p=0.9,  # Nucleus sampling for consistency
+                                frequency_penalty=0.1,  # Slight penalty for repetition
+                                presence_penalty=0.1   # Encourage diverse vocabulary
+                            )
+                            usage = getattr(response, "usage", None)
+                            reservation.record_usage(getattr(usage, "total_tokens", None))
                     else:
                         # Use mock client - ensure it has the right structure
                         if hasattr(self.client, 'chat') and hasattr(self.client.chat, 'create'):
@@ -427,6 +467,8 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
                             )
                     
                     logger.debug(f"Groq API call successful with model {current_model} for {request_id or 'unknown'}")
+                    if cache_key and getattr(response, "choices", None):
+                        self.response_cache.put(cache_key, response.choices[0].message.content)
                     return response
                     
                 except Exception as e:
@@ -466,16 +508,117 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
                             )
                             raise
     
-    async def _enforce_rate_limit(self) -> None:
-        """Enforce rate limiting between API calls."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+    async def stream_api_call(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: Optional[str] = None,
+        request_id: Optional[str] = None,
+        use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Stream completion text from Groq as it is generated.
         
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            await asyncio.sleep(sleep_time)
+        If the stream cannot be opened, falls back to ``_make_api_call`` (with
+        its retries and model fallbacks) and yields the full completion at once.
+        Cached completions are also yielded at once.
         
-        self.last_request_time = time.time()
+        Args:
+            system_prompt: System prompt for the model
+            user_prompt: User prompt content
+            model: Model to use (defaults to triage model)
+            request_id: Optional request ID for logging
+            use_cache: Serve/store identical requests from the response cache
+            
+        Yields:
+            Text deltas in generation order
+        """
+        model = model or self.triage_model
+        
+        cache_key = self._response_cache_key(system_prompt, user_prompt, model) if use_cache else None
+        if cache_key:
+            cached_content = self.response_cache.get(cache_key)
+            if cached_content is not None:
+                logger.debug(f"LLM response cache hit for {request_id or 'unknown'}")
+                yield cached_content
+                return
+        
+        if not self.is_initialized:
+            self._initialize_client()
+        
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        
+        if self.use_mock or not GROQ_AVAILABLE or not hasattr(getattr(self.client, 'chat', None), 'completions'):
+            # Mock client has no streaming; replay its response word by word
+            import re
+            response = await self._make_api_call(system_prompt, user_prompt, model, request_id, use_cache=use_cache)
+            for piece in re.findall(r"\S+\s*", response.choices[0].message.content or ""):
+                yield piece
+            return
+        
+        open_error = None
+        async with self.rate_limiter.acquire(self._estimate_tokens(messages)) as reservation:
+            try:
+                stream = await self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                    timeout=self.timeout,
+                    top_p=0.9,
+                    frequency_penalty=0.1,
+                    presence_penalty=0.1,
+                    stream=True
+                )
+            except Exception as e:
+                stream = None
+                open_error = e
+            
+            if stream is not None:
+                logger.debug(f"Groq stream opened with model {model} for {request_id or 'unknown'}")
+                chunks = []
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        chunks.append(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+                    # Groq reports usage on the final chunk
+                    usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+                    if usage is not None:
+                        reservation.record_usage(getattr(usage, "total_tokens", None))
+                if cache_key:
+                    self.response_cache.put(cache_key, "".join(chunks))
+                return
+        
+        logger.warning(f"Groq stream failed for {request_id or 'unknown'}: {open_error}; using blocking call")
+        response = await self._make_api_call(system_prompt, user_prompt, model, request_id, use_cache=use_cache)
+        yield response.choices[0].message.content or ""
+    
+    def _response_cache_key(self, system_prompt: str, user_prompt: str, model: str) -> str:
+        return self.response_cache.make_key(system_prompt, user_prompt, model, self.temperature, self.max_tokens)
+    
+    def _estimate_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """Estimate tokens to reserve: prompt (~4 chars per token) plus max completion."""
+        prompt_chars = sum(len(message.get("content", "")) for message in messages)
+        return prompt_chars // 4 + self.max_tokens
+    
+    async def close(self) -> None:
+        """Close pooled HTTP connections."""
+        if not self.use_mock and self.client is not None and hasattr(self.client, "close"):
+            await self.client.close()
+        self.client = None
+        self.is_initialized = False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get client, rate limiter and response cache statistics."""
+        return {
+            "initialized": self.is_initialized,
+            "use_mock": self.use_mock,
+            "rate_limiter": self.rate_limiter.get_stats(),
+            "response_cache": self.response_cache.get_stats()
+        }
     
     def _parse_triage_response(self, response: Any) -> Dict[str, Any]:
         """Parse and validate triage response from Groq with enhanced validation."""
@@ -592,7 +735,8 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
         triage_result: Dict[str, Any],
         detections: List[Dict[str, Any]],
         symptoms: Optional[str] = None,
-        body_part: Optional[str] = None
+        body_part: Optional[str] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Generate patient-friendly diagnosis summary with enhanced medical communication.
@@ -602,6 +746,7 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
             detections: Detection results
             symptoms: Patient symptoms (will be redacted for PHI)
             body_part: Detected body part for context
+            use_cache: Reuse a cached completion for an identical prompt
             
         Returns:
             Dict with comprehensive patient-friendly summary and guidance
@@ -624,31 +769,23 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
             )
             
             # Use more capable model for patient communication
+            system_prompt = MedicalPromptTemplates.get_diagnosis_system_prompt()
             response = await self._make_api_call(
-                system_prompt=MedicalPromptTemplates.get_diagnosis_system_prompt(),
+                system_prompt=system_prompt,
                 user_prompt=user_prompt,
                 model=self.diagnosis_model,
-                request_id=request_id
+                request_id=request_id,
+                use_cache=use_cache
             )
             
             # Parse and validate response
-            urgency_level = triage_result.get("level", "AMBER")
-            result = self._parse_diagnosis_response(response)
-
-            # If parsing failed or summary is missing/generic, provide urgency-specific fallback
-            summary_text = result.get("summary", "") if isinstance(result, dict) else ""
-            if result.get("parse_error") or not summary_text or "technical issue" in summary_text.lower():
-                fallback = self._generate_fallback_summary(urgency_level, detections)
-                result = {**fallback, "fallback_used": True, "reason": "diagnosis_parse_failed"}
-            
-            # Add metadata
-            result.update({
-                "inference_time_ms": round((time.time() - start_time) * 1000, 2),
-                "request_id": request_id,
-                "model_used": self.diagnosis_model,
-                "phi_redacted": bool(symptoms),
-                "urgency_level": urgency_level
-            })
+            parsed = self._parse_diagnosis_response(response)
+            if parsed.get("parse_error"):
+                self.response_cache.discard(self._response_cache_key(system_prompt, user_prompt, self.diagnosis_model))
+            result = self._finalize_diagnosis_result(
+                parsed, triage_result, detections, symptoms, start_time, request_id
+            )
+            result["cache_hit"] = bool(getattr(response, "cached", False))
             
             logger.info(f"Diagnosis summary {request_id} completed successfully")
             
@@ -656,18 +793,122 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
             
         except Exception as e:
             logger.error(f"Diagnosis summary generation {request_id} failed: {e}")
+            return self._diagnosis_error_result(e, triage_result, detections, start_time, request_id)
+    
+    async def stream_diagnosis_summary(
+        self,
+        triage_result: Dict[str, Any],
+        detections: List[Dict[str, Any]],
+        symptoms: Optional[str] = None,
+        body_part: Optional[str] = None,
+        use_cache: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a diagnosis summary while the model generates it.
+        
+        Yields ``{"type": "token", "content": str}`` events as text arrives,
+        then one ``{"type": "result", "data": dict}`` event with the same
+        parsed and validated result ``generate_diagnosis_summary`` returns.
+        
+        Args:
+            triage_result: Result from triage assessment
+            detections: Detection results
+            symptoms: Patient symptoms (will be redacted for PHI)
+            body_part: Detected body part for context
+            use_cache: Reuse a cached completion for an identical prompt
+        """
+        start_time = time.time()
+        request_id = f"diagnosis_{int(time.time() * 1000)}"
+        first_token_ms = None
+        chunks = []
+        
+        try:
+            logger.info(f"Starting streamed diagnosis summary {request_id}")
             
-            # Generate safe fallback based on triage level
-            urgency_level = triage_result.get("level", "AMBER")
-            fallback_summary = self._generate_fallback_summary(urgency_level, detections)
+            user_prompt = MedicalPromptTemplates.build_diagnosis_prompt(
+                triage_result=triage_result,
+                detections=detections,
+                symptoms=symptoms,
+                body_part=body_part
+            )
             
-            return {
-                **fallback_summary,
-                "error": str(e),
-                "inference_time_ms": round((time.time() - start_time) * 1000, 2),
-                "request_id": request_id,
-                "fallback_used": True
-            }
+            system_prompt = MedicalPromptTemplates.get_diagnosis_system_prompt()
+            async for delta in self.stream_api_call(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                model=self.diagnosis_model,
+                request_id=request_id,
+                use_cache=use_cache
+            ):
+                if first_token_ms is None:
+                    first_token_ms = round((time.time() - start_time) * 1000, 2)
+                chunks.append(delta)
+                yield {"type": "token", "content": delta}
+            
+            # Parse and validate the complete text exactly like the blocking path
+            parsed = self._parse_diagnosis_content("".join(chunks))
+            if parsed.get("parse_error"):
+                self.response_cache.discard(self._response_cache_key(system_prompt, user_prompt, self.diagnosis_model))
+            result = self._finalize_diagnosis_result(
+                parsed, triage_result, detections, symptoms, start_time, request_id
+            )
+            result["first_token_ms"] = first_token_ms
+            
+            logger.info(f"Streamed diagnosis summary {request_id} completed (first token {first_token_ms}ms)")
+            
+        except Exception as e:
+            logger.error(f"Streamed diagnosis summary {request_id} failed: {e}")
+            result = self._diagnosis_error_result(e, triage_result, detections, start_time, request_id)
+        
+        yield {"type": "result", "data": result}
+    
+    def _finalize_diagnosis_result(
+        self,
+        result: Dict[str, Any],
+        triage_result: Dict[str, Any],
+        detections: List[Dict[str, Any]],
+        symptoms: Optional[str],
+        start_time: float,
+        request_id: str
+    ) -> Dict[str, Any]:
+        """Apply urgency-specific fallback and metadata to a parsed diagnosis."""
+        urgency_level = triage_result.get("level", "AMBER")
+        
+        # If parsing failed or summary is missing/generic, provide urgency-specific fallback
+        summary_text = result.get("summary", "") if isinstance(result, dict) else ""
+        if result.get("parse_error") or not summary_text or "technical issue" in summary_text.lower():
+            fallback = self._generate_fallback_summary(urgency_level, detections)
+            result = {**fallback, "fallback_used": True, "reason": "diagnosis_parse_failed"}
+        
+        # Add metadata
+        result.update({
+            "inference_time_ms": round((time.time() - start_time) * 1000, 2),
+            "request_id": request_id,
+            "model_used": self.diagnosis_model,
+            "phi_redacted": bool(symptoms),
+            "urgency_level": urgency_level
+        })
+        return result
+    
+    def _diagnosis_error_result(
+        self,
+        error: Exception,
+        triage_result: Dict[str, Any],
+        detections: List[Dict[str, Any]],
+        start_time: float,
+        request_id: str
+    ) -> Dict[str, Any]:
+        """Generate safe fallback based on triage level."""
+        urgency_level = triage_result.get("level", "AMBER")
+        fallback_summary = self._generate_fallback_summary(urgency_level, detections)
+        
+        return {
+            **fallback_summary,
+            "error": str(error),
+            "inference_time_ms": round((time.time() - start_time) * 1000, 2),
+            "request_id": request_id,
+            "fallback_used": True
+        }
     
     def _generate_fallback_summary(self, urgency_level: str, detections: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate safe fallback summary when API calls fail."""
@@ -721,11 +962,17 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
     
     def _parse_diagnosis_response(self, response: Any) -> Dict[str, Any]:
         """Parse and validate diagnosis response from Groq with enhanced field validation."""
+        # Extract content from response
+        if hasattr(response, 'choices') and response.choices:
+            content = response.choices[0].message.content
+        else:
+            content = None
+        return self._parse_diagnosis_content(content)
+    
+    def _parse_diagnosis_content(self, content: Optional[str]) -> Dict[str, Any]:
+        """Parse and validate diagnosis JSON text (complete or streamed)."""
         try:
-            # Extract content from response
-            if hasattr(response, 'choices') and response.choices:
-                content = response.choices[0].message.content
-            else:
+            if not content:
                 raise ValueError("Invalid response format from Groq API")
             
             # Parse JSON content with multiple fallback strategies
@@ -766,7 +1013,7 @@ Recommend orthopedic specialist evaluation for comprehensive treatment planning
             
         except Exception as e:
             logger.error(f"Failed to parse diagnosis response: {e}")
-            logger.debug(f"Raw response content: {getattr(response, 'choices', [{}])[0].message.content if hasattr(response, 'choices') else 'No content'}")
+            logger.debug(f"Raw response content: {content or 'No content'}")
             
             # Return safe fallback
             return {
@@ -0,0 +1,199 @@
+"""Inference executor that keeps blocking model calls off the event loop."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+from loguru import logger
+
+from services.error_handler import ErrorCode, OrthopedicError
+from services.telemetry import telemetry_service
+
+
+# Per-process model cache used by worker processes in "process" mode
+_worker_models: Dict[str, Any] = {}
+
+
+def _process_predict(model_path: str, image: Any, predict_kwargs: Dict[str, Any]) -> Any:
+    """Run YOLO prediction inside a worker process.
+
+    Models cannot be shipped across process boundaries cheaply, so each worker
+    loads the weights from ``model_path`` once and keeps them for later calls.
+    Results are moved to CPU so they can be pickled back to the parent.
+    """
+    model = _worker_models.get(model_path)
+    if model is None:
+        from ultralytics import YOLO
+        model = YOLO(model_path)
+        _worker_models[model_path] = model
+    results = model.predict(image, **predict_kwargs)
+    return [result.cpu() for result in results]
+
+
+class InferenceQueueFullError(OrthopedicError):
+    """Raised when the inference queue is at capacity."""
+
+    def __init__(self, model_key: str, queue_depth: int):
+        super().__init__(
+            "Inference queue is full, please retry shortly",
+            ErrorCode.SERVICE_UNAVAILABLE,
+            details={"model_key": model_key, "queue_depth": queue_depth},
+            http_status=503
+        )
+
+
+class InferenceExecutor:
+    """Dedicated executor for model inference with bounded queueing.
+
+    Every model call is submitted with a ``model_key`` (e.g. ``"hand"``). Calls
+    for the same key are limited to ``per_model_concurrency`` in-flight
+    executions, and the total number of queued plus running calls is capped at
+    ``max_queue_depth``; beyond that new calls fail fast instead of piling up.
+    """
+
+    def __init__(self, mode: Optional[str] = None, max_workers: Optional[int] = None,
+                 max_queue_depth: Optional[int] = None,
+                 per_model_concurrency: Optional[int] = None):
+        """Initialize executor from arguments or application config."""
+        try:
+            from app.config import config
+            self.mode = mode or config.inference_executor_mode
+            self.max_workers = max_workers or config.inference_max_workers
+            self.max_queue_depth = max_queue_depth or config.inference_max_queue_depth
+            self.per_model_concurrency = per_model_concurrency or config.inference_per_model_concurrency
+        except Exception:
+            # Fallback for testing
+            self.mode = mode or "thread"
+            self.max_workers = max_workers or 2
+            self.max_queue_depth = max_queue_depth or 32
+            self.per_model_concurrency = per_model_concurrency or 1
+
+        if self.mode not in ("thread", "process"):
+            raise ValueError(f"Unsupported inference executor mode: {self.mode}")
+
+        self._executor: Optional[Executor] = None
+        self._thread_executor: Optional[ThreadPoolExecutor] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._pending: Dict[str, int] = {}
+        self._total_pending = 0
+        self._lock = threading.Lock()
+
+        logger.info(
+            f"InferenceExecutor initialized: mode={self.mode}, workers={self.max_workers}, "
+            f"max_queue_depth={self.max_queue_depth}, per_model_concurrency={self.per_model_concurrency}"
+        )
+
+    def _get_executor(self) -> Executor:
+        """Lazily create the underlying pool."""
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = self._get_thread_executor()
+        return self._executor
+
+    def _get_thread_executor(self) -> ThreadPoolExecutor:
+        """Thread pool used for thread mode and for in-process callables."""
+        if self._thread_executor is None:
+            self._thread_executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="inference"
+            )
+        return self._thread_executor
+
+    def _get_semaphore(self, model_key: str) -> asyncio.Semaphore:
+        """Get the concurrency gate for a model."""
+        semaphore = self._semaphores.get(model_key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_model_concurrency)
+            self._semaphores[model_key] = semaphore
+        return semaphore
+
+    def _acquire_slot(self, model_key: str) -> None:
+        """Reserve a queue slot or fail fast when the queue is full."""
+        with self._lock:
+            if self._total_pending >= self.max_queue_depth:
+                raise InferenceQueueFullError(model_key, self._total_pending)
+            self._total_pending += 1
+            self._pending[model_key] = self._pending.get(model_key, 0) + 1
+
+    def _release_slot(self, model_key: str) -> None:
+        """Release a previously reserved queue slot."""
+        with self._lock:
+            self._total_pending -= 1
+            self._pending[model_key] -= 1
+
+    async def run(self, model_key: str, func: Callable[..., Any], *args: Any,
+                  in_process: bool = False, **kwargs: Any) -> Any:
+        """
+        Run a blocking callable on the inference pool.
+
+        Args:
+            model_key: Logical model name used for concurrency limits and metrics
+            func: Blocking callable to execute
+            in_process: Force the thread pool even in process mode (for
+                callables that close over unpicklable objects)
+
+        Returns:
+            Whatever ``func`` returns
+        """
+        self._acquire_slot(model_key)
+        enqueued_at = time.perf_counter()
+        started_at = None
+        success = False
+
+        try:
+            async with self._get_semaphore(model_key):
+                started_at = time.perf_counter()
+                executor = self._get_thread_executor() if in_process else self._get_executor()
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+                success = True
+                return result
+        finally:
+            finished_at = time.perf_counter()
+            queue_wait = (started_at or finished_at) - enqueued_at
+            execution_time = finished_at - started_at if started_at else 0.0
+            self._release_slot(model_key)
+            telemetry_service.record_inference(model_key, queue_wait, execution_time, success=success)
+
+    async def predict(self, model_key: str, model: Any, image: Any,
+                      model_path: Optional[Union[str, Path]] = None, **predict_kwargs: Any) -> Any:
+        """
+        Run ``model.predict`` through the executor.
+
+        In process mode the prediction is executed by a worker process that
+        loads the weights from ``model_path``; without a path (e.g. mock models)
+        the call falls back to the thread pool.
+        """
+        if self.mode == "process" and model_path is not None:
+            return await self.run(model_key, _process_predict, str(model_path), image, predict_kwargs)
+        return await self.run(model_key, model.predict, image, in_process=True, **predict_kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get current queue depth and configuration."""
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "max_workers": self.max_workers,
+                "max_queue_depth": self.max_queue_depth,
+                "per_model_concurrency": self.per_model_concurrency,
+                "queue_depth": self._total_pending,
+                "queue_depth_by_model": {k: v for k, v in self._pending.items() if v}
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the underlying pools."""
+        for executor in {self._executor, self._thread_executor}:
+            if executor is not None:
+                executor.shutdown(wait=wait)
+        self._executor = None
+        self._thread_executor = None
+        logger.info("InferenceExecutor shut down")
+
+
+# Global inference executor instance
+inference_executor = InferenceExecutor()
@@ -0,0 +1,262 @@
+"""Log-linear latency histograms with per-thread shards and cached snapshots."""
+
+import math
+import threading
+from bisect import bisect_right
+from functools import partial, reduce
+from itertools import accumulate
+from math import ceil, frexp
+from operator import add, itemgetter
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+# Linear sub-buckets per power of two: values are reported within 1/32 (~3%)
+SUB_BUCKETS = 32
+# Octaves covered: ~1 microsecond (2**-20 s) up to 2**12 s; values outside are clamped
+MIN_EXPONENT = -20
+OCTAVES = 32
+BUCKET_COUNT = SUB_BUCKETS * OCTAVES
+
+# Prometheus ``le`` bounds in seconds (~122 us to 128 s); octave edges are bucket edges, so counts are exact
+PROMETHEUS_BUCKET_BOUNDS: Tuple[float, ...] = tuple(2.0 ** exponent for exponent in range(-13, 8))
+
+_MANTISSA_SCALE = 2.0 * SUB_BUCKETS
+_INDEX_OFFSET = -(MIN_EXPONENT + 1) * SUB_BUCKETS - SUB_BUCKETS - 1
+
+
+def bucket_index(value: float) -> int:
+    """Index of the bucket ``(lower, upper]`` containing ``value`` (seconds)."""
+    if value <= 0.0:
+        return 0
+    mantissa, exponent = frexp(value)  # value = mantissa * 2**exponent, 0.5 <= mantissa < 1
+    # Sub-bucket ceil(2 * SUB_BUCKETS * mantissa) - SUB_BUCKETS - 1: exact edges belong to
+    # the bucket below, as for Prometheus ``le``
+    index = exponent * SUB_BUCKETS + ceil(mantissa * _MANTISSA_SCALE) + _INDEX_OFFSET
+    if index < 0:
+        return 0
+    if index >= BUCKET_COUNT:
+        return BUCKET_COUNT - 1
+    return index
+
+
+def bucket_upper_bound(index: int) -> float:
+    """Largest value of bucket ``index``."""
+    octave, sub_bucket = divmod(index, SUB_BUCKETS)
+    return math.ldexp(1.0 + (sub_bucket + 1) / SUB_BUCKETS, octave + MIN_EXPONENT)
+
+
+_UPPER_BOUNDS = [bucket_upper_bound(index) for index in range(BUCKET_COUNT)]
+# Each ``le`` bound is the top edge of an octave, so its cumulative count is a sum of whole octaves
+_prometheus_octaves = itemgetter(*[bucket_index(bound) // SUB_BUCKETS for bound in PROMETHEUS_BUCKET_BOUNDS])
+
+
+class HistogramSnapshot(NamedTuple):
+    """Statistics of a histogram at one point in time."""
+    summary: Dict[str, float]
+    prometheus_buckets: List[int]  # Cumulative counts at each of ``PROMETHEUS_BUCKET_BOUNDS``
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds.
+
+    Recording is O(1) and keeps every sample (no sliding window), and
+    histograms merge by adding bucket counts. Besides the bucket counts, a
+    count per octave (power of two) is kept, so statistics never scan all
+    1024 buckets (see ``snapshot_histograms``). Instances are not locked;
+    give each writer thread its own.
+    """
+
+    __slots__ = ("counts", "octave_counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * BUCKET_COUNT
+        self.octave_counts = [0] * OCTAVES
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float) -> None:
+        """Record one duration in seconds."""
+        index = bucket_index(value)
+        self.counts[index] += 1
+        self.octave_counts[index // SUB_BUCKETS] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the samples of ``other`` to this histogram."""
+        self.counts = list(map(add, self.counts, other.counts))
+        self.octave_counts = list(map(add, self.octave_counts, other.octave_counts))
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def snapshot(self) -> HistogramSnapshot:
+        """Summary and Prometheus buckets of the samples."""
+        return snapshot_histograms([self])
+
+
+def _column_sums(rows: Sequence[List[int]]) -> List[int]:
+    return list(reduce(partial(map, add), rows))
+
+
+def snapshot_histograms(histograms: Sequence[LatencyHistogram]) -> HistogramSnapshot:
+    """
+    Statistics of the samples of several histograms (e.g. the shards of one key).
+
+    The histograms are not merged: a percentile is located in the summed
+    octave counts and then within the 32 summed buckets of that octave, and
+    Prometheus buckets are sums of whole octaves. Percentiles are reported
+    as the upper edge of the bucket holding the rank, clamped to the
+    observed min/max.
+
+    Args:
+        histograms: Histograms to combine; their threads may keep recording
+
+    Returns:
+        Summary and Prometheus buckets of their samples
+    """
+    # Each list is copied atomically; samples recorded meanwhile may or may not be included
+    octave_cumulative = list(accumulate(_column_sums([list(histogram.octave_counts) for histogram in histograms])))
+    count = octave_cumulative[-1]
+    minimum = min(histogram.min for histogram in histograms)
+    maximum = max(histogram.max for histogram in histograms)
+    total = sum(histogram.total for histogram in histograms)
+
+    percentiles = []
+    octave_buckets: Dict[int, List[int]] = {}  # p95 and p99 often share an octave
+    for quantile in (0.5, 0.95, 0.99):
+        if not count:
+            percentiles.append(0.0)
+            continue
+        # Same rank as indexing a sorted sample list at int(n * q)
+        rank = min(int(count * quantile), count - 1)
+        octave = bisect_right(octave_cumulative, rank)
+        below = octave_cumulative[octave - 1] if octave else 0
+        start = octave * SUB_BUCKETS
+        within = octave_buckets.get(octave)
+        if within is None:
+            within = octave_buckets[octave] = list(accumulate(_column_sums([
+                histogram.counts[start:start + SUB_BUCKETS] for histogram in histograms
+            ])))
+        # Buckets copied after the octaves may hold more samples, never fewer
+        index = start + min(bisect_right(within, rank - below), SUB_BUCKETS - 1)
+        percentiles.append(min(max(_UPPER_BOUNDS[index], minimum), maximum))
+
+    p50, p95, p99 = percentiles
+    summary = {
+        "count": count,
+        "min": minimum,
+        "max": maximum,
+        "mean": total / count if count else 0.0,
+        "sum": total,
+        "p50": p50,
+        "p95": p95,
+        "p99": p99
+    }
+    return HistogramSnapshot(summary, list(_prometheus_octaves(octave_cumulative)))
+
+
+class ShardedLatencyHistograms:
+    """Named latency histograms, sharded per recording thread.
+
+    Each thread records into its own ``LatencyHistogram`` per key without
+    taking a lock. A snapshot recomputes a key's statistics only when its
+    sample count changed since the previous snapshot, and then reads only
+    the octave counts and a few 32-bucket slices of each shard, so scrape
+    cost does not grow with the number of samples. Shards of threads that
+    have exited are folded into a retained histogram at snapshot time, so
+    counts stay cumulative while worker threads come and go.
+    """
+
+    def __init__(self):
+        """Initialize with no shards."""
+        self._local = threading.local()
+        self._registry_lock = threading.Lock()
+        self._shards: List[Tuple[threading.Thread, Dict[str, LatencyHistogram]]] = []
+        self._retired: Dict[str, LatencyHistogram] = {}
+        # Key -> (sample count the snapshot was computed at, snapshot)
+        self._snapshots: Dict[str, Tuple[int, HistogramSnapshot]] = {}
+
+    def _new_shard(self) -> Dict[str, LatencyHistogram]:
+        shard: Dict[str, LatencyHistogram] = {}
+        with self._registry_lock:
+            self._local.shard = shard
+            self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def record(self, key: str, value: float) -> None:
+        """
+        Record a duration under ``key`` in the calling thread's shard.
+
+        Args:
+            key: Histogram name (e.g. ``operation_analyze``)
+            value: Duration in seconds
+        """
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        histogram = shard.get(key)
+        if histogram is None:
+            histogram = shard[key] = LatencyHistogram()
+        histogram.record(value)
+
+    def snapshot(self) -> Dict[str, HistogramSnapshot]:
+        """
+        Statistics of every key over all shards.
+
+        Shards are read while their threads keep recording, so samples
+        recorded during the snapshot may or may not be included.
+
+        Returns:
+            Dict of key to its summary and Prometheus buckets
+        """
+        with self._registry_lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    self._merge_into(self._retired, shard)
+            self._shards = live
+
+            by_key: Dict[str, List[LatencyHistogram]] = {}
+            for shard in [self._retired] + [shard for _, shard in live]:
+                # list() guards against keys added by the owning thread mid-iteration
+                for key, histogram in list(shard.items()):
+                    by_key.setdefault(key, []).append(histogram)
+
+            snapshots: Dict[str, HistogramSnapshot] = {}
+            for key, histograms in by_key.items():
+                # Counted before the statistics are read, so a cached snapshot never has fewer
+                # samples than its count says; folding in retired shards keeps the sum unchanged
+                count = sum(histogram.count for histogram in histograms)
+                cached = self._snapshots.get(key)
+                if cached is None or cached[0] != count:
+                    cached = self._snapshots[key] = (count, snapshot_histograms(histograms))
+                snapshots[key] = cached[1]
+        return snapshots
+
+    @staticmethod
+    def _merge_into(target: Dict[str, LatencyHistogram], source: Dict[str, LatencyHistogram]) -> None:
+        # list() guards against keys added by the owning thread mid-iteration
+        for key, histogram in list(source.items()):
+            merged = target.get(key)
+            if merged is None:
+                merged = target[key] = LatencyHistogram()
+            merged.merge(histogram)
+
+    def clear(self) -> None:
+        """Drop all samples (a sample recorded during the clear may be lost)."""
+        with self._registry_lock:
+            for _, shard in self._shards:
+                shard.clear()
+            self._retired = {}
+            self._snapshots = {}
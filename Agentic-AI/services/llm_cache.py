@@ -0,0 +1,123 @@
+"""Prompt-level cache for LLM completions."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, Tuple
+from loguru import logger
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace so formatting-only prompt differences share an entry."""
+    return " ".join(text.split())
+
+
+class LLMResponseCache:
+    """TTL + LRU cache of completion text keyed by the exact request.
+
+    Prompts built from templates repeat for common low-information cases
+    (e.g. no detections, no symptoms), so identical (system prompt, user
+    prompt, model, temperature) requests are answered from memory instead of
+    spending API quota. Hits are returned as a completion-shaped object so
+    callers parse them like a live response.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: int = 3600, enabled: bool = True):
+        """Initialize cache with size and age bounds."""
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+        logger.info(
+            f"LLMResponseCache initialized: enabled={enabled}, max_entries={max_entries}, ttl={ttl_seconds}s"
+        )
+
+    @staticmethod
+    def make_key(system_prompt: str, user_prompt: str, model: str, temperature: float,
+                 max_tokens: Optional[int] = None) -> str:
+        """Hash of the normalized request parameters that determine the completion."""
+        key_material = {
+            "system": _normalize(system_prompt),
+            "user": _normalize(user_prompt),
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        return hashlib.sha256(json.dumps(key_material, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def as_completion(content: str) -> Any:
+        """Wrap cached text in the ``choices[0].message.content`` shape of a response."""
+        message = SimpleNamespace(role="assistant", content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, index=0)], usage=None, cached=True)
+
+    def get(self, key: str) -> Optional[str]:
+        """Get cached completion text, or None on miss/expiry."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, content = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return content
+
+    def put(self, key: str, content: str) -> None:
+        """Store completion text, evicting least recently used entries."""
+        if not self.enabled or not content:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        """Drop an entry (e.g. when its content failed validation)."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,148 @@
+"""Dynamic micro-batching of YOLO predictions across concurrent requests."""
+
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from loguru import logger
+
+from services.inference_executor import InferenceExecutor, inference_executor
+
+
+class _PendingBatch:
+    """Images collected for one model/predict-settings combination."""
+
+    def __init__(self, model_key: str, model: Any, model_path: Optional[Union[str, Path]],
+                 predict_kwargs: Dict[str, Any]):
+        self.model_key = model_key
+        self.model = model
+        self.model_path = model_path
+        self.predict_kwargs = predict_kwargs
+        self.images: List[Any] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatcher:
+    """Collects concurrent single-image predictions into batched ``predict`` calls.
+
+    The first image for a model opens a batch window of ``max_wait_ms``; the
+    batch is flushed when the window closes or ``max_batch_size`` images have
+    arrived, whichever comes first. Each caller receives a one-element result
+    list, so it is a drop-in replacement for ``model.predict(image)``.
+    """
+
+    def __init__(self, executor: Optional[InferenceExecutor] = None,
+                 max_batch_size: Optional[int] = None, max_wait_ms: Optional[int] = None):
+        """Initialize batcher from arguments or application config."""
+        self.executor = executor or inference_executor
+        try:
+            from app.config import config
+            self.max_batch_size = max_batch_size or config.inference_batch_max_size
+            self.max_wait_ms = max_wait_ms if max_wait_ms is not None else config.inference_batch_max_wait_ms
+        except Exception:
+            # Fallback for testing
+            self.max_batch_size = max_batch_size or 8
+            self.max_wait_ms = max_wait_ms if max_wait_ms is not None else 10
+
+        self._pending: Dict[Tuple, _PendingBatch] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._batches_run = 0
+        self._images_run = 0
+        self._largest_batch = 0
+
+        logger.info(f"MicroBatcher initialized: max_batch_size={self.max_batch_size}, max_wait_ms={self.max_wait_ms}")
+
+    async def predict(self, model_key: str, model: Any, image: Any,
+                      model_path: Optional[Union[str, Path]] = None, **predict_kwargs: Any) -> List[Any]:
+        """
+        Predict a single image, sharing a batched model call with concurrent requests.
+
+        Args:
+            model_key: Logical model name (e.g. "hand", "leg")
+            model: Loaded YOLO model
+            image: Image array for this request
+            model_path: Weights path (used by the executor in process mode)
+            **predict_kwargs: Arguments forwarded to ``model.predict``
+
+        Returns:
+            List with the single result for ``image``
+        """
+        if self.max_batch_size <= 1:
+            return await self.executor.predict(model_key, model, image, model_path=model_path, **predict_kwargs)
+
+        loop = asyncio.get_running_loop()
+        # Only images with identical predict settings can share a call
+        key = (model_key, id(model), tuple(sorted(predict_kwargs.items())))
+
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch(model_key, model, model_path, predict_kwargs)
+            self._pending[key] = batch
+            batch.timer = loop.call_later(self.max_wait_ms / 1000, self._flush, key)
+
+        future = loop.create_future()
+        batch.images.append(image)
+        batch.futures.append(future)
+
+        if len(batch.images) >= self.max_batch_size:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: Tuple) -> None:
+        """Close a batch window and dispatch it."""
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: _PendingBatch) -> None:
+        """Run one batched prediction and fan results back to the callers."""
+        size = len(batch.images)
+        try:
+            results = await self.executor.predict(
+                batch.model_key,
+                batch.model,
+                batch.images,
+                model_path=batch.model_path,
+                **batch.predict_kwargs
+            )
+            if len(results) != size:
+                raise RuntimeError(f"Batched predict returned {len(results)} results for {size} images")
+        except Exception as e:
+            logger.error(f"Batched {batch.model_key} prediction of {size} image(s) failed: {e}")
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._batches_run += 1
+        self._images_run += size
+        self._largest_batch = max(self._largest_batch, size)
+        logger.debug(f"Ran batched {batch.model_key} prediction with {size} image(s)")
+
+        for future, result in zip(batch.futures, results):
+            # Callers that timed out have already cancelled their future
+            if not future.done():
+                future.set_result([result])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics."""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches_run": self._batches_run,
+            "images_run": self._images_run,
+            "mean_batch_size": round(self._images_run / self._batches_run, 2) if self._batches_run else 0.0,
+            "largest_batch": self._largest_batch,
+            "pending_images": sum(len(b.images) for b in self._pending.values())
+        }
+
+
+# Global micro-batcher instance
+micro_batcher = MicroBatcher()
@@ -0,0 +1,244 @@
+"""Process-wide pool of loaded model agents with reference counting and hot-swap."""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set
+from loguru import logger
+
+from services.model_registry import model_registry
+
+
+def _create_router_agent(model_path: Optional[Path] = None) -> Any:
+    from agents.router import RouterAgent
+    return RouterAgent(model_path)
+
+
+def _create_hand_agent(model_path: Optional[Path] = None) -> Any:
+    from agents.hand import HandAgent
+    return HandAgent(model_path)
+
+
+def _create_leg_agent(model_path: Optional[Path] = None) -> Any:
+    from agents.leg import LegAgent
+    return LegAgent(model_path)
+
+
+class _PoolEntry:
+    """A single agent generation held by the pool."""
+
+    def __init__(self, name: str, agent: Any, generation: int):
+        self.name = name
+        self.agent = agent
+        self.generation = generation
+        self.refcount = 0
+        self.loaded_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "generation": self.generation,
+            "model_path": str(getattr(self.agent, "model_path", "")),
+            "loaded": bool(getattr(self.agent, "is_loaded", False)),
+            "loaded_at": self.loaded_at,
+            "refcount": self.refcount
+        }
+
+
+class ModelPool:
+    """Owns one shared instance of each model agent for the whole process.
+
+    Callers lease an agent with ``async with model_pool.lease("hand")``; the
+    agent is loaded on first use (or up front via ``load``) and is never
+    reloaded per request. ``swap`` loads a replacement generation next to the
+    active one and switches over atomically; the previous generation is
+    dropped once its last lease is released. Activating a version in the
+    model registry swaps the matching agent to its weights.
+    """
+
+    def __init__(self):
+        """Initialize pool with the built-in agent factories."""
+        self._factories: Dict[str, Callable[[Optional[Path]], Any]] = {
+            "router": _create_router_agent,
+            "hand": _create_hand_agent,
+            "leg": _create_leg_agent
+        }
+        self._entries: Dict[str, _PoolEntry] = {}
+        self._retiring: List[_PoolEntry] = []
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+        self._swap_tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+        model_registry.add_activation_listener(self._on_model_activated)
+        logger.info(f"Model pool initialized with agents: {list(self._factories)}")
+
+    def register(self, name: str, factory: Callable[[Optional[Path]], Any]) -> None:
+        """Register a factory that builds an agent for ``name``."""
+        self._factories[name] = factory
+
+    def _get_entry(self, name: str) -> _PoolEntry:
+        """Get the active entry for an agent, creating it (unloaded) if needed."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                if name not in self._factories:
+                    raise KeyError(f"Unknown pooled agent: {name}")
+                entry = _PoolEntry(name, self._factories[name](None), generation=1)
+                self._entries[name] = entry
+            return entry
+
+    def _get_load_lock(self, name: str) -> asyncio.Lock:
+        lock = self._load_locks.get(name)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._load_locks[name] = lock
+        return lock
+
+    async def _ensure_loaded(self, entry: _PoolEntry) -> None:
+        """Load an entry's model exactly once, even under concurrent callers."""
+        if getattr(entry.agent, "is_loaded", True):
+            return
+        async with self._get_load_lock(entry.name):
+            if getattr(entry.agent, "is_loaded", True):
+                return
+            start_time = time.time()
+            await entry.agent.load_model()
+            entry.loaded_at = time.time()
+            logger.info(f"Pooled {entry.name} agent loaded in {entry.loaded_at - start_time:.2f}s")
+
+    def get_agent(self, name: str) -> Any:
+        """Get the active agent without taking a lease (may not be loaded yet)."""
+        return self._get_entry(name).agent
+
+    async def acquire(self, name: str) -> Any:
+        """Get the active, loaded agent and take a reference on it."""
+        entry = self._get_entry(name)
+        await self._ensure_loaded(entry)
+        with self._lock:
+            entry.refcount += 1
+        return entry.agent
+
+    def release(self, name: str, agent: Any) -> None:
+        """Drop a reference taken by ``acquire``."""
+        with self._lock:
+            active = self._entries.get(name)
+            if active is not None and active.agent is agent:
+                active.refcount -= 1
+                return
+
+            for entry in self._retiring:
+                if entry.name == name and entry.agent is agent:
+                    entry.refcount -= 1
+                    if entry.refcount <= 0:
+                        self._retiring.remove(entry)
+                        logger.info(f"Retired {name} agent generation {entry.generation}")
+                    return
+
+        logger.warning(f"Released {name} agent that is not held by the pool")
+
+    @asynccontextmanager
+    async def lease(self, name: str) -> AsyncIterator[Any]:
+        """Context manager around ``acquire``/``release``."""
+        agent = await self.acquire(name)
+        try:
+            yield agent
+        finally:
+            self.release(name, agent)
+
+    async def load(self, names: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+        """
+        Load agents up front (used at application startup).
+
+        Returns:
+            Mapping of agent name to whether it loaded successfully
+        """
+        status = {}
+        for name in names or list(self._factories):
+            try:
+                await self._ensure_loaded(self._get_entry(name))
+                status[name] = True
+            except Exception as e:
+                logger.error(f"Failed to load pooled {name} agent: {e}")
+                status[name] = False
+        return status
+
+    async def swap(self, name: str, model_path: Optional[Path] = None) -> Any:
+        """
+        Hot-swap an agent for a freshly loaded generation.
+
+        The replacement is fully loaded before it becomes visible, so requests
+        never see a half-loaded model. In-flight leases keep using the previous
+        generation until they are released.
+
+        Args:
+            name: Pooled agent name
+            model_path: Weights for the new generation (defaults to configured path)
+
+        Returns:
+            The new active agent
+        """
+        if name not in self._factories:
+            raise KeyError(f"Unknown pooled agent: {name}")
+
+        new_agent = self._factories[name](model_path)
+        await new_agent.load_model()
+        entry = self._install(name, new_agent)
+        entry.loaded_at = time.time()
+
+        logger.info(f"Swapped {name} agent to generation {entry.generation} ({getattr(new_agent, 'model_path', '')})")
+        return new_agent
+
+    def _install(self, name: str, agent: Any) -> _PoolEntry:
+        """Make ``agent`` the active generation, retiring the previous one if leased."""
+        with self._lock:
+            previous = self._entries.get(name)
+            entry = _PoolEntry(name, agent, previous.generation + 1 if previous else 1)
+            self._entries[name] = entry
+            if previous is not None and previous.refcount > 0:
+                self._retiring.append(previous)
+        return entry
+
+    def _on_model_activated(self, model_type: str, version: str) -> None:
+        """Swap the pooled agent to weights activated in the model registry."""
+        if model_type not in self._factories:
+            return
+        info = model_registry.get_model_info(model_type, version)
+        if info is None:
+            return
+        model_path = Path(info["file_path"])
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None:
+            # No event loop to load on (e.g. activated from a script): replace the
+            # active generation now and let the next lease load it
+            entry = self._install(model_type, self._factories[model_type](model_path))
+            logger.info(f"Replaced {model_type} agent with generation {entry.generation} for version {version}; loads on next use")
+            return
+
+        task = loop.create_task(self.swap(model_type, model_path))
+        self._swap_tasks.add(task)
+        task.add_done_callback(self._swap_finished)
+
+    def _swap_finished(self, task: asyncio.Task) -> None:
+        self._swap_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Model pool swap after activation failed: {task.exception()}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool status for monitoring."""
+        with self._lock:
+            return {
+                "agents": {name: entry.to_dict() for name, entry in self._entries.items()},
+                "retiring": [
+                    {"name": entry.name, **entry.to_dict()} for entry in self._retiring
+                ]
+            }
+
+
+# Global model pool instance
+model_pool = ModelPool()
@@ -3,7 +3,7 @@
 import hashlib
 import json
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from pathlib import Path
 from loguru import logger
 
@@ -32,6 +32,9 @@ class ModelRegistry:
         self.registry_file = self.registry_path / "registry.json"
         self.registry_data = self._load_registry()
         
+        # Callbacks notified with (model_type, version) after a hot-swap
+        self._activation_listeners: List[Callable[[str, str], None]] = []
+        
         logger.info(f"Model registry initialized at {self.registry_path}")
     
     def _load_registry(self) -> Dict[str, Any]:
@@ -177,8 +180,23 @@ class ModelRegistry:
         self._save_registry()
         
         logger.info(f"Activated {model_type} model version {version}")
+        
+        for listener in list(self._activation_listeners):
+            try:
+                listener(model_type, version)
+            except Exception as e:
+                logger.error(f"Model activation listener failed for {model_type}:{version}: {e}")
+        
         return True
     
+    def add_activation_listener(self, listener: Callable[[str, str], None]) -> None:
+        """Register a callback invoked after a model version is activated.
+        
+        Args:
+            listener: Callable receiving (model_type, version)
+        """
+        self._activation_listeners.append(listener)
+    
     def get_active_version(self, model_type: str) -> Optional[str]:
         """Get currently active version for a model type.
         
@@ -13,13 +13,25 @@ from schemas.orchestrator import (
 )
 from schemas.base import BodyPart
 from services.policies import policy_service
+from services.request_store import create_request_store
+from services.step_events import step_event_hub
+
+
+# Detectors selected by routing; steps after detection wait for whichever exist
+DETECT_STEPS = [StepName.DETECT_HAND, StepName.DETECT_LEG]
 
 
 class OrchestratorService:
     """Service for orchestrating processing pipelines across different modes."""
     
     def __init__(self):
-        self.active_requests: Dict[UUID, StepGraph] = {}
+        # Step graphs by request ID; the SQLite backend keeps serialized
+        # snapshots so status survives restarts and is visible to all workers
+        self.active_requests = create_request_store(
+            "step_graphs",
+            encode=lambda step_graph: step_graph.model_dump_json(exclude_none=True),
+            decode=StepGraph.model_validate_json
+        )
         self.step_handlers: Dict[StepName, Callable] = {}
     
     def register_step_handler(self, step_name: StepName, handler: Callable) -> None:
@@ -27,11 +39,17 @@ class OrchestratorService:
         self.step_handlers[step_name] = handler
         logger.debug(f"Registered handler for step: {step_name}")
     
-    async def process_request(self, request: ProcessingRequest) -> ProcessingResponse:
-        """Process a request according to the specified mode."""
+    async def process_request(self, request: ProcessingRequest, request_id: Optional[UUID] = None) -> ProcessingResponse:
+        """
+        Process a request according to the specified mode.
+        
+        Args:
+            request: Processing request
+            request_id: ID for the step graph (e.g. of a queued analysis); generated if not given
+        """
         # Create step graph
-        step_graph = self._create_step_graph(request)
-        self.active_requests[step_graph.request_id] = step_graph
+        step_graph = self._create_step_graph(request, request_id)
+        self._save(step_graph)
         
         try:
             if request.mode == ProcessingMode.AUTO:
@@ -51,10 +69,42 @@ class OrchestratorService:
                 current_step.fail(str(e))
             raise
         finally:
-            # Keep request in memory for status queries
-            pass
+            if step_graph.is_complete():
+                timing = step_graph.get_timing_summary()
+                critical_path = " -> ".join(
+                    f"{entry['name']} {entry['duration_ms']}ms" for entry in timing["critical_path"]
+                )
+                logger.info(
+                    f"Request {step_graph.request_id} took {timing['wall_ms']}ms "
+                    f"(steps {timing['total_step_ms']}ms); critical path: {critical_path}"
+                )
+            # Keep request in the store for status queries
+            self._save(step_graph)
+            step_event_hub.close(str(step_graph.request_id), {
+                "request_id": str(step_graph.request_id),
+                # A graph left incomplete here was aborted by an exception
+                "status": self.get_overall_status(step_graph) if step_graph.is_complete() else "failed",
+                "partial": step_graph.partial,
+                "triage_level": step_graph.triage_level,
+                "timing": step_graph.get_timing_summary()
+            })
     
-    def _create_step_graph(self, request: ProcessingRequest) -> StepGraph:
+    def _save(self, step_graph: StepGraph) -> None:
+        """Write the current state of a step graph to the request store."""
+        step_graph.updated_at = datetime.utcnow()
+        self.active_requests.put(str(step_graph.request_id), step_graph)
+        step_event_hub.publish_step_graph(step_graph)
+    
+    @staticmethod
+    def get_overall_status(step_graph: StepGraph) -> str:
+        """Summarize a step graph as processing, completed, completed_partial or failed."""
+        if not step_graph.is_complete():
+            return "processing"
+        if step_graph.has_fatal_error():
+            return "failed"
+        return "completed_partial" if step_graph.partial else "completed"
+    
+    def _create_step_graph(self, request: ProcessingRequest, request_id: Optional[UUID] = None) -> StepGraph:
         """Create initial step graph based on request mode."""
         # Get policy configuration for this request
         overrides = {}
@@ -77,6 +127,8 @@ class OrchestratorService:
             thresholds=policy_service.get_detection_thresholds(UUID('00000000-0000-0000-0000-000000000000')),
             timeouts=policy_service.get_config_metadata(UUID('00000000-0000-0000-0000-000000000000'))['timeouts']
         )
+        if request_id is not None:
+            step_graph.request_id = request_id
         
         # Update policy service with actual request ID
         policy_service.get_config_for_request(
@@ -87,71 +139,97 @@ class OrchestratorService:
         
         # Add standard pipeline steps
         step_graph.add_step(StepName.VALIDATE)
-        step_graph.add_step(StepName.ROUTE)
+        step_graph.add_step(StepName.ROUTE, depends_on=[StepName.VALIDATE])
         
         # Detection steps will be added based on routing results
-        step_graph.add_step(StepName.TRIAGE)
-        step_graph.add_step(StepName.DIAGNOSE)
-        step_graph.add_step(StepName.REPORT)
+        step_graph.add_step(StepName.TRIAGE, depends_on=[StepName.ROUTE, *DETECT_STEPS])
+        # Diagnosis and report only need the triage outcome, so they run side by side
+        step_graph.add_step(StepName.DIAGNOSE, depends_on=[StepName.TRIAGE])
+        step_graph.add_step(StepName.REPORT, depends_on=[StepName.TRIAGE])
         
-        # Optional steps
+        # Optional steps (depend only on consent and location, not on imaging)
         if request.consents.get("geolocation", False):
-            step_graph.add_step(StepName.HOSPITALS)
+            step_graph.add_step(StepName.HOSPITALS, depends_on=[StepName.VALIDATE])
         
         return step_graph
     
     async def _process_auto_mode(self, step_graph: StepGraph, request: ProcessingRequest) -> None:
-        """Process request in auto mode - full sequence with short-circuit on fatal errors."""
+        """Process request in auto mode - full graph with short-circuit on fatal errors."""
         logger.info(f"Processing request {step_graph.request_id} in AUTO mode")
         
-        # Validation step
-        await self._execute_step(step_graph, StepName.VALIDATE, request)
-        if step_graph.has_fatal_error():
-            logger.warning(f"Fatal error in validation, stopping processing")
-            return
-        
-        # Routing step
-        await self._execute_step(step_graph, StepName.ROUTE, request)
+        def on_step_finished(step_name: StepName) -> None:
+            # Add detection steps based on routing result
+            if step_name != StepName.ROUTE:
+                return
+            route_step = step_graph.get_step(StepName.ROUTE)
+            if route_step and route_step.status == StepStatus.OK:
+                detected_part = step_graph.detected_body_part
+                
+                if detected_part == BodyPart.HAND:
+                    step_graph.add_step(StepName.DETECT_HAND, depends_on=[StepName.ROUTE])
+                elif detected_part == BodyPart.LEG:
+                    step_graph.add_step(StepName.DETECT_LEG, depends_on=[StepName.ROUTE])
+                elif detected_part == BodyPart.UNKNOWN:
+                    # Low confidence routing - run both detectors in auto mode
+                    step_graph.add_step(StepName.DETECT_HAND, depends_on=[StepName.ROUTE])
+                    step_graph.add_step(StepName.DETECT_LEG, depends_on=[StepName.ROUTE])
+        
+        # Independent steps (e.g. hospitals vs imaging, diagnosis vs report) run concurrently
+        await self._run_graph(step_graph, request, on_step_finished)
         if step_graph.has_fatal_error():
-            logger.warning(f"Fatal error in routing, stopping processing")
+            logger.warning(f"Fatal error in request {step_graph.request_id}, stopped processing")
             return
         
-        # Add detection steps based on routing result
-        route_step = step_graph.get_step(StepName.ROUTE)
-        if route_step and route_step.status == StepStatus.OK:
-            detected_part = step_graph.detected_body_part
-            
-            if detected_part == BodyPart.HAND:
-                step_graph.add_step(StepName.DETECT_HAND)
-                await self._execute_step(step_graph, StepName.DETECT_HAND, request)
-            elif detected_part == BodyPart.LEG:
-                step_graph.add_step(StepName.DETECT_LEG)
-                await self._execute_step(step_graph, StepName.DETECT_LEG, request)
-            elif detected_part == BodyPart.UNKNOWN:
-                # Low confidence routing - run both detectors in auto mode
-                step_graph.add_step(StepName.DETECT_HAND)
-                step_graph.add_step(StepName.DETECT_LEG)
-                await asyncio.gather(
-                    self._execute_step(step_graph, StepName.DETECT_HAND, request),
-                    self._execute_step(step_graph, StepName.DETECT_LEG, request),
-                    return_exceptions=True
-                )
-        
-        # Continue with remaining steps (allow partial results)
-        await self._execute_step(step_graph, StepName.TRIAGE, request)
-        await self._execute_step(step_graph, StepName.DIAGNOSE, request)
-        await self._execute_step(step_graph, StepName.REPORT, request)
-        
-        # Optional hospitals step
-        if step_graph.get_step(StepName.HOSPITALS):
-            await self._execute_step(step_graph, StepName.HOSPITALS, request)
-        
         # Check if we have partial results
         failed_steps = step_graph.get_failed_steps()
         if failed_steps and not step_graph.has_fatal_error():
             step_graph.partial = True
             logger.info(f"Request {step_graph.request_id} completed with partial results")
     
+    async def _run_graph(
+        self,
+        step_graph: StepGraph,
+        request: ProcessingRequest,
+        on_step_finished: Optional[Callable[[StepName], None]] = None
+    ) -> None:
+        """
+        Execute the step graph, starting each step as soon as its dependencies finish.
+        
+        Every step still goes through ``_execute_step`` and therefore keeps its
+        PolicyService timeout and retry policy. No new steps are started once a
+        fatal error is recorded; steps already running are allowed to finish.
+        
+        Args:
+            step_graph: Graph to execute
+            request: Processing request passed to handlers
+            on_step_finished: Called with each finished step's name, before
+                readiness is re-evaluated (may add steps to the graph)
+        """
+        scheduled = set()
+        running: Dict[asyncio.Task, StepName] = {}
+        
+        try:
+            while True:
+                if not step_graph.has_fatal_error():
+                    for step in step_graph.get_ready_steps():
+                        if step.name not in scheduled:
+                            scheduled.add(step.name)
+                            task = asyncio.create_task(self._execute_step(step_graph, step.name, request))
+                            running[task] = step.name
+                
+                if not running:
+                    return
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step_name = running.pop(task)
+                    task.result()
+                    if on_step_finished:
+                        on_step_finished(step_name)
+        finally:
+            for task in running:
+                task.cancel()
+    
     async def _process_guided_mode(self, step_graph: StepGraph, request: ProcessingRequest) -> None:
         """Process request in guided mode - prompt when confidence < threshold or consent needed."""
         logger.info(f"Processing request {step_graph.request_id} in GUIDED mode")
@@ -185,11 +263,11 @@ class OrchestratorService:
         # Add and execute detection steps
         detected_part = step_graph.detected_body_part
         if detected_part in [BodyPart.HAND, BodyPart.UNKNOWN]:
-            step_graph.add_step(StepName.DETECT_HAND)
+            step_graph.add_step(StepName.DETECT_HAND, depends_on=[StepName.ROUTE])
             await self._execute_step(step_graph, StepName.DETECT_HAND, request)
         
         if detected_part in [BodyPart.LEG, BodyPart.UNKNOWN]:
-            step_graph.add_step(StepName.DETECT_LEG)
+            step_graph.add_step(StepName.DETECT_LEG, depends_on=[StepName.ROUTE])
             await self._execute_step(step_graph, StepName.DETECT_LEG, request)
         
         # Check for consent requirements
@@ -226,6 +304,13 @@ class OrchestratorService:
         logger.info(f"Advanced mode processing completed with custom config: {step_graph.thresholds}")
     
     async def _execute_step(self, step_graph: StepGraph, step_name: StepName, request: ProcessingRequest) -> None:
+        """Execute a single step and publish the updated step graph."""
+        try:
+            await self._run_step(step_graph, step_name, request)
+        finally:
+            self._save(step_graph)
+    
+    async def _run_step(self, step_graph: StepGraph, step_name: StepName, request: ProcessingRequest) -> None:
         """Execute a single step with timeout and retry logic."""
         step = step_graph.get_step(step_name)
         if not step:
@@ -250,6 +335,7 @@ class OrchestratorService:
             try:
                 step.start()
                 step.retry_count = attempt
+                step_event_hub.publish_step_graph(step_graph)
                 
                 logger.debug(f"Executing step {step_name} (attempt {attempt + 1})")
                 
@@ -338,24 +424,31 @@ class OrchestratorService:
     
     def get_request_status(self, request_id: UUID) -> Optional[StepGraph]:
         """Get status of a processing request."""
-        return self.active_requests.get(request_id)
+        return self.active_requests.get(str(request_id))
+    
+    def list_requests(self, limit: int = 50) -> List[StepGraph]:
+        """Get the most recently updated requests, newest first."""
+        return self.active_requests.recent(limit)
+    
+    def remove_request(self, request_id: UUID) -> bool:
+        """Remove a request and its policy configuration."""
+        policy_service.cleanup_request_config(request_id)
+        return self.active_requests.delete(str(request_id))
+    
+    def cleanup_completed_requests(self) -> int:
+        """
+        Drop expired requests now.
+        
+        Expiry also happens automatically on writes, after
+        REQUEST_STORE_TTL_SECONDS without an update.
+        """
+        removed = self.active_requests.purge_expired()
+        logger.info(f"Cleaned up {removed} old requests")
+        return removed
     
-    def cleanup_completed_requests(self, max_age_hours: int = 24) -> int:
-        """Clean up old completed requests."""
-        cutoff = datetime.utcnow().timestamp() - (max_age_hours * 3600)
-        to_remove = []
-        
-        for request_id, step_graph in self.active_requests.items():
-            if step_graph.is_complete() and step_graph.updated_at.timestamp() < cutoff:
-                to_remove.append(request_id)
-        
-        for request_id in to_remove:
-            del self.active_requests[request_id]
-            # Clean up policy configuration for this request
-            policy_service.cleanup_request_config(request_id)
-        
-        logger.info(f"Cleaned up {len(to_remove)} old requests")
-        return len(to_remove)
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request store statistics."""
+        return self.active_requests.get_stats()
 
 
 # Global orchestrator instance
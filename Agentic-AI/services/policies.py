@@ -2,6 +2,7 @@
 
 import hashlib
 import json
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from uuid import UUID
@@ -11,6 +12,11 @@ from loguru import logger
 
 from schemas.orchestrator import StepName, StepStatus, ProcessingMode
 from app.config import config
+from services.request_store import create_request_store
+
+
+# Distinct override sets whose built configuration is kept in memory
+_MAX_OVERRIDE_CONFIGS = 64
 
 
 class RetryPolicy(str, Enum):
@@ -56,6 +62,12 @@ class PolicyConfiguration:
     detector_score_min: float = 0.35
     nms_iou: float = 0.50
     
+    # Speculative detection: a routing prior at or above band_high starts the
+    # likely detector, one inside [band_low, band_high) starts both
+    speculation_enabled: bool = False
+    speculation_band_low: float = 0.50
+    speculation_band_high: float = 0.75
+    
     # Triage thresholds
     triage_red_threshold: float = 0.8
     triage_amber_threshold: float = 0.6
@@ -224,6 +236,9 @@ class PolicyConfiguration:
             router_threshold=overrides.get('router_threshold', self.router_threshold),
             detector_score_min=overrides.get('detector_score_min', self.detector_score_min),
             nms_iou=overrides.get('nms_iou', self.nms_iou),
+            speculation_enabled=overrides.get('speculation_enabled', self.speculation_enabled),
+            speculation_band_low=overrides.get('speculation_band_low', self.speculation_band_low),
+            speculation_band_high=overrides.get('speculation_band_high', self.speculation_band_high),
             triage_red_threshold=overrides.get('triage_red_threshold', self.triage_red_threshold),
             triage_amber_threshold=overrides.get('triage_amber_threshold', self.triage_amber_threshold),
             triage_high_confidence_threshold=overrides.get('triage_high_confidence_threshold', self.triage_high_confidence_threshold),
@@ -278,7 +293,10 @@ class PolicyService:
     def __init__(self):
         """Initialize policy service with default configuration."""
         self._default_config = self._load_default_config()
-        self._active_configs: Dict[UUID, PolicyConfiguration] = {}
+        # Only requests with overrides are stored (as their overrides); all
+        # others share the default config
+        self._active_configs = create_request_store("policy_overrides", encode=json.dumps, decode=json.loads)
+        self._override_configs: "OrderedDict[str, PolicyConfiguration]" = OrderedDict()
         logger.info(f"PolicyService initialized with config hash: {self._default_config.config_hash}")
     
     def _load_default_config(self) -> PolicyConfiguration:
@@ -287,6 +305,9 @@ class PolicyService:
             router_threshold=config.router_threshold,
             detector_score_min=config.detector_score_min,
             nms_iou=config.nms_iou,
+            speculation_enabled=config.speculation_enabled,
+            speculation_band_low=config.speculation_band_low,
+            speculation_band_high=config.speculation_band_high,
             triage_red_threshold=config.triage_red_threshold,
             triage_amber_threshold=config.triage_amber_threshold,
             triage_high_confidence_threshold=config.triage_high_confidence_threshold,
@@ -299,25 +320,43 @@ class PolicyService:
         """Get configuration for a specific request."""
         if overrides and mode == ProcessingMode.ADVANCED:
             # Apply overrides for advanced mode
-            request_config = self._default_config.apply_overrides(overrides)
-            self._active_configs[request_id] = request_config
+            request_config = self._config_for_overrides(overrides)
+            self._active_configs.put(str(request_id), overrides)
             logger.info(f"Applied config overrides for request {request_id}: {request_config.config_hash}")
             return request_config
         else:
             # Use default config
-            self._active_configs[request_id] = self._default_config
+            self._active_configs.delete(str(request_id))
             return self._default_config
     
+    def _config_for_overrides(self, overrides: Dict[str, Any]) -> PolicyConfiguration:
+        """Build (or reuse) the configuration for a set of overrides."""
+        key = json.dumps(overrides, sort_keys=True, default=str)
+        request_config = self._override_configs.get(key)
+        if request_config is None:
+            request_config = self._default_config.apply_overrides(overrides)
+            self._override_configs[key] = request_config
+            while len(self._override_configs) > _MAX_OVERRIDE_CONFIGS:
+                self._override_configs.popitem(last=False)
+        return request_config
+    
+    def _get_request_config(self, request_id: Optional[UUID]) -> PolicyConfiguration:
+        """Get the configuration that applies to a request."""
+        if request_id is None:
+            return self._default_config
+        overrides = self._active_configs.get(str(request_id))
+        return self._config_for_overrides(overrides) if overrides else self._default_config
+    
     def get_step_timeout(self, request_id: UUID, step_name: StepName) -> int:
         """Get timeout for a specific step in a request."""
-        config = self._active_configs.get(request_id, self._default_config)
+        config = self._get_request_config(request_id)
         policy = config.get_step_policy(step_name)
         return policy.timeout_seconds
     
     def should_retry_step(self, request_id: UUID, step_name: StepName, 
                          current_retry_count: int, error_type: str) -> bool:
         """Determine if a step should be retried."""
-        config = self._active_configs.get(request_id, self._default_config)
+        config = self._get_request_config(request_id)
         policy = config.get_step_policy(step_name)
         
         # Special rule: never block triage if later steps fail
@@ -328,28 +367,37 @@ class PolicyService:
     
     def is_step_fatal_on_error(self, request_id: UUID, step_name: StepName) -> bool:
         """Check if step error should stop the entire pipeline."""
-        config = self._active_configs.get(request_id, self._default_config)
+        config = self._get_request_config(request_id)
         policy = config.get_step_policy(step_name)
         return policy.is_fatal_on_error
     
     def can_skip_step(self, request_id: UUID, step_name: StepName) -> bool:
         """Check if step can be skipped in case of errors."""
-        config = self._active_configs.get(request_id, self._default_config)
+        config = self._get_request_config(request_id)
         policy = config.get_step_policy(step_name)
         return policy.can_be_skipped
     
     def get_detection_thresholds(self, request_id: UUID) -> Dict[str, float]:
         """Get detection thresholds for a request."""
-        config = self._active_configs.get(request_id, self._default_config)
+        config = self._get_request_config(request_id)
         return {
             "router_threshold": config.router_threshold,
             "detector_score_min": config.detector_score_min,
             "nms_iou": config.nms_iou
         }
     
+    def get_speculation_policy(self, request_id: Optional[UUID] = None) -> Dict[str, Any]:
+        """Get speculative detection settings for a request."""
+        config = self._get_request_config(request_id)
+        return {
+            "enabled": config.speculation_enabled,
+            "band_low": config.speculation_band_low,
+            "band_high": config.speculation_band_high
+        }
+    
     def get_triage_config(self, request_id: Optional[UUID] = None) -> Dict[str, Any]:
         """Get triage configuration for a request."""
-        config = self._active_configs.get(request_id, self._default_config) if request_id else self._default_config
+        config = self._get_request_config(request_id)
         return {
             "red_threshold": config.triage_red_threshold,
             "amber_threshold": config.triage_amber_threshold,
@@ -357,12 +405,18 @@ class PolicyService:
             "medium_confidence_threshold": config.triage_medium_confidence_threshold,
             "red_patterns": config.triage_red_patterns,
             "amber_patterns": config.triage_amber_patterns,
-            "green_patterns": config.triage_green_patterns
+            "green_patterns": config.triage_green_patterns,
+            "config_hash": config.config_hash
         }
     
+    def get_config_hash(self, request_id: Optional[UUID] = None) -> str:
+        """Get the hash of the configuration that applies to a request."""
+        config = self._get_request_config(request_id)
+        return config.config_hash
+    
     def get_config_metadata(self, request_id: UUID) -> Dict[str, Any]:
         """Get configuration metadata for audit logging."""
-        config = self._active_configs.get(request_id, self._default_config)
+        config = self._get_request_config(request_id)
         return {
             "config_hash": config.config_hash,
             "version": config.version,
@@ -389,10 +443,16 @@ class PolicyService:
     
     def cleanup_request_config(self, request_id: UUID) -> None:
         """Clean up configuration for completed request."""
-        if request_id in self._active_configs:
-            del self._active_configs[request_id]
+        if self._active_configs.delete(str(request_id)):
             logger.debug(f"Cleaned up config for request {request_id}")
     
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request configuration store statistics."""
+        return {
+            "request_configs": self._active_configs.get_stats(),
+            "override_configs_cached": len(self._override_configs)
+        }
+    
     def validate_overrides(self, overrides: Dict[str, Any]) -> List[str]:
         """Validate configuration overrides and return any errors."""
         errors = []
@@ -413,6 +473,13 @@ class PolicyService:
             if not isinstance(val, (int, float)) or not 0.0 <= val <= 1.0:
                 errors.append("nms_iou must be between 0.0 and 1.0")
         
+        # Validate speculation band
+        for key in ['speculation_band_low', 'speculation_band_high']:
+            if key in overrides:
+                val = overrides[key]
+                if not isinstance(val, (int, float)) or not 0.0 <= val <= 1.0:
+                    errors.append(f"{key} must be between 0.0 and 1.0")
+        
         # Validate triage thresholds
         for threshold_name in ['triage_red_threshold', 'triage_amber_threshold', 
                               'triage_high_confidence_threshold', 'triage_medium_confidence_threshold']:
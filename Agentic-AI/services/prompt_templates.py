@@ -3,6 +3,8 @@
 from typing import Dict, List, Any, Optional
 import re
 
+from services.phi_redaction import prompt_phi_redactor
+
 
 class MedicalPromptTemplates:
     """Collection of medical prompt templates with PHI redaction and safety measures."""
@@ -36,53 +38,9 @@ class MedicalPromptTemplates:
         if not text:
             return text
         
-        # Comprehensive patterns for PHI detection and redaction
-        patterns = [
-            # Names (various formats) - more specific to avoid false positives
-            (r'\b(?:Mr|Mrs|Ms|Dr|Doctor|Patient)\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\b', '[NAME]'),
-            (r'\b[A-Z][a-z]+,\s*[A-Z][a-z]+\b', '[NAME]'),
-            # Full names (first and last) - only match clear name patterns
-            (r'\b([A-Z][a-z]{2,})\s+([A-Z][a-z]{2,})\s+(has|reports|experienced|complained|stated|mentioned|said)\b', '[NAME] \\3'),
-            (r'\b(?:Patient|Mr|Mrs|Ms)\s+[A-Z][a-z]{2,}\s+[A-Z][a-z]{2,}\b', '[NAME]'),
-            
-            # Contact Information
-            (r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b', '[PHONE]'),
-            (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '[EMAIL]'),
-            
-            # Dates and Times
-            (r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b', '[DATE]'),
-            (r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b', '[DATE]'),
-            (r'\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM|am|pm)?\b', '[TIME]'),
-            
-            # Medical Identifiers
-            (r'\b(?:SSN|Social Security):?\s*\d{3}-?\d{2}-?\d{4}\b', '[SSN]'),
-            (r'\b(?:MRN|Medical Record|Patient ID):?\s*\d+\b', '[MRN]'),
-            (r'\b(?:DOB|Date of Birth):?\s*\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b', '[DOB]'),
-            (r'\b(?:Insurance|Policy)\s*(?:Number|ID)?:?\s*[A-Z0-9]+\b', '[INSURANCE]'),
-            
-            # Addresses
-            (r'\b\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Circle|Cir|Court|Ct|Place|Pl)\b', '[ADDRESS]'),
-            (r'\b[A-Za-z\s]+,\s*[A-Z]{2}\s+\d{5}(?:-\d{4})?\b', '[ADDRESS]'),
-            
-            # Age and specific dates that could be identifying
-            (r'\b(?:age|aged)\s+\d{1,3}\b', '[AGE]'),
-            (r'\b\d{1,3}\s*(?:years?\s*old|y\.?o\.?)\b', '[AGE]'),
-            
-            # Hospital/Facility names (common patterns)
-            (r'\b[A-Z][a-z]+\s+(?:Hospital|Medical Center|Clinic|Healthcare|Health System)\b', '[FACILITY]'),
-            
-            # Provider names and credentials
-            (r'\bDr\.?\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\b', '[PROVIDER]'),
-            (r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?,\s*(?:MD|DO|NP|PA|RN)\b', '[PROVIDER]'),
-        ]
-        
-        redacted_text = text
-        for pattern, replacement in patterns:
-            redacted_text = re.sub(pattern, replacement, redacted_text, flags=re.IGNORECASE)
-        
-        # Additional sanitization - remove any remaining sequences that look like identifiers
-        # Remove sequences of digits that might be IDs (but preserve medical values)
-        redacted_text = re.sub(r'\b(?<![\d.])\d{6,}(?![\d.])\b', '[ID]', redacted_text)
+        # Names, contacts, dates, identifiers, addresses, ages, facilities and
+        # providers, matched in one pass (patterns in services/phi_redaction)
+        redacted_text = prompt_phi_redactor.redact(text)
         
         # Log redaction for audit purposes (without showing original content)
         if redacted_text != text:
@@ -789,11 +747,8 @@ PROFESSIONAL JUDGMENT REQUIRED: This automated analysis supports but does not re
         # Check if PHI redaction was needed (without exposing the PHI)
         if parameters:
             for key, value in parameters.items():
-                if isinstance(value, str) and value:
-                    original_value = value
-                    redacted_value = cls.redact_phi(value)
-                    if original_value != redacted_value:
-                        safe_summary["phi_redaction_applied"] = True
-                        break
+                if isinstance(value, str) and prompt_phi_redactor.contains_phi(value):
+                    safe_summary["phi_redaction_applied"] = True
+                    break
         
         return safe_summary
\ No newline at end of file
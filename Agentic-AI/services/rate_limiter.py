@@ -0,0 +1,192 @@
+"""Token-bucket rate limiting for outbound LLM API calls."""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+from loguru import logger
+
+
+class _TokenBucket:
+    """Bucket refilled continuously at ``per_minute / 60`` units per second.
+
+    A ``per_minute`` of 0 disables the bucket. The level may go negative when
+    actual usage exceeds the reservation; later callers then wait off the debt.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (0 if available now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float) -> None:
+        if not self.unlimited:
+            self._refill()
+            self.level -= amount
+
+    def refund(self, amount: float) -> None:
+        if not self.unlimited:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+
+    def available(self) -> Optional[float]:
+        if self.unlimited:
+            return None
+        self._refill()
+        return self.level
+
+
+class RateLimitReservation:
+    """Budget taken for one API call; reconcile it with the actual usage."""
+
+    def __init__(self, limiter: "LLMRateLimiter", tokens: int, wait_ms: float):
+        self._limiter = limiter
+        self.tokens = tokens
+        self.wait_ms = wait_ms
+
+    def record_usage(self, total_tokens: Optional[int]) -> None:
+        """Return unused tokens to the bucket, or charge any overrun."""
+        if total_tokens is None:
+            return
+        self._limiter._tokens.refund(self.tokens - total_tokens)
+        self.tokens = total_tokens
+
+
+class LLMRateLimiter:
+    """Concurrency-aware limiter for requests-per-minute and tokens-per-minute budgets.
+
+    Up to ``max_concurrency`` calls run at once. Each call reserves one request
+    and its estimated tokens from the buckets before starting; callers that do
+    not fit wait in FIFO order without blocking the event loop. Queue depth and
+    wait times are tracked for the metrics endpoint.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, max_concurrency: int,
+                 name: str = "llm"):
+        """Initialize limiter with per-minute budgets (0 disables a budget)."""
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self._requests = _TokenBucket(requests_per_minute)
+        self._tokens = _TokenBucket(tokens_per_minute)
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._budget_lock: Optional[asyncio.Lock] = None
+
+        self.queue_depth = 0
+        self.peak_queue_depth = 0
+        self.in_flight = 0
+        self.total_calls = 0
+        self.throttled_calls = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self._recent_waits: Deque[float] = deque(maxlen=1000)
+
+        logger.info(
+            f"LLMRateLimiter[{name}] initialized: rpm={requests_per_minute or 'unlimited'}, "
+            f"tpm={tokens_per_minute or 'unlimited'}, max_concurrency={max_concurrency}"
+        )
+
+    def _get_primitives(self):
+        # Created lazily so they bind to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._budget_lock = asyncio.Lock()
+        return self._semaphore, self._budget_lock
+
+    async def _reserve_budget(self, tokens: int) -> bool:
+        """Wait until one request and ``tokens`` tokens fit; returns True if throttled."""
+        throttled = False
+        _, budget_lock = self._get_primitives()
+        async with budget_lock:
+            while True:
+                wait_s = max(self._requests.time_until(1), self._tokens.time_until(tokens))
+                if wait_s <= 0:
+                    self._requests.consume(1)
+                    self._tokens.consume(tokens)
+                    return throttled
+                throttled = True
+                await asyncio.sleep(wait_s)
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int = 0) -> AsyncIterator[RateLimitReservation]:
+        """
+        Wait for a concurrency slot and budget, then hold the slot for the call.
+
+        Args:
+            estimated_tokens: Prompt plus expected completion tokens to reserve
+
+        Yields:
+            Reservation to reconcile with the actual token usage
+        """
+        semaphore, _ = self._get_primitives()
+        start_time = time.monotonic()
+        self.queue_depth += 1
+        self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+        try:
+            await semaphore.acquire()
+            try:
+                throttled = await self._reserve_budget(estimated_tokens)
+            except BaseException:
+                semaphore.release()
+                raise
+        finally:
+            self.queue_depth -= 1
+
+        wait_ms = (time.monotonic() - start_time) * 1000
+        self.total_calls += 1
+        self.throttled_calls += int(throttled)
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self._recent_waits.append(wait_ms)
+        if throttled:
+            logger.debug(f"LLMRateLimiter[{self.name}] throttled call for {wait_ms:.0f}ms")
+
+        self.in_flight += 1
+        try:
+            yield RateLimitReservation(self, estimated_tokens, wait_ms)
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics."""
+        waits = sorted(self._recent_waits)
+        p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+        requests_available = self._requests.available()
+        tokens_available = self._tokens.available()
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "total_calls": self.total_calls,
+            "throttled_calls": self.throttled_calls,
+            "avg_wait_ms": round(self.total_wait_ms / self.total_calls, 2) if self.total_calls else 0.0,
+            "p95_wait_ms": round(p95, 2),
+            "max_wait_ms": round(self.max_wait_ms, 2),
+            "requests_per_minute": int(self._requests.capacity),
+            "tokens_per_minute": int(self._tokens.capacity),
+            "requests_available": round(requests_available, 2) if requests_available is not None else None,
+            "tokens_available": round(tokens_available) if tokens_available is not None else None
+        }
@@ -0,0 +1,186 @@
+"""Background PDF report generation off the request path."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Set
+from loguru import logger
+
+from services.storage import storage_service
+
+
+class ReportJob:
+    """Status of one PDF report generation."""
+
+    def __init__(self, report_id: str, request_id: str):
+        self.report_id = report_id
+        self.request_id = request_id
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.completed_at: Optional[float] = None
+        self.pdf_id: Optional[str] = None
+        self.size_bytes: Optional[int] = None
+        self.error: Optional[str] = None
+        self.done = asyncio.Event()
+
+    @property
+    def download_url(self) -> Optional[str]:
+        return f"/api/reports/{self.pdf_id}" if self.pdf_id else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        generation_ms = None
+        if self.started_at and self.completed_at:
+            generation_ms = round((self.completed_at - self.started_at) * 1000, 2)
+        return {
+            "report_id": self.report_id,
+            "request_id": self.request_id,
+            "status": self.status,
+            "pdf_id": self.pdf_id,
+            "download_url": self.download_url,
+            "file_size": self.size_bytes,
+            "filename": f"orthoassist_report_{self.request_id}.pdf",
+            "created_at": self.created_at,
+            "generation_time_ms": generation_ms,
+            "error": self.error
+        }
+
+
+class ReportJobService:
+    """Runs PDF report generation on a dedicated worker pool.
+
+    ``submit`` returns immediately with a job; the PDF is rendered on a worker
+    thread using the in-memory images handed over by the request (no
+    re-download from Cloudinary), stored via ``storage_service`` and exposed
+    through ``/api/reports/{report_id}/status``. Finished jobs are kept for
+    the most recent ``max_jobs`` reports.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_jobs: Optional[int] = None):
+        """Initialize service from arguments or application config."""
+        try:
+            from app.config import config
+            self.max_workers = max_workers or config.report_workers
+            self.max_jobs = max_jobs or config.report_job_history
+        except Exception:
+            # Fallback for testing
+            self.max_workers = max_workers or 2
+            self.max_jobs = max_jobs or 1000
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: "OrderedDict[str, ReportJob]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+        logger.info(f"ReportJobService initialized with {self.max_workers} workers")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="report")
+        return self._executor
+
+    def submit(self, request_id: str, analysis_data: Dict[str, Any],
+               patient_info: Optional[Dict[str, Any]] = None,
+               original_image: Any = None, annotated_image: Any = None) -> ReportJob:
+        """
+        Queue PDF generation for an analysis.
+
+        Args:
+            request_id: Analysis request ID (also used as the report ID)
+            analysis_data: Analysis response data rendered into the report
+            patient_info: Optional patient information
+            original_image: DecodedImage of the upload, embedded directly
+            annotated_image: DecodedImage of the annotated image, embedded directly
+
+        Returns:
+            The queued job
+        """
+        job = ReportJob(report_id=request_id, request_id=request_id)
+        with self._lock:
+            self._jobs[job.report_id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+        task = asyncio.get_running_loop().create_task(
+            self._run(job, analysis_data, patient_info, original_image, annotated_image)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        logger.info(f"Queued PDF report {job.report_id}")
+        return job
+
+    async def _run(self, job: ReportJob, analysis_data: Dict[str, Any], patient_info: Optional[Dict[str, Any]],
+                   original_image: Any, annotated_image: Any) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            job.pdf_id, job.size_bytes = await loop.run_in_executor(
+                self._get_executor(), self._generate, job, analysis_data, patient_info,
+                original_image, annotated_image
+            )
+            job.status = "completed"
+            logger.info(f"PDF report {job.report_id} generated ({job.size_bytes} bytes) as {job.pdf_id}")
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"PDF report {job.report_id} generation failed: {e}")
+        finally:
+            job.completed_at = time.time()
+            job.done.set()
+
+    def _generate(self, job: ReportJob, analysis_data: Dict[str, Any], patient_info: Optional[Dict[str, Any]],
+                  original_image: Any, annotated_image: Any):
+        """Render and store the PDF (runs on a worker thread)."""
+        from agents.pdf_report import pdf_report_agent
+
+        job.status = "running"
+        job.started_at = time.time()
+        pdf_bytes = pdf_report_agent.generate_report(
+            analysis_data=analysis_data,
+            patient_info=patient_info,
+            original_image=original_image,
+            annotated_image=annotated_image
+        )
+        pdf_id = storage_service.store_file(pdf_bytes, "report", "pdf")
+        return pdf_id, len(pdf_bytes)
+
+    def get(self, report_id: str) -> Optional[ReportJob]:
+        """Get a job by report ID."""
+        with self._lock:
+            return self._jobs.get(report_id)
+
+    async def wait(self, report_id: str, timeout: Optional[float] = None) -> Optional[ReportJob]:
+        """Wait for a job to finish (or ``timeout`` seconds) and return it."""
+        job = self.get(report_id)
+        if job is None:
+            return None
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get job counts by status."""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": self.max_workers,
+            "jobs": counts,
+            "in_flight": len(self._tasks)
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        logger.info("ReportJobService shut down")
+
+
+# Global report job service instance
+report_job_service = ReportJobService()
@@ -0,0 +1,277 @@
+"""Bounded, expiring stores for per-request state."""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from loguru import logger
+
+
+# Expired rows are swept at most this often (seconds); reads skip them anyway
+_PURGE_INTERVAL = 60.0
+
+
+class MemoryRequestStore:
+    """Per-process TTL + LRU store holding live objects.
+
+    Entries expire ``ttl_seconds`` after their last write and the least
+    recently written entries are evicted beyond ``max_entries``, so memory
+    stays bounded in long-running workers.
+    """
+
+    def __init__(self, namespace: str, max_entries: int = 10000, ttl_seconds: int = 86400):
+        """Initialize store with size and age bounds."""
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_purge = time.monotonic()
+
+        self.expirations = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Insert or refresh a value."""
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        if now - self._last_purge > _PURGE_INTERVAL:
+            self.purge_expired()
+
+    def delete(self, key: str) -> bool:
+        """Remove a value; returns True if one existed."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def recent(self, limit: int = 50) -> List[Any]:
+        """Most recently written live values, newest first."""
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for expires_at, value in reversed(self._entries.values()):
+                if expires_at > now:
+                    values.append(value)
+                    if len(values) >= limit:
+                        break
+        return values
+
+    def purge_expired(self) -> int:
+        """Drop expired entries; returns how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            self._last_purge = now
+            expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+            self.expirations += len(expired)
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        return {
+            "backend": "memory",
+            "namespace": self.namespace,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "expirations": self.expirations,
+            "evictions": self.evictions
+        }
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS request_state (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_request_state_expiry ON request_state (namespace, expires_at);
+CREATE INDEX IF NOT EXISTS idx_request_state_updated ON request_state (namespace, updated_at);
+"""
+
+
+class SQLiteRequestStore:
+    """Request state shared by every worker process through one SQLite file.
+
+    Values are serialized with ``encode``/``decode`` on every write/read, so
+    callers see snapshots rather than live objects. WAL mode lets uvicorn
+    workers read concurrently while one writes. Expired rows are invisible to
+    reads and swept periodically; rows beyond ``max_entries`` (oldest first)
+    are dropped in the same sweep.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        namespace: str,
+        encode: Callable[[Any], str],
+        decode: Callable[[str], Any],
+        max_entries: int = 10000,
+        ttl_seconds: int = 86400
+    ):
+        """Initialize store; the database is opened on first use."""
+        self.db_path = Path(db_path)
+        self.namespace = namespace
+        self.encode = encode
+        self.decode = decode
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+
+        self.expirations = 0
+        self.evictions = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            logger.debug(f"Request store '{self.namespace}' opened at {self.db_path}")
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, or None if missing or expired."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT payload FROM request_state WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (self.namespace, key, time.time())
+            ).fetchone()
+        return self.decode(row[0]) if row else None
+
+    def put(self, key: str, value: Any) -> None:
+        """Insert or refresh a value."""
+        payload = self.encode(value)
+        now = time.time()
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO request_state VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, payload, now, now + self.ttl_seconds)
+            )
+        if now - self._last_purge > _PURGE_INTERVAL:
+            self.purge_expired()
+
+    def delete(self, key: str) -> bool:
+        """Remove a value; returns True if one existed."""
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM request_state WHERE namespace = ? AND key = ?", (self.namespace, key)
+            )
+        return cursor.rowcount > 0
+
+    def recent(self, limit: int = 50) -> List[Any]:
+        """Most recently written live values, newest first."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT payload FROM request_state WHERE namespace = ? AND expires_at > ? "
+                "ORDER BY updated_at DESC LIMIT ?",
+                (self.namespace, time.time(), limit)
+            ).fetchall()
+        return [self.decode(row[0]) for row in rows]
+
+    def purge_expired(self) -> int:
+        """Drop expired rows and rows beyond ``max_entries``; returns how many were removed."""
+        now = time.time()
+        with self._lock:
+            self._last_purge = now
+            conn = self._connection()
+            expired = conn.execute(
+                "DELETE FROM request_state WHERE namespace = ? AND expires_at <= ?", (self.namespace, now)
+            ).rowcount
+            evicted = conn.execute(
+                "DELETE FROM request_state WHERE namespace = ? AND key IN ("
+                "SELECT key FROM request_state WHERE namespace = ? ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_entries)
+            ).rowcount
+        self.expirations += expired
+        self.evictions += evicted
+        return expired + evicted
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT COUNT(*) FROM request_state WHERE namespace = ? AND expires_at > ?",
+                (self.namespace, time.time())
+            ).fetchone()
+        return row[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        return {
+            "backend": "sqlite",
+            "namespace": self.namespace,
+            "path": str(self.db_path),
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "expirations": self.expirations,
+            "evictions": self.evictions
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_request_store(namespace: str, encode: Callable[[Any], str], decode: Callable[[str], Any]):
+    """
+    Create the request store configured by REQUEST_STORE_BACKEND.
+
+    Args:
+        namespace: Separates the kinds of state kept in one database
+        encode: Serializes a value for the SQLite backend
+        decode: Restores a value serialized by ``encode``
+
+    Returns:
+        MemoryRequestStore or SQLiteRequestStore
+    """
+    try:
+        from app.config import config
+        backend = config.request_store_backend
+        db_path = config.request_store_path
+        max_entries = config.request_store_max_entries
+        ttl_seconds = config.request_store_ttl_seconds
+    except Exception:
+        # Fallback for testing
+        backend = "memory"
+        db_path = Path("./storage/request_state.sqlite3")
+        max_entries = 10000
+        ttl_seconds = 86400
+
+    if backend == "sqlite":
+        return SQLiteRequestStore(db_path, namespace, encode, decode, max_entries=max_entries, ttl_seconds=ttl_seconds)
+    return MemoryRequestStore(namespace, max_entries=max_entries, ttl_seconds=ttl_seconds)
@@ -0,0 +1,283 @@
+"""Content-addressed cache for detection, triage and diagnosis results."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from uuid import UUID
+from loguru import logger
+
+from services.decoded_image import DecodedImage
+from services.model_registry import model_registry
+
+
+class InferenceResultCache:
+    """Two-tier (memory LRU + disk) cache for per-image analysis results.
+
+    Keys combine the SHA-256 of the decoded pixels, the SHA-256 of the model
+    that produced the result and the policy configuration hash, so re-uploads
+    of the same X-ray hit the cache while any model or threshold change misses.
+    Entries are grouped by model type on disk and dropped when
+    ``ModelRegistry.activate_version`` swaps that model. The disk tier is
+    bounded by ``disk_max_bytes``, least recently used files deleted first;
+    files written by other worker processes are counted when the directory
+    is first scanned. Results derived from patient input are kept in memory
+    only (``memory_only=True``).
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: Optional[int] = None,
+                 enabled: Optional[bool] = None, disk_enabled: Optional[bool] = None,
+                 disk_max_bytes: Optional[int] = None):
+        """Initialize cache from arguments or application config."""
+        try:
+            from app.config import config
+            self.cache_dir = Path(cache_dir or config.storage_path / "result_cache")
+            self.max_entries = max_entries or config.result_cache_max_entries
+            self.enabled = config.result_cache_enabled if enabled is None else enabled
+            self.disk_enabled = config.result_cache_disk_enabled if disk_enabled is None else disk_enabled
+            self.disk_max_bytes = disk_max_bytes or config.result_cache_disk_max_bytes
+        except Exception:
+            # Fallback for testing
+            self.cache_dir = Path(cache_dir or "./storage/result_cache")
+            self.max_entries = max_entries or 256
+            self.enabled = True if enabled is None else enabled
+            self.disk_enabled = True if disk_enabled is None else disk_enabled
+            self.disk_max_bytes = disk_max_bytes or 64 * 1024 * 1024
+
+        self._memory: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._model_file_hashes: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+
+        # Disk files in LRU order with their sizes; loaded on first disk access
+        self._disk_files: "Optional[OrderedDict[Path, int]]" = None
+        self._disk_bytes = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.disk_evictions = 0
+
+        model_registry.add_activation_listener(self._on_model_activated)
+        logger.info(
+            f"InferenceResultCache initialized: enabled={self.enabled}, max_entries={self.max_entries}, "
+            f"disk={'on' if self.disk_enabled else 'off'} ({self.cache_dir})"
+        )
+
+    def _model_sha(self, model_type: str, model_path: Optional[Union[str, Path]]) -> str:
+        """Identify the weights in use, preferring the registry's recorded SHA."""
+        active_version = model_registry.get_active_version(model_type)
+        if active_version:
+            info = model_registry.get_model_info(model_type, active_version)
+            if info and (model_path is None or Path(info["file_path"]).resolve() == Path(model_path).resolve()):
+                return info["sha256"]
+
+        if model_path is None or not Path(model_path).exists():
+            return "unversioned"
+
+        # Weights loaded outside the registry: hash the file once per (path, size, mtime)
+        stat = Path(model_path).stat()
+        memo_key = (str(Path(model_path).resolve()), stat.st_size, stat.st_mtime_ns)
+        sha = self._model_file_hashes.get(memo_key)
+        if sha is None:
+            digest = hashlib.sha256()
+            with open(model_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            sha = digest.hexdigest()
+            self._model_file_hashes[memo_key] = sha
+        return sha
+
+    def image_key(self, image: DecodedImage, model_type: str, stage: str,
+                  model_path: Optional[Union[str, Path]] = None,
+                  request_id: Optional[UUID] = None,
+                  context: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key for a result derived from an image.
+
+        Args:
+            image: Decoded image the result was computed from
+            model_type: Model that produced the detections (hand, leg)
+            stage: Result kind, e.g. "detection" or "assessment"
+            model_path: Weights loaded by the agent
+            request_id: Request whose policy overrides apply (default config if None)
+            context: Other inputs the result depends on (symptoms, body part, ...)
+
+        Returns:
+            Hex SHA-256 cache key
+        """
+        from services.policies import policy_service
+
+        key_material = {
+            "stage": stage,
+            "pixels": image.pixel_sha256,
+            "model_type": model_type,
+            "model_sha": self._model_sha(model_type, model_path),
+            "config_hash": policy_service.get_config_hash(request_id),
+            "context": context or {}
+        }
+        return hashlib.sha256(json.dumps(key_material, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _disk_path(self, model_type: str, key: str) -> Path:
+        return self.cache_dir / model_type / key[:2] / f"{key}.json"
+
+    def _disk_index(self) -> "OrderedDict[Path, int]":
+        # Caller holds the lock
+        if self._disk_files is None:
+            files = []
+            for path in self.cache_dir.glob("*/*/*.json"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, path, stat.st_size))
+            self._disk_files = OrderedDict((path, size) for _, path, size in sorted(files))
+            self._disk_bytes = sum(self._disk_files.values())
+        return self._disk_files
+
+    def _track_disk_file(self, path: Path, size: int) -> List[Path]:
+        """Record a written file and return the files to delete to stay under ``disk_max_bytes``."""
+        with self._lock:
+            files = self._disk_index()
+            self._disk_bytes += size - files.pop(path, 0)
+            files[path] = size
+            evicted = []
+            while self._disk_bytes > self.disk_max_bytes and len(files) > 1:
+                old_path, old_size = files.popitem(last=False)
+                self._disk_bytes -= old_size
+                evicted.append(old_path)
+            self.disk_evictions += len(evicted)
+            return evicted
+
+    def _forget_disk_files(self, removed: Path) -> None:
+        """Stop tracking a deleted file, or every file under a deleted directory."""
+        with self._lock:
+            if self._disk_files is None:
+                return
+            for path in [path for path in self._disk_files if path == removed or removed in path.parents]:
+                self._disk_bytes -= self._disk_files.pop(path)
+
+    def get(self, key: str, model_type: str, memory_only: bool = False) -> Optional[Dict[str, Any]]:
+        """Look up a result in memory, then on disk (unless ``memory_only``)."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        if self.disk_enabled and not memory_only:
+            path = self._disk_path(model_type, key)
+            try:
+                with open(path, "r") as f:
+                    value = json.load(f)
+                self._remember(key, model_type, value)
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    if path in self._disk_index():
+                        self._disk_files.move_to_end(path)
+                return value
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Discarding unreadable result cache entry {path}: {e}")
+                path.unlink(missing_ok=True)
+                self._forget_disk_files(path)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, model_type: str, value: Dict[str, Any], memory_only: bool = False) -> None:
+        """
+        Store a JSON-serializable result.
+
+        Args:
+            key: Key from ``image_key``
+            model_type: Model that produced the result
+            value: Result to cache
+            memory_only: Keep the result out of the disk tier (e.g. derived from symptoms)
+        """
+        if not self.enabled:
+            return
+
+        self._remember(key, model_type, value)
+
+        if self.disk_enabled and not memory_only:
+            path = self._disk_path(model_type, key)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                with open(tmp_path, "w") as f:
+                    json.dump(value, f, default=str)
+                size = tmp_path.stat().st_size
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.warning(f"Failed to persist result cache entry {key[:12]}: {e}")
+                return
+            for evicted_path in self._track_disk_file(path, size):
+                evicted_path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, model_type: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = (model_type, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def invalidate_model(self, model_type: str) -> None:
+        """Drop every cached result produced by a model type."""
+        with self._lock:
+            stale = [key for key, (entry_type, _) in self._memory.items() if entry_type == model_type]
+            for key in stale:
+                del self._memory[key]
+            self.invalidations += 1
+
+        if self.disk_enabled:
+            shutil.rmtree(self.cache_dir / model_type, ignore_errors=True)
+            self._forget_disk_files(self.cache_dir / model_type)
+
+        logger.info(f"Invalidated {len(stale)} in-memory result cache entries for {model_type} model")
+
+    def _on_model_activated(self, model_type: str, version: str) -> None:
+        self.invalidate_model(model_type)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._memory.clear()
+            self._disk_files = None
+            self._disk_bytes = 0
+        if self.disk_enabled:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "disk_enabled": self.disk_enabled,
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "disk_bytes": self._disk_bytes,
+                "disk_max_bytes": self.disk_max_bytes,
+                "disk_evictions": self.disk_evictions
+            }
+
+
+# Global inference result cache instance
+result_cache = InferenceResultCache()
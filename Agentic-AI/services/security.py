@@ -2,15 +2,18 @@
 
 import hashlib
 import hmac
+import re
 import secrets
-import time
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional
 from datetime import datetime, timezone, timedelta
 from uuid import UUID
 from loguru import logger
 
 from app.config import config
 from services.error_handler import ValidationError, ErrorCode
+from services.phi_redaction import error_message_redactor
+from services.client_rate_limiter import RateLimitDecision, client_rate_limiter
 
 
 class SecurityError(Exception):
@@ -45,16 +48,22 @@ class DataSanitizer:
         "groq_api_key", "aws_access_key", "aws_secret_access_key"
     ]
     
+    # Any PHI or secret pattern as a substring, checked once per distinct key
+    _SENSITIVE_KEY_PATTERN = re.compile("|".join(re.escape(pattern) for pattern in PHI_PATTERNS + SENSITIVE_CONFIG_KEYS))
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _is_sensitive_key(key: str) -> bool:
+        return DataSanitizer._SENSITIVE_KEY_PATTERN.search(key.lower()) is not None
+    
     @classmethod
     def sanitize_for_logging(cls, data: Any) -> Any:
         """Sanitize data for safe logging (removes PHI and secrets)."""
         if isinstance(data, dict):
             sanitized = {}
             for key, value in data.items():
-                key_lower = key.lower()
-                
                 # Check if key contains sensitive patterns
-                if any(pattern in key_lower for pattern in cls.PHI_PATTERNS + cls.SENSITIVE_CONFIG_KEYS):
+                if cls._is_sensitive_key(key):
                     sanitized[key] = "[REDACTED]"
                 else:
                     sanitized[key] = cls.sanitize_for_logging(value)
@@ -87,17 +96,8 @@ class DataSanitizer:
             else:
                 return str(error_message)
         
-        # Remove file paths that might contain sensitive info
-        import re
-        
-        # Remove absolute paths
-        error_message = re.sub(r'/[^\s]+', '[PATH_REDACTED]', error_message)
-        error_message = re.sub(r'C:\\[^\s]+', '[PATH_REDACTED]', error_message)
-        
-        # Remove potential API keys or tokens in error messages (alphanumeric strings > 15 chars)
-        error_message = re.sub(r'\b[a-zA-Z0-9]{16,}\b', '[TOKEN_REDACTED]', error_message)
-        
-        return error_message
+        # Remove absolute paths and potential API keys or tokens in one pass
+        return error_message_redactor.redact(error_message)
     
     @classmethod
     def validate_request_data(cls, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -230,7 +230,7 @@ class RequestValidator:
     }
     
     def __init__(self):
-        self.request_history: Dict[str, List[float]] = {}
+        self.rate_limiter = client_rate_limiter
     
     def validate_analyze_request(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and sanitize analyze request."""
@@ -286,39 +286,36 @@ class RequestValidator:
     
     def check_rate_limit(self, client_id: str, endpoint: str) -> bool:
         """Check if request is within rate limits."""
-        try:
-            current_time = time.time()
-            
-            # Get rate limit config for endpoint
-            if endpoint not in self.RATE_LIMITS:
-                return True  # No rate limit configured
-            
-            limit_config = self.RATE_LIMITS[endpoint]
-            window_seconds = limit_config["window_minutes"] * 60
-            max_requests = limit_config["requests"]
-            
-            # Initialize client history if needed
-            if client_id not in self.request_history:
-                self.request_history[client_id] = []
-            
-            # Clean old requests outside the window
-            client_requests = self.request_history[client_id]
-            client_requests[:] = [req_time for req_time in client_requests 
-                                if current_time - req_time < window_seconds]
-            
-            # Check if within limit
-            if len(client_requests) >= max_requests:
-                logger.warning(f"Rate limit exceeded for client {client_id} on endpoint {endpoint}")
-                return False
-            
-            # Add current request
-            client_requests.append(current_time)
-            return True
+        return self.rate_limit(client_id, endpoint).allowed
+    
+    def rate_limit(self, client_id: str, endpoint: str) -> RateLimitDecision:
+        """
+        Check and count a request against its endpoint's rate limit.
+        
+        Args:
+            client_id: Client identifier (e.g. IP address)
+            endpoint: Endpoint type (key of ``RATE_LIMITS``)
             
+        Returns:
+            RateLimitDecision with the seconds to wait when rejected
+        """
+        # Get rate limit config for endpoint
+        limit_config = self.RATE_LIMITS.get(endpoint)
+        if limit_config is None:
+            return RateLimitDecision(True, 0, 0, 0.0)  # No rate limit configured
+        
+        try:
+            decision = self.rate_limiter.check(
+                client_id, endpoint, limit_config["requests"], limit_config["window_minutes"] * 60
+            )
         except Exception as e:
             logger.error(f"Error checking rate limit: {e}")
             # Allow request on error to avoid blocking legitimate traffic
-            return True
+            return RateLimitDecision(True, limit_config["requests"], 0, 0.0)
+        
+        if not decision.allowed:
+            logger.warning(f"Rate limit exceeded for client {client_id} on endpoint {endpoint}")
+        return decision
 
 
 def verify_api_key(api_key: Optional[str] = None) -> Optional[str]:
@@ -0,0 +1,146 @@
+"""Speculative fracture detection overlapped with body-part routing."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+from loguru import logger
+
+from services.decoded_image import DecodedImage
+from services.policies import policy_service
+
+
+DETECTORS = ("hand", "leg")
+
+
+def aspect_ratio_prior(image: DecodedImage) -> Tuple[str, float]:
+    """
+    Cheap body-part guess from the image shape (wide: hand, tall: leg).
+
+    Returns:
+        Tuple of (body_part, confidence)
+    """
+    aspect_ratio = image.aspect_ratio
+    if aspect_ratio > 1.2:  # Wide image - likely hand
+        return "hand", 0.75
+    if aspect_ratio < 0.8:  # Tall image - likely leg
+        return "leg", 0.80
+    return "hand", 0.60  # Square-ish - default to hand
+
+
+class SpeculativeDetection:
+    """Starts detectors in parallel with routing instead of after it.
+
+    A cheap prior (``aspect_ratio_prior``) decides what to speculate on,
+    using the policy's confidence band:
+
+    - prior >= ``band_high``: start the likely detector only
+    - ``band_low`` <= prior < ``band_high``: start both detectors
+    - prior < ``band_low``: no speculation, wait for the router
+
+    When the router decides, a speculative run for the chosen body part is
+    awaited (hit); otherwise the chosen detector starts then (miss). Losing
+    branches are cancelled; inference already batched still completes and
+    its result is discarded.
+    """
+
+    def __init__(self):
+        """Initialize counters."""
+        self.requests = 0
+        self.speculated = 0
+        self.hits = 0
+        self.misses = 0
+        self.cancelled = 0
+
+    def plan(self, prior_part: str, prior_confidence: float, policy: Dict[str, Any]) -> List[str]:
+        """Detectors to start before routing finishes."""
+        if not policy["enabled"] or prior_confidence < policy["band_low"]:
+            return []
+        if prior_confidence >= policy["band_high"]:
+            return [prior_part]
+        return list(DETECTORS)
+
+    async def route_and_detect(
+        self,
+        image: DecodedImage,
+        route: Callable[[], Awaitable[Tuple[str, float]]],
+        detect: Callable[[str], Awaitable[Dict[str, Any]]],
+        request_id: Optional[UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Route the image and run the matching detector, speculating per policy.
+
+        Args:
+            image: Decoded upload
+            route: Coroutine factory returning the final (body_part, confidence);
+                body_part must be "hand" or "leg". Its model call must run off the
+                event loop, or the speculative detectors only start once it returns
+            detect: Coroutine factory running the detector for a body part
+            request_id: Request whose policy applies (default policy if None)
+
+        Returns:
+            Dict with body_part, confidence, detection result and speculation details
+        """
+        self.requests += 1
+        start_time = time.perf_counter()
+        prior_part, prior_confidence = aspect_ratio_prior(image)
+        speculative = self.plan(prior_part, prior_confidence, policy_service.get_speculation_policy(request_id))
+
+        tasks = {part: asyncio.create_task(detect(part)) for part in speculative}
+        for task in tasks.values():
+            # Losing branches may fail after being abandoned; don't log them as unhandled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        if tasks:
+            self.speculated += 1
+            logger.debug(f"Speculatively started {speculative} (prior {prior_part} {prior_confidence:.2f})")
+
+        try:
+            body_part, confidence = await route()
+            routed_ms = (time.perf_counter() - start_time) * 1000
+
+            for part, task in tasks.items():
+                if part != body_part:
+                    task.cancel()
+                    self.cancelled += 1
+
+            winner = tasks.get(body_part)
+            if winner is not None:
+                self.hits += 1
+                result = await winner
+            else:
+                if tasks:
+                    self.misses += 1
+                result = await detect(body_part)
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+
+        return {
+            "body_part": body_part,
+            "confidence": confidence,
+            "result": result,
+            "speculation": {
+                "prior": prior_part,
+                "prior_confidence": prior_confidence,
+                "started": speculative,
+                "hit": winner is not None,
+                "route_ms": round(routed_ms, 2),
+                "total_ms": round((time.perf_counter() - start_time) * 1000, 2)
+            }
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get speculation statistics."""
+        return {
+            "requests": self.requests,
+            "speculated": self.speculated,
+            "hits": self.hits,
+            "misses": self.misses,
+            "cancelled": self.cancelled,
+            "hit_rate": round(self.hits / self.speculated, 3) if self.speculated else 0.0
+        }
+
+
+# Global speculative detection instance
+speculative_detection = SpeculativeDetection()
@@ -0,0 +1,34 @@
+"""Server-Sent Events helpers for streaming endpoints."""
+
+import json
+from typing import Any, AsyncIterator, Optional
+from fastapi.responses import StreamingResponse
+
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """Format one SSE frame; ``data`` is sent as JSON.
+
+    ``event_id`` is echoed back by browsers as ``Last-Event-ID`` on reconnect.
+    """
+    payload = json.dumps(data, default=str)
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event}\ndata: {payload}\n\n"
+
+
+def format_sse_comment(text: str = "keepalive") -> str:
+    """Format an SSE comment line, ignored by clients; keeps idle streams open."""
+    return f": {text}\n\n"
+
+
+def sse_response(frames: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap an async iterator of formatted frames in an unbuffered SSE response."""
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            # Stop reverse proxies (nginx) from buffering the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -0,0 +1,172 @@
+"""Fan-out hub for orchestrator step transitions (SSE progress streams)."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from loguru import logger
+
+from schemas.orchestrator import ProcessingStep, StepGraph
+
+
+def step_event_data(step_graph: StepGraph, step: ProcessingStep) -> Dict[str, Any]:
+    """Payload of a ``step`` event."""
+    return {
+        "request_id": str(step_graph.request_id),
+        "name": step.name,
+        "status": step.status,
+        "confidence": step.confidence,
+        "duration_ms": step.duration_ms,
+        "artifacts": step.artifacts,
+        "error_message": step.error_message,
+        "retry_count": step.retry_count,
+        "started_at": step.started_at.isoformat() if step.started_at else None,
+        "completed_at": step.completed_at.isoformat() if step.completed_at else None
+    }
+
+
+class _Topic:
+    """Event log of one request; subscribers read it with their own cursor."""
+
+    def __init__(self):
+        self.events: List[Tuple[str, Dict[str, Any]]] = []
+        self.step_states: Dict[str, Tuple[str, int]] = {}
+        self.changed = asyncio.Event()
+        self.closed = False
+        self.closed_at: Optional[float] = None
+        self.subscribers = 0
+
+    def append(self, event: str, data: Dict[str, Any]) -> None:
+        self.events.append((event, data))
+        # One set() wakes every waiting subscriber; publishing cost does not
+        # depend on how many clients are listening
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class StepEventHub:
+    """Publishes step transitions to any number of SSE subscribers.
+
+    Each request gets an append-only event log. ``publish_step_graph`` diffs
+    the graph against what was already published and appends one ``step``
+    event per transition, and ``publish`` appends other events such as the
+    ``job`` state of a queued analysis; subscribers replay the log from their cursor and
+    then wait on a shared event, so late joiners see the full history and
+    reconnecting clients resume from ``Last-Event-ID``. Finished requests are
+    kept for ``retention_seconds``; at most ``max_topics`` requests are
+    tracked.
+    """
+
+    def __init__(self, max_topics: int = 1000, retention_seconds: int = 300, keepalive_seconds: float = 15.0):
+        """Initialize hub with size and retention bounds."""
+        self.max_topics = max_topics
+        self.retention_seconds = retention_seconds
+        self.keepalive_seconds = keepalive_seconds
+
+        self._topics: "OrderedDict[str, _Topic]" = OrderedDict()
+
+        self.published = 0
+        self.subscriptions = 0
+
+    def _topic(self, request_id: str) -> _Topic:
+        topic = self._topics.get(request_id)
+        if topic is None:
+            self._prune()
+            topic = _Topic()
+            self._topics[request_id] = topic
+        return topic
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        expired = [
+            request_id for request_id, topic in self._topics.items()
+            if topic.closed and now - topic.closed_at > self.retention_seconds
+        ]
+        for request_id in expired:
+            del self._topics[request_id]
+        while len(self._topics) >= self.max_topics:
+            # Oldest first; wake its subscribers so they don't wait forever
+            _, topic = self._topics.popitem(last=False)
+            if not topic.closed:
+                topic.closed = True
+                topic.append("end", {"status": "evicted"})
+
+    def publish_step_graph(self, step_graph: StepGraph) -> None:
+        """Append a ``step`` event for every step whose status changed since the last call."""
+        topic = self._topic(str(step_graph.request_id))
+        if topic.closed:
+            return
+        for step in step_graph.steps:
+            state = (step.status, step.retry_count)
+            if topic.step_states.get(step.name) != state:
+                topic.step_states[step.name] = state
+                topic.append("step", step_event_data(step_graph, step))
+                self.published += 1
+
+    def publish(self, request_id: str, event: str, data: Dict[str, Any]) -> None:
+        """Append an event that is not a step transition."""
+        topic = self._topic(request_id)
+        if topic.closed:
+            return
+        topic.append(event, data)
+        self.published += 1
+
+    def close(self, request_id: str, data: Dict[str, Any]) -> None:
+        """Append the final ``end`` event and stop accepting transitions."""
+        topic = self._topic(request_id)
+        if topic.closed:
+            return
+        topic.closed = True
+        topic.closed_at = time.monotonic()
+        topic.append("end", data)
+
+    def has_topic(self, request_id: str) -> bool:
+        return request_id in self._topics
+
+    async def subscribe(self, request_id: str, last_event_id: Optional[int] = None) -> AsyncIterator[Tuple[Optional[int], str, Dict[str, Any]]]:
+        """
+        Yield (event_id, event, data) for a request, replaying history first.
+
+        Yields ``(None, "keepalive", {})`` after ``keepalive_seconds`` without
+        events. Ends after the ``end`` event.
+
+        Args:
+            request_id: Request to follow
+            last_event_id: Last event ID the client received, to resume after it
+        """
+        topic = self._topic(request_id)
+        cursor = last_event_id + 1 if last_event_id is not None else 0
+        topic.subscribers += 1
+        self.subscriptions += 1
+        logger.debug(f"Step event subscriber joined {request_id} ({topic.subscribers} listening)")
+        try:
+            while True:
+                while cursor < len(topic.events):
+                    event, data = topic.events[cursor]
+                    yield cursor, event, data
+                    cursor += 1
+                    if event == "end":
+                        return
+                if topic.closed:
+                    return
+                changed = topic.changed
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield None, "keepalive", {}
+        finally:
+            topic.subscribers -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hub statistics."""
+        return {
+            "topics": len(self._topics),
+            "open_topics": sum(1 for topic in self._topics.values() if not topic.closed),
+            "subscribers": sum(topic.subscribers for topic in self._topics.values()),
+            "published": self.published,
+            "subscriptions": self.subscriptions
+        }
+
+
+# Global step event hub instance
+step_event_hub = StepEventHub()
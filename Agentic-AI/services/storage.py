@@ -2,13 +2,15 @@
 
 import os
 import hashlib
-from typing import Dict, Any, Optional, BinaryIO, Union
+from typing import Dict, Any, Iterator, Optional, BinaryIO, Union
 from pathlib import Path
 from uuid import uuid4
 from datetime import datetime, timedelta
 from loguru import logger
 import io
 
+from services.storage_index import StorageIndex
+
 try:
     import pymongo
     from pymongo import MongoClient
@@ -23,6 +25,58 @@ except ImportError:
     NoFile = Exception
 
 
+class StoredFile:
+    """Metadata for a stored file plus a lazy, range-capable byte stream.
+    
+    Nothing is read until ``iter_bytes`` is consumed, so size/ETag checks
+    (HEAD, If-None-Match) never touch file contents.
+    """
+    
+    def __init__(self, file_id: str, size: int, content_type: str, sha256: Optional[str] = None,
+                 created_at: Optional[float] = None, path: Optional[Path] = None, grid_out: Any = None):
+        self.file_id = file_id
+        self.size = size
+        self.content_type = content_type
+        self.sha256 = sha256
+        self.created_at = created_at
+        self.path = path  # Local backend only; enables sendfile
+        self._grid_out = grid_out
+    
+    @property
+    def etag(self) -> str:
+        """Strong ETag derived from the content hash."""
+        return f'"{self.sha256}"' if self.sha256 else f'"{self.file_id}-{self.size}"'
+    
+    def iter_bytes(self, start: int = 0, end: Optional[int] = None, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Yield the bytes in ``[start, end]`` (inclusive, like HTTP ranges) in chunks.
+        
+        Args:
+            start: First byte offset
+            end: Last byte offset (defaults to end of file)
+            chunk_size: Maximum chunk size
+        """
+        end = self.size - 1 if end is None else min(end, self.size - 1)
+        remaining = end - start + 1
+        
+        if self.path is not None:
+            stream = open(self.path, 'rb')
+        else:
+            stream = self._grid_out
+        
+        try:
+            stream.seek(start)
+            while remaining > 0:
+                chunk = stream.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            if self.path is not None:
+                stream.close()
+
+
 class StorageService:
     """Service for managing file storage (local filesystem or MongoDB GridFS)."""
     
@@ -63,6 +117,37 @@ class StorageService:
             path.mkdir(parents=True, exist_ok=True)
         
         logger.debug(f"Local storage directories created at {self.storage_path}")
+        
+        # file_id -> path index; rebuilt from disk if missing (e.g. first run after upgrade)
+        index_path = self.storage_path / "index.sqlite3"
+        is_new_index = not index_path.exists()
+        self.index = StorageIndex(index_path)
+        if is_new_index and self._has_local_files():
+            self.rebuild_index()
+    
+    def _local_dir(self, file_type: str) -> Path:
+        """Get the storage directory for a file type."""
+        if file_type == "raw":
+            return self.raw_path
+        elif file_type == "annotated":
+            return self.annotated_path
+        elif file_type == "report":
+            return self.reports_path
+        elif file_type == "manifest":
+            return self.manifests_path
+        else:
+            raise ValueError(f"Unknown file type: {file_type}")
+    
+    def _shard_dir(self, storage_dir: Path, file_id: str) -> Path:
+        """Two-level hashed subdirectory (256 x 256) so no directory grows unbounded."""
+        digest = hashlib.md5(file_id.encode()).hexdigest()
+        return storage_dir / digest[:2] / digest[2:4]
+    
+    def _has_local_files(self) -> bool:
+        for storage_dir in [self.raw_path, self.annotated_path, self.reports_path, self.manifests_path]:
+            if any(storage_dir.iterdir()):
+                return True
+        return False
     
     def _setup_mongodb_storage(self) -> None:
         """Setup MongoDB GridFS storage."""
@@ -125,26 +210,28 @@ class StorageService:
     def _store_local_file(self, file_data: bytes, file_type: str, filename: str, file_id: str) -> str:
         """Store file locally."""
         # Determine storage path based on file type
-        if file_type == "raw":
-            storage_dir = self.raw_path
-        elif file_type == "annotated":
-            storage_dir = self.annotated_path
-        elif file_type == "report":
-            storage_dir = self.reports_path
-        elif file_type == "manifest":
-            storage_dir = self.manifests_path
-        else:
-            raise ValueError(f"Unknown file type: {file_type}")
-        
-        file_path = storage_dir / filename
+        shard_dir = self._shard_dir(self._local_dir(file_type), file_id)
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        file_path = shard_dir / filename
         
-        # Write file
-        with open(file_path, 'wb') as f:
+        # Write file (atomically, so readers never see a partial file)
+        tmp_path = file_path.with_name(f".{filename}.tmp")
+        with open(tmp_path, 'wb') as f:
             f.write(file_data)
+        os.replace(tmp_path, file_path)
         
         # Calculate file hash for integrity
         file_hash = hashlib.sha256(file_data).hexdigest()
         
+        self.index.add(
+            file_id=file_id,
+            file_type=file_type,
+            path=file_path.relative_to(self.storage_path).as_posix(),
+            size=len(file_data),
+            sha256=file_hash,
+            content_type=self._get_content_type(filename)
+        )
+        
         logger.debug(f"Stored {file_type} file: {filename} (hash: {file_hash[:8]})")
         return file_id
     
@@ -197,19 +284,142 @@ class StorageService:
     
     def _retrieve_local_file(self, file_id: str) -> Optional[bytes]:
         """Retrieve file from local storage."""
-        # Search in all storage directories
-        for storage_dir in [self.raw_path, self.annotated_path, self.reports_path, self.manifests_path]:
-            for file_path in storage_dir.glob(f"{file_id}.*"):
-                try:
-                    with open(file_path, 'rb') as f:
-                        return f.read()
-                except Exception as e:
-                    logger.warning(f"Failed to read {file_path}: {e}")
-                    continue
+        file_path = self._local_file_path(file_id)
+        if file_path is None:
+            logger.warning(f"File not found in local storage: {file_id}")
+            return None
         
-        logger.warning(f"File not found in local storage: {file_id}")
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            # Removed behind the index's back; drop the stale record
+            self.index.remove(file_id)
+            logger.warning(f"Indexed file missing on disk: {file_path}")
+            return None
+    
+    def _local_file_path(self, file_id: str) -> Optional[Path]:
+        """Resolve a file ID to its path with one index lookup."""
+        record = self.index.get(file_id)
+        if record:
+            return self.storage_path / record["path"]
         return None
     
+    def get_file_metadata(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get stored metadata for a file without reading it.
+        
+        Args:
+            file_id: File ID returned by store_file
+            
+        Returns:
+            Dict with file_type, path, size, sha256, content_type, created_at
+            (local storage only) or None if not found
+        """
+        if self.storage_type != "local":
+            return None
+        record = self.index.get(file_id)
+        if record:
+            record["path"] = self.storage_path / record["path"]
+        return record
+    
+    def open_file(self, file_id: str) -> Optional[StoredFile]:
+        """
+        Get a streamable handle for a file without reading its contents.
+        
+        Local files are resolved through the index (one lookup, one stat);
+        GridFS files are read chunk by chunk from the matching collection.
+        
+        Args:
+            file_id: File ID returned by store_file
+            
+        Returns:
+            StoredFile or None if not found
+        """
+        try:
+            if self.storage_type == "local":
+                record = self.index.get(file_id)
+                if not record:
+                    return None
+                file_path = self.storage_path / record["path"]
+                if not file_path.exists():
+                    self.index.remove(file_id)
+                    logger.warning(f"Indexed file missing on disk: {file_path}")
+                    return None
+                return StoredFile(
+                    file_id=file_id,
+                    size=record["size"],
+                    content_type=record["content_type"],
+                    sha256=record["sha256"],
+                    created_at=record["created_at"],
+                    path=file_path
+                )
+            elif self.storage_type == "mongodb":
+                for file_type, gridfs in self.gridfs_collections.items():
+                    grid_out = gridfs.find_one({"file_id": file_id})
+                    if grid_out:
+                        return StoredFile(
+                            file_id=file_id,
+                            size=grid_out.length,
+                            content_type=grid_out.content_type or self._get_content_type(grid_out.filename or ""),
+                            sha256=getattr(grid_out, "sha256", None),
+                            created_at=grid_out.upload_date.timestamp() if grid_out.upload_date else None,
+                            grid_out=grid_out
+                        )
+                return None
+            else:
+                raise ValueError(f"Unsupported storage type: {self.storage_type}")
+                
+        except Exception as e:
+            logger.error(f"Failed to open file {file_id}: {e}")
+            return None
+    
+    def rebuild_index(self) -> int:
+        """
+        Rebuild the local file index by scanning the storage directories.
+        
+        Files written before sharding (flat in each directory) are indexed
+        where they are.
+        
+        Returns:
+            Number of files indexed
+        """
+        if self.storage_type != "local":
+            raise ValueError("Index rebuild is only supported for local storage")
+        
+        start_time = datetime.utcnow()
+        file_types = {
+            "raw": self.raw_path,
+            "annotated": self.annotated_path,
+            "report": self.reports_path,
+            "manifest": self.manifests_path
+        }
+        
+        records = []
+        for file_type, storage_dir in file_types.items():
+            for file_path in storage_dir.rglob("*"):
+                if not file_path.is_file() or file_path.name.startswith("."):
+                    continue
+                digest = hashlib.sha256()
+                with open(file_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        digest.update(chunk)
+                stat = file_path.stat()
+                records.append((
+                    file_path.stem,
+                    file_type,
+                    file_path.relative_to(self.storage_path).as_posix(),
+                    stat.st_size,
+                    digest.hexdigest(),
+                    self._get_content_type(file_path.name),
+                    stat.st_mtime
+                ))
+        
+        self.index.replace_all(records)
+        elapsed = (datetime.utcnow() - start_time).total_seconds()
+        logger.info(f"Rebuilt storage index with {len(records)} files in {elapsed:.2f}s")
+        return len(records)
+    
     def _retrieve_mongodb_file(self, file_id: str) -> Optional[bytes]:
         """Retrieve file from MongoDB GridFS."""
         # Search in all collections
@@ -307,16 +517,22 @@ class StorageService:
     
     def _delete_local_file(self, file_id: str) -> bool:
         """Delete file from local storage."""
+        file_path = self._local_file_path(file_id)
+        if file_path is None:
+            return False
+        
         deleted = False
-        for storage_dir in [self.raw_path, self.annotated_path, self.reports_path, self.manifests_path]:
-            for file_path in storage_dir.glob(f"{file_id}.*"):
-                try:
-                    file_path.unlink()
-                    deleted = True
-                    logger.debug(f"Deleted local file: {file_path}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete {file_path}: {e}")
+        try:
+            file_path.unlink()
+            deleted = True
+            logger.debug(f"Deleted local file: {file_path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to delete {file_path}: {e}")
+            return False
         
+        self.index.remove(file_id)
         return deleted
     
     def _delete_mongodb_file(self, file_id: str) -> bool:
@@ -361,11 +577,9 @@ class StorageService:
         if self.storage_type == "local":
             # Add local storage stats
             try:
-                total_files = 0
-                for storage_dir in [self.raw_path, self.annotated_path, self.reports_path, self.manifests_path]:
-                    if storage_dir.exists():
-                        total_files += len(list(storage_dir.glob("*")))
-                info["total_files"] = total_files
+                type_counts = self.index.count()
+                info["total_files"] = sum(type_counts.values())
+                info["file_type_counts"] = type_counts
             except Exception:
                 info["total_files"] = "unknown"
         
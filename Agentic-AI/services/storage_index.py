@@ -0,0 +1,91 @@
+"""Persistent SQLite index of locally stored files."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+from loguru import logger
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_id TEXT PRIMARY KEY,
+    file_type TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_type ON files (file_type);
+"""
+
+_COLUMNS = ("file_id", "file_type", "path", "size", "sha256", "content_type", "created_at")
+
+
+class StorageIndex:
+    """Maps ``file_id`` to its on-disk location and metadata.
+
+    Paths are stored relative to the storage root so the whole ``storage/``
+    tree can be moved. The index is a cache of what is on disk: it can always
+    be regenerated with ``StorageService.rebuild_index``.
+    """
+
+    def __init__(self, db_path: Path):
+        """Open (or create) the index database."""
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+        logger.debug(f"Storage index opened at {self.db_path}")
+
+    def add(self, file_id: str, file_type: str, path: str, size: int, sha256: str,
+            content_type: str, created_at: Optional[float] = None) -> None:
+        """Insert or replace the record for a file."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (file_id, file_type, path, size, sha256, content_type, created_at or time.time())
+            )
+
+    def get(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Get the record for a file, or None if it is not indexed."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM files WHERE file_id = ?", (file_id,)
+            ).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
+
+    def remove(self, file_id: str) -> bool:
+        """Remove a file's record; returns True if one existed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM files WHERE file_id = ?", (file_id,))
+        return cursor.rowcount > 0
+
+    def count(self) -> Dict[str, int]:
+        """Number of indexed files per file type."""
+        with self._lock:
+            rows = self._conn.execute("SELECT file_type, COUNT(*) FROM files GROUP BY file_type").fetchall()
+        return {file_type: count for file_type, count in rows}
+
+    def replace_all(self, records: Iterable[Tuple]) -> int:
+        """Atomically replace the whole index with ``records`` (tuples in column order)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM files")
+                cursor = self._conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", records)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -3,13 +3,16 @@
 import time
 import json
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from contextlib import contextmanager
 from uuid import uuid4
 from loguru import logger
-from collections import defaultdict, deque
+from collections import defaultdict
 import threading
 
+from services.audit_log import audit_log
+from services.latency_histogram import PROMETHEUS_BUCKET_BOUNDS, HistogramSnapshot, ShardedLatencyHistograms
+
 
 class TelemetryService:
     """Service for audit logging, metrics collection, and monitoring."""
@@ -18,15 +21,26 @@ class TelemetryService:
         """Initialize telemetry service."""
         self.metrics = defaultdict(lambda: defaultdict(int))
         self.latency_metrics = defaultdict(list)
-        self.audit_logs = deque(maxlen=10000)  # Keep last 10k audit entries
+        # Audit events are persisted by the write-behind audit log (bounded by bytes)
+        self.audit_log = audit_log
         self.active_requests = {}
         self._lock = threading.Lock()
         
+        try:
+            from app.config import config
+            self.audit_logging_enabled = config.audit_logging_enabled
+        except Exception:
+            # Fallback for testing
+            self.audit_logging_enabled = True
+        
         # Metrics counters
         self.step_counters = defaultdict(int)
         self.success_counters = defaultdict(int)
         self.failure_counters = defaultdict(int)
-        self.latency_samples = defaultdict(lambda: deque(maxlen=1000))
+        # All-time latency histograms, recorded without taking _lock
+        self.latency_histograms = ShardedLatencyHistograms()
+        # Key -> (snapshot, its Prometheus lines); snapshots of unchanged keys are reused
+        self._prometheus_latency_lines: Dict[str, Tuple[HistogramSnapshot, List[str]]] = {}
         
         logger.info("Telemetry service initialized")
     
@@ -107,11 +121,12 @@ class TelemetryService:
             "metadata": safe_metadata
         }
         
-        with self._lock:
-            self.audit_logs.append(audit_entry)
+        # Queued for the background writer; no lock or disk I/O on the request path
+        if self.audit_logging_enabled:
+            self.audit_log.append(audit_entry)
         
-        # Also log to structured logger
-        logger.info(
+        # Also log to structured logger (the audit log is the durable record)
+        logger.debug(
             f"AUDIT: {event_type}",
             extra={
                 "request_id": request_id,
@@ -153,7 +168,7 @@ class TelemetryService:
         """Record execution of a processing step."""
         with self._lock:
             self.step_counters[step] += 1
-            self.latency_samples[f"step_{step}"].append(duration)
+        self.latency_histograms.record(f"step_{step}", duration)
         
         self.log_audit_event(
             request_id=request_id,
@@ -165,17 +180,29 @@ class TelemetryService:
             metadata=metadata
         )
     
+    def record_inference(self, model_key: str, queue_wait: float, execution_time: float,
+                         success: bool = True) -> None:
+        """Record queue wait and execution time of a model inference call."""
+        with self._lock:
+            self.step_counters[f"inference_{model_key}"] += 1
+            if not success:
+                self.failure_counters[f"inference_{model_key}"] += 1
+            else:
+                self.success_counters[f"inference_{model_key}"] += 1
+        self.latency_histograms.record(f"inference_queue_wait_{model_key}", queue_wait)
+        self.latency_histograms.record(f"inference_exec_{model_key}", execution_time)
+
     def record_success(self, operation: str, duration: float) -> None:
         """Record successful operation."""
         with self._lock:
             self.success_counters[operation] += 1
-            self.latency_samples[f"operation_{operation}"].append(duration)
+        self.latency_histograms.record(f"operation_{operation}", duration)
     
     def record_failure(self, operation: str, duration: float, error: str) -> None:
         """Record failed operation."""
         with self._lock:
             self.failure_counters[operation] += 1
-            self.latency_samples[f"operation_{operation}"].append(duration)
+        self.latency_histograms.record(f"operation_{operation}", duration)
         
         logger.error(f"Operation failed: {operation}", extra={
             "operation": operation,
@@ -183,13 +210,16 @@ class TelemetryService:
             "error": error
         })
     
-    def get_metrics(self) -> Dict[str, Any]:
+    def get_metrics(self, histograms: Optional[Dict[str, HistogramSnapshot]] = None) -> Dict[str, Any]:
         """Get current metrics for monitoring endpoint."""
+        if histograms is None:
+            histograms = self.latency_histograms.snapshot()
+        audit_stats = self.audit_log.get_stats()
         with self._lock:
             metrics = {
                 "timestamp": datetime.utcnow().isoformat(),
                 "active_requests": len(self.active_requests),
-                "total_audit_entries": len(self.audit_logs),
+                "total_audit_entries": audit_stats["entries"] + audit_stats["queued"],
                 "step_counts": dict(self.step_counters),
                 "success_counts": dict(self.success_counters),
                 "failure_counts": dict(self.failure_counters),
@@ -203,46 +233,18 @@ class TelemetryService:
                 if total > 0:
                     metrics["success_rates"][operation] = self.success_counters[operation] / total
             
-            # Calculate latency statistics
-            for key, samples in self.latency_samples.items():
-                if samples:
-                    sorted_samples = sorted(samples)
-                    n = len(sorted_samples)
-                    metrics["latency_stats"][key] = {
-                        "count": n,
-                        "min": min(sorted_samples),
-                        "max": max(sorted_samples),
-                        "mean": sum(sorted_samples) / n,
-                        "p50": sorted_samples[n // 2],
-                        "p95": sorted_samples[int(n * 0.95)] if n > 0 else 0,
-                        "p99": sorted_samples[int(n * 0.99)] if n > 0 else 0
-                    }
+        # Latency statistics over all samples since start (or the last clear)
+        for key, histogram in histograms.items():
+            if histogram.summary["count"] > 0:
+                metrics["latency_stats"][key] = dict(histogram.summary)
         
         return metrics
     
     def get_audit_logs(self, request_id: Optional[str] = None, 
                       operation: Optional[str] = None,
                       limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get audit logs with optional filtering."""
-        with self._lock:
-            logs = list(self.audit_logs)
-        
-        # Filter by request_id
-        if request_id:
-            logs = [log for log in logs if log.get("request_id") == request_id]
-        
-        # Filter by operation
-        if operation:
-            logs = [log for log in logs if log.get("operation") == operation]
-        
-        # Sort by timestamp (newest first)
-        logs = sorted(logs, key=lambda x: x.get("timestamp", ""), reverse=True)
-        
-        # Apply limit
-        if limit:
-            logs = logs[:limit]
-        
-        return logs
+        """Get audit logs with optional filtering (newest first), via the audit log index."""
+        return self.audit_log.query(request_id=request_id, operation=operation, limit=limit)
     
     def get_active_requests(self) -> Dict[str, Any]:
         """Get information about currently active requests."""
@@ -264,18 +266,20 @@ class TelemetryService:
         with self._lock:
             self.metrics.clear()
             self.latency_metrics.clear()
-            self.audit_logs.clear()
             self.active_requests.clear()
             self.step_counters.clear()
             self.success_counters.clear()
             self.failure_counters.clear()
-            self.latency_samples.clear()
+        self.latency_histograms.clear()
+        self._prometheus_latency_lines = {}
+        self.audit_log.clear()
         
         logger.info("Telemetry metrics cleared")
     
     def export_metrics_prometheus(self) -> str:
         """Export metrics in Prometheus format."""
-        metrics = self.get_metrics()
+        histograms = self.latency_histograms.snapshot()
+        metrics = self.get_metrics(histograms)
         lines = []
         
         # Add help and type information
@@ -300,10 +304,12 @@ class TelemetryService:
         lines.append("# HELP orthopedic_request_duration_seconds Request duration in seconds")
         lines.append("# TYPE orthopedic_request_duration_seconds histogram")
         
-        for key, stats in metrics["latency_stats"].items():
-            operation = key.replace("operation_", "").replace("step_", "")
-            lines.append(f'orthopedic_request_duration_seconds_count{{operation="{operation}"}} {stats["count"]}')
-            lines.append(f'orthopedic_request_duration_seconds_sum{{operation="{operation}"}} {stats["mean"] * stats["count"]}')
+        for key in metrics["latency_stats"]:
+            histogram = histograms[key]
+            cached = self._prometheus_latency_lines.get(key)
+            if cached is None or cached[0] is not histogram:
+                cached = self._prometheus_latency_lines[key] = (histogram, self._format_latency_histogram(key, histogram))
+            lines.extend(cached[1])
         
         # Active requests
         lines.append("# HELP orthopedic_active_requests Currently active requests")
@@ -311,6 +317,20 @@ class TelemetryService:
         lines.append(f'orthopedic_active_requests {metrics["active_requests"]}')
         
         return "\n".join(lines)
+    
+    @staticmethod
+    def _format_latency_histogram(key: str, histogram: HistogramSnapshot) -> List[str]:
+        """Prometheus ``_bucket``, ``_count`` and ``_sum`` lines of one latency histogram."""
+        operation = key.replace("operation_", "").replace("step_", "")
+        stats = histogram.summary
+        lines = [
+            f'orthopedic_request_duration_seconds_bucket{{operation="{operation}",le="{bound!r}"}} {bucket_count}'
+            for bound, bucket_count in zip(PROMETHEUS_BUCKET_BOUNDS, histogram.prometheus_buckets)
+        ]
+        lines.append(f'orthopedic_request_duration_seconds_bucket{{operation="{operation}",le="+Inf"}} {stats["count"]}')
+        lines.append(f'orthopedic_request_duration_seconds_count{{operation="{operation}"}} {stats["count"]}')
+        lines.append(f'orthopedic_request_duration_seconds_sum{{operation="{operation}"}} {stats["sum"]}')
+        return lines
 
 
 # Global telemetry service instance
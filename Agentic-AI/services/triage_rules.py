@@ -0,0 +1,198 @@
+"""Triage rule patterns compiled once per policy configuration."""
+
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+import numpy as np
+from loguru import logger
+
+# Severity keyword tiers for detection labels / findings, highest first
+SEVERITY_TIERS: Tuple[Tuple[float, Tuple[str, ...]], ...] = (
+    (0.3, ("compound", "open", "severe", "displaced", "comminuted", "avulsion")),
+    (0.2, ("fracture detected", "break", "crack", "confirmed fracture")),
+    (0.1, ("likely fracture", "probable fracture", "suspected fracture")),
+    (0.05, ("possible fracture", "minor", "hairline", "stress")),
+    (0.0, ("no fractures", "no fracture", "normal", "clear", "negative")),
+)
+# Unknown findings (conservative estimate)
+DEFAULT_SEVERITY = 0.1
+
+SEVERE_SYMPTOM_KEYWORDS = (
+    "severe pain", "intense pain", "unbearable", "excruciating",
+    "deformity", "bone visible", "bleeding", "numbness",
+    "tingling", "can't move", "unable to bear weight"
+)
+MODERATE_SYMPTOM_KEYWORDS = (
+    "pain", "swelling", "bruising", "stiffness",
+    "difficulty moving", "tender", "sore"
+)
+
+# Label categories, in rule precedence order
+RED, AMBER, GREEN, UNKNOWN = 0, 1, 2, 3
+
+_MAX_MEMO_ENTRIES = 4096
+
+
+def _alternation(keywords: Iterable[str]) -> Optional["re.Pattern"]:
+    """One regex that finds any of ``keywords`` as a substring (None if empty)."""
+    keywords = [keyword for keyword in keywords if keyword]
+    if not keywords:
+        return None
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+class CompiledTriageRules:
+    """Triage patterns of one configuration, compiled to one regex per category.
+
+    ``regex.search(label)`` is equivalent to ``any(p in label for p in patterns)``,
+    so classification matches the original rules exactly, but each category is
+    one scan. Results are memoized per label and per symptom text, as the
+    label vocabulary is small and repeats across requests.
+    """
+
+    def __init__(self, triage_config: Dict[str, Any]):
+        """Compile the patterns of a ``PolicyService.get_triage_config`` dict."""
+        self.config_hash = triage_config.get("config_hash", "")
+        self._red = _alternation(triage_config["red_patterns"])
+        self._amber = _alternation(triage_config["amber_patterns"])
+        self._green = _alternation(triage_config["green_patterns"])
+        self._severity_tiers = [(weight, _alternation(keywords)) for weight, keywords in SEVERITY_TIERS]
+        self._severe_symptoms = _alternation(SEVERE_SYMPTOM_KEYWORDS)
+        self._moderate_symptoms = _alternation(MODERATE_SYMPTOM_KEYWORDS)
+
+        self._categories: Dict[str, int] = {}
+        self._pattern_matches: Dict[str, Tuple[bool, bool, bool]] = {}
+        self._severities: Dict[str, float] = {}
+        self._symptoms: Dict[str, Tuple[bool, bool]] = {}
+
+    @staticmethod
+    def _matches(regex: Optional["re.Pattern"], text: str) -> bool:
+        return regex is not None and regex.search(text) is not None
+
+    @staticmethod
+    def _remember(memo: Dict, key: str, value: Any) -> Any:
+        if len(memo) >= _MAX_MEMO_ENTRIES:
+            memo.clear()
+        memo[key] = value
+        return value
+
+    def category(self, label: str) -> int:
+        """
+        Rule category of a detection label.
+
+        The label is lowercased with spaces and hyphens removed; precedence is
+        RED, then GREEN, then AMBER, otherwise UNKNOWN (treated as amber).
+        """
+        category = self._categories.get(label)
+        if category is not None:
+            return category
+        normalized_label = label.lower().replace(" ", "").replace("-", "")
+        if self._matches(self._red, normalized_label):
+            category = RED
+        elif self._matches(self._green, normalized_label):
+            category = GREEN
+        elif self._matches(self._amber, normalized_label):
+            category = AMBER
+        else:
+            category = UNKNOWN
+        return self._remember(self._categories, label, category)
+
+    def pattern_matches(self, label: str) -> Tuple[bool, bool, bool]:
+        """Whether the lowercased label contains any red, amber and green pattern."""
+        matches = self._pattern_matches.get(label)
+        if matches is not None:
+            return matches
+        lowered = label.lower()
+        matches = (
+            self._matches(self._red, lowered),
+            self._matches(self._amber, lowered),
+            self._matches(self._green, lowered)
+        )
+        return self._remember(self._pattern_matches, label, matches)
+
+    def severity(self, finding: str) -> float:
+        """Severity weight (0.0 to 0.3) of a lowercase finding or label."""
+        severity = self._severities.get(finding)
+        if severity is not None:
+            return severity
+        severity = DEFAULT_SEVERITY
+        for weight, regex in self._severity_tiers:
+            if self._matches(regex, finding):
+                severity = weight
+                break
+        return self._remember(self._severities, finding, severity)
+
+    def _symptom_flags(self, symptoms: str) -> Tuple[bool, bool]:
+        flags = self._symptoms.get(symptoms)
+        if flags is None:
+            lowered = symptoms.lower()
+            flags = (self._matches(self._severe_symptoms, lowered), self._matches(self._moderate_symptoms, lowered))
+            self._remember(self._symptoms, symptoms, flags)
+        return flags
+
+    def has_severe_symptoms(self, symptoms: Optional[str]) -> bool:
+        """Whether symptoms mention any severe keyword."""
+        return bool(symptoms) and self._symptom_flags(symptoms)[0]
+
+    def has_moderate_symptoms(self, symptoms: Optional[str]) -> bool:
+        """Whether symptoms mention any moderate keyword."""
+        return bool(symptoms) and self._symptom_flags(symptoms)[1]
+
+    def severity_table(self, vocabulary: Iterable[str]) -> np.ndarray:
+        """Severity weight per label of a vocabulary (labels lowercased first)."""
+        return np.array([self.severity(label.lower()) for label in vocabulary], dtype=np.float64)
+
+
+class TriageRuleCache:
+    """Compiled triage rules, one entry per policy ``config_hash``."""
+
+    def __init__(self, max_entries: int = 64):
+        """Initialize cache with a bound on distinct configurations."""
+        self.max_entries = max_entries
+        self._rules: "OrderedDict[Any, CompiledTriageRules]" = OrderedDict()
+        self.compilations = 0
+
+    @staticmethod
+    def _key(triage_config: Dict[str, Any]) -> Any:
+        config_hash = triage_config.get("config_hash")
+        if config_hash:
+            return config_hash
+        # Hand-built configs without a hash are keyed by their patterns
+        return tuple(
+            tuple(triage_config[name]) for name in ("red_patterns", "amber_patterns", "green_patterns")
+        )
+
+    def get(self, triage_config: Dict[str, Any]) -> CompiledTriageRules:
+        """
+        Get the compiled rules for a triage configuration, compiling on first use.
+
+        Args:
+            triage_config: Dict from ``PolicyService.get_triage_config``
+
+        Returns:
+            CompiledTriageRules for the configuration
+        """
+        key = self._key(triage_config)
+        rules = self._rules.get(key)
+        if rules is not None:
+            self._rules.move_to_end(key)
+            return rules
+
+        rules = CompiledTriageRules(triage_config)
+        self._rules[key] = rules
+        self.compilations += 1
+        while len(self._rules) > self.max_entries:
+            self._rules.popitem(last=False)
+        logger.debug(f"Compiled triage rules for config {triage_config.get('config_hash') or 'custom'}")
+        return rules
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "configs": len(self._rules),
+            "compilations": self.compilations
+        }
+
+
+# Global triage rule cache instance
+triage_rule_cache = TriageRuleCache()
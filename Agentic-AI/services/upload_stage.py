@@ -0,0 +1,274 @@
+"""Concurrent, non-blocking image upload stage for analysis results."""
+
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+from loguru import logger
+
+from services.cloudinary_service import CloudinaryService, UPLOAD_FOLDERS
+
+
+class LocalUploadBackend:
+    """Stand-in for Cloudinary that writes uploads to a local directory.
+
+    Implements the same ``is_configured`` / ``build_url`` / ``upload_image``
+    interface as ``CloudinaryService``. ``latency_ms`` adds a simulated
+    network round-trip so the upload stage can be benchmarked offline.
+    """
+
+    def __init__(self, root: Path = Path("./storage/uploads"), latency_ms: float = 0.0):
+        """Initialize backend rooted at ``root``."""
+        self.root = Path(root)
+        self.latency_ms = latency_ms
+        self.is_configured = True
+
+    def build_url(self, kind: str, public_id: str) -> str:
+        return (self.root / UPLOAD_FOLDERS[kind] / public_id).resolve().as_uri()
+
+    def upload_image(self, image_data: bytes, kind: str, public_id: str) -> Dict[str, Any]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        path = self.root / UPLOAD_FOLDERS[kind] / public_id
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(image_data)
+        return {
+            "url": self.build_url(kind, public_id),
+            "public_id": f"{UPLOAD_FOLDERS[kind]}/{public_id}",
+            "version": int(time.time()),
+            "format": None,
+            "width": None,
+            "height": None,
+            "bytes": len(image_data)
+        }
+
+
+class UploadStage:
+    """Uploads the original and annotated images of an analysis concurrently.
+
+    The blocking SDK call runs on a bounded thread pool so it never stalls the
+    event loop, and transient failures are retried with exponential backoff
+    and jitter. In ``after_response`` mode the public IDs and delivery URLs are
+    computed up front and returned immediately while the uploads finish in the
+    background; their outcome is available from ``get_upload_status``.
+    """
+
+    def __init__(
+        self,
+        backend: Any = None,
+        max_concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+        mode: Optional[str] = None,
+        max_tracked: int = 1000
+    ):
+        """Initialize stage from arguments or application config."""
+        try:
+            from app.config import config
+            backend_name = config.upload_backend
+            local_latency_ms = config.upload_local_latency_ms
+            self.max_concurrency = max_concurrency or config.upload_max_concurrency
+            self.max_attempts = max_attempts or config.upload_max_attempts
+            self.backoff_seconds = backoff_seconds if backoff_seconds is not None else config.upload_backoff_seconds
+            self.mode = mode or config.upload_mode
+        except Exception:
+            # Fallback for testing
+            backend_name = "cloudinary"
+            local_latency_ms = 0.0
+            self.max_concurrency = max_concurrency or 4
+            self.max_attempts = max_attempts or 3
+            self.backoff_seconds = backoff_seconds if backoff_seconds is not None else 0.5
+            self.mode = mode or "inline"
+
+        if backend is None:
+            if backend_name == "local":
+                backend = LocalUploadBackend(latency_ms=local_latency_ms)
+            else:
+                from services.cloudinary_service import cloudinary_service
+                backend = cloudinary_service
+        self.backend = backend
+        self.max_tracked = max_tracked
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._batches: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.uploads = 0
+        self.failures = 0
+        self.retries = 0
+        self.total_upload_ms = 0.0
+
+        logger.info(
+            f"UploadStage initialized: backend={type(self.backend).__name__}, mode={self.mode}, "
+            f"concurrency={self.max_concurrency}, attempts={self.max_attempts}"
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="upload")
+        return self._executor
+
+    async def upload(self, image_data: bytes, kind: str, public_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Upload one image off the event loop, retrying transient failures.
+
+        Args:
+            image_data: Raw image bytes
+            kind: "original" or "annotated"
+            public_id: Public ID (without folder)
+
+        Returns:
+            Dict with upload result including URL, or None if all attempts failed
+        """
+        if not self.backend.is_configured:
+            logger.error("Upload backend not configured")
+            return None
+
+        loop = asyncio.get_running_loop()
+        start_time = time.perf_counter()
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                result = await loop.run_in_executor(
+                    self._get_executor(), self.backend.upload_image, image_data, kind, public_id
+                )
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                self.uploads += 1
+                self.total_upload_ms += elapsed_ms
+                logger.info(f"{kind.capitalize()} image uploaded in {elapsed_ms:.1f}ms: {result.get('url')}")
+                return result
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self.failures += 1
+                    logger.error(f"Failed to upload {kind} image after {attempt} attempts: {e}")
+                    return None
+
+                self.retries += 1
+                delay = self.backoff_seconds * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                logger.warning(f"Upload of {kind} image failed (attempt {attempt}), retrying in {delay:.2f}s: {e}")
+                await asyncio.sleep(delay)
+
+    async def upload_analysis_images(
+        self,
+        request_id: str,
+        original_image: bytes,
+        annotated_image: Optional[bytes] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload the original and (optional) annotated image concurrently.
+
+        Args:
+            request_id: Unique request identifier
+            original_image: Original image bytes
+            annotated_image: Annotated image bytes, if annotation produced one
+
+        Returns:
+            ``cloudinary_urls`` dict with ``*_image_url`` / ``*_image_public_id``
+            for each successful upload
+        """
+        images = self._images(original_image, annotated_image)
+        public_ids = {kind: CloudinaryService.build_public_id(request_id, kind) for kind in images}
+        results = await asyncio.gather(
+            *(self.upload(data, kind, public_ids[kind]) for kind, data in images.items())
+        )
+        return self._urls(dict(zip(images, results)))
+
+    def start_analysis_upload(
+        self,
+        request_id: str,
+        original_image: bytes,
+        annotated_image: Optional[bytes] = None
+    ) -> Dict[str, Any]:
+        """
+        Start uploads in the background and return provisional IDs immediately.
+
+        Public IDs and delivery URLs are deterministic, so they are returned
+        before the uploads complete (``upload_status`` is "pending").
+
+        Args:
+            request_id: Unique request identifier
+            original_image: Original image bytes
+            annotated_image: Annotated image bytes, if annotation produced one
+
+        Returns:
+            Provisional ``cloudinary_urls`` dict
+        """
+        images = self._images(original_image, annotated_image)
+        public_ids = {kind: CloudinaryService.build_public_id(request_id, kind) for kind in images}
+        provisional = {
+            kind: {
+                "url": self.backend.build_url(kind, public_ids[kind]),
+                "public_id": f"{UPLOAD_FOLDERS[kind]}/{public_ids[kind]}"
+            }
+            for kind in images
+        }
+
+        batch = {"status": "pending", "uploads": {kind: "pending" for kind in images}}
+        self._batches[request_id] = batch
+        while len(self._batches) > self.max_tracked:
+            self._batches.popitem(last=False)
+
+        async def run() -> None:
+            results = await asyncio.gather(
+                *(self.upload(data, kind, public_ids[kind]) for kind, data in images.items())
+            )
+            for kind, result in zip(images, results):
+                batch["uploads"][kind] = "completed" if result else "failed"
+            batch["status"] = "completed" if all(results) else "failed"
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        urls = self._urls(provisional)
+        urls["upload_status"] = "pending"
+        return urls
+
+    def get_upload_status(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Status of a background upload started with ``start_analysis_upload``."""
+        batch = self._batches.get(request_id)
+        if batch is None:
+            return None
+        return {"request_id": request_id, "status": batch["status"], "uploads": dict(batch["uploads"])}
+
+    @staticmethod
+    def _images(original_image: bytes, annotated_image: Optional[bytes]) -> Dict[str, bytes]:
+        images = {"original": original_image}
+        if annotated_image is not None:
+            images["annotated"] = annotated_image
+        return images
+
+    @staticmethod
+    def _urls(results: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        urls = {}
+        for kind, result in results.items():
+            if result:
+                urls[f"{kind}_image_url"] = result["url"]
+                urls[f"{kind}_image_public_id"] = result["public_id"]
+        return urls
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get upload statistics."""
+        return {
+            "backend": type(self.backend).__name__,
+            "mode": self.mode,
+            "max_concurrency": self.max_concurrency,
+            "uploads": self.uploads,
+            "failures": self.failures,
+            "retries": self.retries,
+            "avg_upload_ms": round(self.total_upload_ms / self.uploads, 2) if self.uploads else 0.0,
+            "pending_background": len(self._tasks)
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the upload pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+# Global upload stage instance
+upload_stage = UploadStage()
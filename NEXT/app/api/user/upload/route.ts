@@ -3,6 +3,48 @@ import { auth, clerkClient } from '@clerk/nextjs/server'
 import { connect } from '@/lib/mongoose'
 import Upload from '@/lib/models/upload'
 
+const BACKEND_URL = 'http://localhost:8000'
+
+// The backend renders the PDF report after /api/analyze responds; wait for the
+// job and inline the file so stored uploads keep the base64 report content.
+async function resolvePdfReport(pdfReport: any, timeoutMs = 60000) {
+  if (!pdfReport?.status_url || pdfReport.content) {
+    return pdfReport
+  }
+
+  const deadline = Date.now() + timeoutMs
+  while (Date.now() < deadline) {
+    const statusResponse = await fetch(`${BACKEND_URL}${pdfReport.status_url}`)
+    if (!statusResponse.ok) {
+      break
+    }
+
+    const reportStatus = await statusResponse.json()
+    if (reportStatus.status === 'completed' && reportStatus.download_url) {
+      const pdfResponse = await fetch(`${BACKEND_URL}${reportStatus.download_url}`)
+      if (!pdfResponse.ok) {
+        break
+      }
+      const pdfBuffer = Buffer.from(await pdfResponse.arrayBuffer())
+      return {
+        ...pdfReport,
+        status: 'completed',
+        download_url: reportStatus.download_url,
+        content: pdfBuffer.toString('base64'),
+        size_bytes: pdfBuffer.length
+      }
+    }
+    if (reportStatus.status === 'failed') {
+      return { ...pdfReport, status: 'failed', error: 'PDF generation failed', message: reportStatus.error }
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, 500))
+  }
+
+  console.error('PDF report was not ready in time:', pdfReport.report_id)
+  return pdfReport
+}
+
 export async function POST(request: NextRequest) {
   try {
     // Check authentication (server-side)
@@ -110,7 +152,7 @@ export async function POST(request: NextRequest) {
 
     // Test backend connectivity first
     try {
-      const healthCheck = await fetch('http://localhost:8000/api/info', {
+      const healthCheck = await fetch(`${BACKEND_URL}/api/info`, {
         method: 'GET',
         headers: { 'Accept': 'application/json' }
       })
@@ -133,7 +175,7 @@ export async function POST(request: NextRequest) {
     }
 
     // Forward request to FastAPI backend
-    const response = await fetch('http://localhost:8000/api/analyze', {
+    const response = await fetch(`${BACKEND_URL}/api/analyze`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
@@ -245,6 +287,7 @@ export async function POST(request: NextRequest) {
     }
 
     const result = await response.json()
+    result.pdf_report = await resolvePdfReport(result.pdf_report)
     
     // Store the upload response in MongoDB
     try {